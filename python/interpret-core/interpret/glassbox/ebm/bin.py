@@ -2,17 +2,25 @@
 # Distributed under the MIT software license
 
 from itertools import count
+from bisect import bisect_right
 import numpy as np
+import scipy as sp
+from sklearn.utils.extmath import softmax
 
 import logging
 _log = logging.getLogger(__name__)
 
 from ...utils._native import Native
-from ...utils._binning import unify_columns
+from ...utils._binning import unify_columns, unify_sparse_columns, clean_X, determine_min_cols, _BinnedData, _compile_bins
 
 _none_list = [None]
 _none_ndarray = np.array(None)
 
+# number of samples widened from the compact bin indexes of a _BinnedData at a time.  The binned data is 
+# typically a small fraction of the size of X, so it is scored in chunks to avoid materializing an int64 
+# bin index for every sample and binned column at once
+_BINNED_CHUNK_SAMPLES = 65536
+
 def eval_terms(X, n_samples, feature_names_in, feature_types_in, bins, term_features):
     # called under: predict
 
@@ -132,16 +140,11 @@ def ebm_decision_function(
     term_scores, 
     term_features
 ):
-    if type(intercept) is float or len(intercept) == 1:
-        sample_scores = np.full(n_samples, intercept, dtype=np.float64)
-    else:
-        sample_scores = np.full((n_samples, len(intercept)), intercept, dtype=np.float64)
-
-    if 0 < n_samples:
-        for term_idx, bin_indexes in eval_terms(X, n_samples, feature_names_in, feature_types_in, bins, term_features):
-            sample_scores += term_scores[term_idx][tuple(bin_indexes)]
+    # called under: predict
 
-    return sample_scores
+    # scores through a throwaway EBMScorer so that there is a single scoring implementation
+    scorer = EBMScorer(feature_names_in, feature_types_in, bins, intercept, term_scores, term_features)
+    return scorer._score_cleaned(X, n_samples, False)[0]
 
 def ebm_decision_function_and_explain(
     X, 
@@ -153,25 +156,839 @@ def ebm_decision_function_and_explain(
     term_scores, 
     term_features
 ):
-    if type(intercept) is float or len(intercept) == 1:
-        sample_scores = np.full(n_samples, intercept, dtype=np.float64)
-        explanations = np.empty((n_samples, len(term_features)), dtype=np.float64)
-    else:
-        # TODO: add a test for multiclass calls to ebm_decision_function_and_explain
-        sample_scores = np.full((n_samples, len(intercept)), intercept, dtype=np.float64)
-        explanations = np.empty((n_samples, len(term_features), len(intercept)), dtype=np.float64)
+    # called under: predict
+
+    scorer = EBMScorer(feature_names_in, feature_types_in, bins, intercept, term_scores, term_features)
+    return scorer._score_cleaned(X, n_samples, True)
+
+class EBMScorer:
+    """ Frozen, flattened copy of the prediction state of an EBM.
+
+    The bins, term features and term scores are compiled once into contiguous lookup structures: all the 
+    continuous cuts are concatenated into a single array, every distinct binned column gets a slot, and all 
+    the term tensors are flattened into a single score buffer with per-term offsets and per-dimension strides.
+    Scoring a batch then requires one discretize call per binned column and one native ScoreTerms call
+    that accumulates all the terms in a single multithreaded pass, instead of the per-call request 
+    bookkeeping and per-term fancy indexing done by eval_terms.  Changes made to the originating model 
+    after compilation are not reflected.
+
+    If the term scores are float32 or int16 they are kept in that type, which shrinks the score buffer 
+    that is gathered from during scoring.  These, and float32 accumulation, are scored by gathering each 
+    term in numpy since the native ScoreTerms only handles float64.
+    """
+
+    def __init__(self, feature_names_in, feature_types_in, bins, intercept, term_scores, term_features, classes=None, n_threads=0, scales=None, accumulate_dtype=np.float64):
+        """ Compiles the model state into the flat scoring structures.
+
+        Args:
+            feature_names_in: Feature names of the model
+            feature_types_in: Feature types of the model
+            bins: Per-feature list of bin levels, as stored in bins_
+            intercept: Intercept of the model
+            term_scores: Per-term score tensors, as stored in term_scores_
+            term_features: Per-term feature indexes, as stored in term_features_
+            classes: Class labels for classifiers, or None for regressors
+            n_threads: Number of native threads used for scoring. Zero or less uses all hardware threads
+            scales: Per-term multipliers that convert int16 term scores back into scores, or None
+            accumulate_dtype: np.float64 or np.float32 for the sums of the term scores
+        """
+
+        accumulate_dtype = np.dtype(accumulate_dtype)
+        if accumulate_dtype != np.float64 and accumulate_dtype != np.float32:
+            msg = f"accumulate_dtype must be np.float64 or np.float32, but got {accumulate_dtype}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        self.feature_names_in = feature_names_in
+        self.feature_types_in = feature_types_in
+        self.classes = classes
+        self.n_threads = n_threads
+        self.scales = None if scales is None else np.array(scales, np.float64)
+        self.accumulate_dtype = accumulate_dtype
+        self.min_cols = determine_min_cols(feature_names_in, feature_types_in)
+
+        if type(intercept) is float or len(intercept) == 1:
+            self.intercept = float(intercept) if type(intercept) is float else float(intercept[0])
+            self.n_scores = 1
+        else:
+            self.intercept = np.array(intercept, np.float64)
+            self.n_scores = len(intercept)
+
+        # the categorical dictionaries are compiled into hashed lookups so that encoding is vectorized
+        bins = _compile_bins(bins)
+
+        # requests are in the format that unify_columns expects.  Continuous features are requested once
+        # and then discretized for each distinct level of cuts.  Categorical features are requested once 
+        # per distinct categories dictionary since unify_columns handles the mapping for us.
+        requests = []
+        request_slots = []
+        request_lookup = dict()
+
+        slot_n_bins = []
+        slot_bins = []
+        slot_lookup = dict()
+        cuts_list = []
+        slot_cut_bounds = []
+        cut_offset = 0
+
+        self.term_offsets = np.empty(len(term_features), np.int64)
+        term_dimensions = []
+        flat_scores = []
+        score_offset = 0
+        for term_idx, feature_idxs in enumerate(term_features):
+            tensor = term_scores[term_idx]
+            if tensor.ndim != len(feature_idxs) + (0 if self.n_scores == 1 else 1):
+                msg = f"term_scores[{term_idx}] has {tensor.ndim} dimensions, which does not match the term features {feature_idxs}"
+                _log.error(msg)
+                raise ValueError(msg)
+
+            dimensions = []
+            stride = 1
+            for dimension_idx in range(len(feature_idxs) - 1, -1, -1):
+                feature_idx = feature_idxs[dimension_idx]
+                bin_levels = bins[feature_idx]
+                feature_bins = bin_levels[min(len(bin_levels), len(feature_idxs)) - 1]
+
+                slot_key = (feature_idx, id(feature_bins))
+                slot_idx = slot_lookup.get(slot_key, None)
+                if slot_idx is None:
+                    slot_idx = len(slot_n_bins)
+                    slot_lookup[slot_key] = slot_idx
+
+                    if isinstance(feature_bins, dict):
+                        # categorical feature
+                        n_bins = 2 if len(feature_bins) == 0 else max(feature_bins.values()) + 2
+                        request_key = slot_key
+                        request = (feature_idx, feature_bins)
+                        slot_cut_bounds.append(None)
+                    else:
+                        # continuous feature
+                        n_bins = len(feature_bins) + 3
+                        request_key = feature_idx
+                        request = (feature_idx, None)
+                        cuts_list.append(feature_bins)
+                        slot_cut_bounds.append((cut_offset, cut_offset + len(feature_bins)))
+                        cut_offset += len(feature_bins)
+
+                    slot_n_bins.append(n_bins)
+                    slot_bins.append((feature_idx, feature_bins))
+
+                    request_idx = request_lookup.get(request_key, None)
+                    if request_idx is None:
+                        request_lookup[request_key] = len(requests)
+                        requests.append(request)
+                        request_slots.append([slot_idx])
+                    else:
+                        request_slots[request_idx].append(slot_idx)
+
+                n_bins = slot_n_bins[slot_idx]
+                if tensor.shape[dimension_idx] != n_bins:
+                    msg = f"term_scores[{term_idx}] has {tensor.shape[dimension_idx]} bins in dimension {dimension_idx}, but the bins for feature {feature_idx} require {n_bins}"
+                    _log.error(msg)
+                    raise ValueError(msg)
+
+                dimensions.append((slot_idx, stride))
+                stride *= n_bins
+
+            dimensions.reverse()
+            term_dimensions.append(dimensions)
+            self.term_offsets[term_idx] = score_offset
+            score_offset += stride
+            flat_scores.append(tensor.reshape((stride,) if self.n_scores == 1 else (stride, self.n_scores)))
+
+        self.requests = requests
+        self.request_slots = request_slots
+        self.slot_n_bins = np.array(slot_n_bins, np.int64)
+        self.slot_cut_bounds = slot_cut_bounds
+        self.slot_bins = slot_bins
+        self.cuts = np.ascontiguousarray(np.concatenate(cuts_list) if 0 < len(cuts_list) else np.empty(0, np.float64), np.float64)
+        self.term_dimensions = term_dimensions
+
+        # the native representation of term_dimensions
+        self.dimension_counts = np.fromiter((len(dimensions) for dimensions in term_dimensions), np.int64, count=len(term_dimensions))
+        self.column_indexes = np.array([slot_idx for dimensions in term_dimensions for slot_idx, _ in dimensions], np.int64)
+        self.strides = np.array([stride for dimensions in term_dimensions for _, stride in dimensions], np.int64)
+
+        scores_dtype = np.result_type(*flat_scores) if 0 < len(flat_scores) else np.float64
+        if scores_dtype != np.float32 and scores_dtype != np.int16:
+            scores_dtype = np.float64
+        if (self.scales is None) != (scores_dtype != np.int16):
+            msg = "scales must be provided if and only if the term scores are int16"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        if 0 < len(flat_scores):
+            self.scores = np.ascontiguousarray(np.concatenate(flat_scores), scores_dtype)
+        else:
+            self.scores = np.empty((0,) if self.n_scores == 1 else (0, self.n_scores), scores_dtype)
+
+        # the single row structures are plain python objects, which are only built if needed
+        self._row_slots = None
+
+    def _compile_rows(self):
+        # called under: predict
+
+        # single rows are scored in pure python.  For a handful of values, bisect over a list and a dict
+        # lookup are much faster than creating numpy arrays and calling into the native library
+        row_slots = []
+        for (feature_idx, feature_bins), n_bins in zip(self.slot_bins, self.slot_n_bins.tolist()):
+            if isinstance(feature_bins, dict):
+                row_slots.append((feature_idx, None, feature_bins, n_bins - 1))
+            else:
+                row_slots.append((feature_idx, feature_bins.tolist(), None, n_bins - 1))
+
+        row_col_map = None
+        if self.feature_types_in is not None:
+            keep_cols = [feature_type != 'ignore' for feature_type in self.feature_types_in]
+            if not all(keep_cols):
+                row_col_map = dict()
+                for feature_idx, is_kept in enumerate(keep_cols):
+                    if is_kept:
+                        row_col_map[feature_idx] = len(row_col_map)
+
+        self._row_terms = [(offset, tuple(dimensions)) for offset, dimensions in zip(self.term_offsets.tolist(), self.term_dimensions)]
+        self._row_scores = self._dequantized_scores().tolist()
+        self._row_intercept = self.intercept if self.n_scores == 1 else self.intercept.tolist()
+        self._row_col_map = row_col_map
+        self._row_slots = row_slots
 
-    if 0 < n_samples:
-        for term_idx, bin_indexes in eval_terms(X, n_samples, feature_names_in, feature_types_in, bins, term_features):
-            scores = term_scores[term_idx][tuple(bin_indexes)]
-            sample_scores += scores
-            explanations[:, term_idx] = scores
+    def _dequantized_scores(self):
+        scores = self.scores.astype(np.float64)
+        if self.scales is not None:
+            cell_counts = np.diff(np.append(self.term_offsets, len(scores)))
+            cell_scales = np.repeat(self.scales, cell_counts)
+            scores *= cell_scales if self.n_scores == 1 else cell_scales[:, np.newaxis]
+        return scores
 
-    return sample_scores, explanations
+    def _bin_row(self, row):
+        # called under: predict
+
+        names = self.feature_names_in
+        is_dict = isinstance(row, dict)
+        col_map = None
+        if not is_dict:
+            if len(row) != len(names):
+                col_map = self._row_col_map
+                if col_map is None or len(row) != len(col_map):
+                    msg = f"The model has {len(names)} features, but the row has {len(row)} values"
+                    _log.error(msg)
+                    raise ValueError(msg)
+
+        bin_indexes = []
+        for feature_idx, cuts, categories, unknown_idx in self._row_slots:
+            if is_dict:
+                try:
+                    val = row[names[feature_idx]]
+                except KeyError:
+                    msg = f"The row is missing the feature {names[feature_idx]}"
+                    _log.error(msg)
+                    raise ValueError(msg)
+            else:
+                val = row[feature_idx if col_map is None else col_map[feature_idx]]
+
+            if val is None:
+                bin_indexes.append(0)
+            elif categories is None:
+                # continuous feature
+                try:
+                    val = float(val)
+                except (ValueError, TypeError):
+                    bin_indexes.append(unknown_idx)
+                    continue
+                # cuts are lower bound inclusive, so values equal to a cut go into the higher bin
+                bin_indexes.append(0 if val != val else bisect_right(cuts, val) + 1)
+            elif isinstance(val, str):
+                bin_indexes.append(categories.get(val, unknown_idx))
+            elif val != val:
+                bin_indexes.append(0)
+            else:
+                if isinstance(val, (float, np.floating)):
+                    # floats are converted to float64 before being converted to text in unify_columns
+                    val = float(val)
+                bin_indexes.append(categories.get(str(val), unknown_idx))
+
+        return bin_indexes
+
+    def decision_function_row(self, row):
+        """ Predict the score of a single sample before calling the link function.
+
+        Args:
+            row: Dictionary from feature name to value, or a sequence of values in the column order of X.
+
+        Returns:
+            The sum of the additive term contributions as a float, or a list of floats for multiclass.
+        """
+        if self._row_slots is None:
+            self._compile_rows()
+
+        bin_indexes = self._bin_row(row)
+        scores = self._row_scores
+        if self.n_scores == 1:
+            score = self._row_intercept
+            for offset, dimensions in self._row_terms:
+                for slot_idx, stride in dimensions:
+                    offset += bin_indexes[slot_idx] * stride
+                score += scores[offset]
+            return score
+        else:
+            score = self._row_intercept.copy()
+            class_idxs = range(self.n_scores)
+            for offset, dimensions in self._row_terms:
+                for slot_idx, stride in dimensions:
+                    offset += bin_indexes[slot_idx] * stride
+                cell = scores[offset]
+                for class_idx in class_idxs:
+                    score[class_idx] += cell[class_idx]
+            return score
+
+    def predict_row(self, row):
+        """ Predicts a single sample.
+
+        Args:
+            row: Dictionary from feature name to value, or a sequence of values in the column order of X.
+
+        Returns:
+            Predicted class label for classifiers, or the predicted value for regressors.
+        """
+        if self.classes is None:
+            return self.decision_function_row(row)
+
+        if len(self.classes) == 1:
+            return self.classes[0]
+
+        score = self.decision_function_row(row)
+        if self.n_scores == 1:
+            return self.classes[1] if 0 < score else self.classes[0]
+        return self.classes[score.index(max(score))]
+
+    def _bin_slots(self, X, n_samples):
+        native = Native.get_native_singleton()
+
+        # one row per binned column so that each column is contiguous for the native code
+        bin_indexes = np.empty((len(self.slot_n_bins), n_samples), np.int64)
+        for request_idx, (_, X_col, categories, bad) in enumerate(unify_columns(X, self.requests, self.feature_names_in, self.feature_types_in, None, True)):
+            if n_samples != len(X_col):
+                msg = "The columns of X are mismatched in the number of of samples"
+                _log.error(msg)
+                raise ValueError(msg)
+
+            if categories is None:
+                # continuous feature
+
+                if bad is not None:
+                    bad = bad != _none_ndarray
+
+                if not X_col.flags.c_contiguous:
+                    X_col = X_col.copy()
+
+                for slot_idx in self.request_slots[request_idx]:
+                    start, end = self.slot_cut_bounds[slot_idx]
+                    slot_indexes = native.discretize(X_col, self.cuts[start:end])
+                    if bad is not None:
+                        # non-numeric values go into the unknown bin, which is the last one
+                        slot_indexes[bad] = self.slot_n_bins[slot_idx] - 1
+                    bin_indexes[slot_idx] = slot_indexes
+            else:
+                # categorical feature.  Unknown categories are returned as -1, which we redirect into the 
+                # last bin since we index into the flattened tensors where negative indexes are not meaningful
+                slot_idx = self.request_slots[request_idx][0]
+                bin_indexes[slot_idx] = X_col
+                slot_indexes = bin_indexes[slot_idx]
+                slot_indexes[slot_indexes < 0] = self.slot_n_bins[slot_idx] - 1
+
+        return bin_indexes
+
+    def _bin_slots_sparse(self, X, n_samples):
+        native = Native.get_native_singleton()
+
+        # for each slot, the rows that have stored values, the bins of those values, and the bin of the implicit zeros
+        slot_rows = _none_list * len(self.slot_n_bins)
+        slot_values = _none_list * len(self.slot_n_bins)
+        zero_bins = np.empty(len(self.slot_n_bins), np.int64)
+        for request_idx, (_, rows, X_col, categories, bad) in enumerate(unify_sparse_columns(X, self.requests, self.feature_names_in, self.feature_types_in)):
+            if rows is None:
+                # the full column was returned, so treat every sample as stored.  The bin used for the
+                # implicit zeros then cancels out since every row gets its own bin
+                rows = np.arange(n_samples, dtype=np.int64)
+                X_col = np.concatenate((X_col[:1], X_col))
+                if bad is not None:
+                    bad = np.concatenate((bad[:1], bad))
+
+            if categories is None:
+                # continuous feature
+
+                if bad is not None:
+                    bad = bad != _none_ndarray
+
+                if not X_col.flags.c_contiguous:
+                    X_col = X_col.copy()
+
+                for slot_idx in self.request_slots[request_idx]:
+                    start, end = self.slot_cut_bounds[slot_idx]
+                    slot_indexes = native.discretize(X_col, self.cuts[start:end])
+                    if bad is not None:
+                        slot_indexes[bad] = self.slot_n_bins[slot_idx] - 1
+                    zero_bins[slot_idx] = slot_indexes[0]
+                    slot_rows[slot_idx] = rows
+                    slot_values[slot_idx] = slot_indexes[1:]
+            else:
+                # categorical feature
+                slot_idx = self.request_slots[request_idx][0]
+                slot_indexes = X_col.astype(np.int64)
+                slot_indexes[slot_indexes < 0] = self.slot_n_bins[slot_idx] - 1
+                zero_bins[slot_idx] = slot_indexes[0]
+                slot_rows[slot_idx] = rows
+                slot_values[slot_idx] = slot_indexes[1:]
+
+        return slot_rows, slot_values, zero_bins
+
+    def _score_sparse(self, X, n_samples, is_explain):
+        # called under: predict
+
+        # every term has the same score wherever all of its features are at their implicit zeros.  That score
+        # is added to all samples as a constant, and then only the rows where at least one of the term's 
+        # features has a stored value are gathered, so the work is proportional to the number of stored values
+        sample_scores, explanations = self._allocate_scores(n_samples, is_explain)
+        slot_rows, slot_values, zero_bins = self._bin_slots_sparse(X, n_samples)
+        for term_idx, dimensions in enumerate(self.term_dimensions):
+            zero_cell = self.term_offsets[term_idx]
+            for slot_idx, stride in dimensions:
+                zero_cell += zero_bins[slot_idx] * stride
+            zero_score = self.scores[zero_cell]
+
+            if len(dimensions) == 1:
+                rows = slot_rows[dimensions[0][0]]
+            else:
+                rows = np.unique(np.concatenate([slot_rows[slot_idx] for slot_idx, _ in dimensions]))
+
+            cells = np.full(len(rows), zero_cell, np.int64)
+            for slot_idx, stride in dimensions:
+                positions = slice(None) if len(dimensions) == 1 else np.searchsorted(rows, slot_rows[slot_idx])
+                cells[positions] += (slot_values[slot_idx] - zero_bins[slot_idx]) * stride
+            scores = self.scores[cells]
+
+            if np.isfinite(zero_score).all():
+                sample_scores += zero_score
+                sample_scores[rows] += scores - zero_score
+            else:
+                # subtracting an infinite zero_score would give NaN, so only add it to the other rows
+                is_zero = np.ones(n_samples, np.bool_)
+                is_zero[rows] = False
+                sample_scores[is_zero] += zero_score
+                sample_scores[rows] += scores
+            if is_explain:
+                explanations[:, term_idx] = zero_score
+                explanations[rows, term_idx] = scores
+
+        return sample_scores, explanations
+
+    def _clean(self, X):
+        return clean_X(X, self.min_cols)
+
+    def _score(self, X, is_explain):
+        X, n_samples = self._clean(X)
+        return self._score_cleaned(X, n_samples, is_explain)
+
+    def _score_cleaned(self, X, n_samples, is_explain):
+        # called under: predict
+
+        # X has already been through clean_X with our min_cols
+        is_native = self.scores.dtype == np.float64 and self.accumulate_dtype == np.float64
+        if 0 < n_samples and 0 < len(self.term_dimensions) and is_native and isinstance(X, sp.sparse.spmatrix):
+            return self._score_sparse(X, n_samples, is_explain)
+
+        bin_indexes = None
+        if 0 < n_samples and 0 < len(self.term_dimensions):
+            bin_indexes = self._bin_slots(X, n_samples)
+        return self._score_binned(bin_indexes, n_samples, self.scores, is_explain, self.scales)
+
+    def _allocate_scores(self, n_samples, is_explain, dtype=np.float64):
+        n_terms = len(self.term_dimensions)
+        if self.n_scores == 1:
+            sample_scores = np.full(n_samples, self.intercept, dtype=dtype)
+            explanations = np.zeros((n_samples, n_terms), dtype=dtype) if is_explain else None
+        else:
+            sample_scores = np.full((n_samples, self.n_scores), self.intercept, dtype=dtype)
+            explanations = np.zeros((n_samples, n_terms, self.n_scores), dtype=dtype) if is_explain else None
+        return sample_scores, explanations
+
+    def _score_gathered(self, bin_indexes, n_samples, scores, is_explain, scales):
+        # called under: predict
+
+        dtype = self.accumulate_dtype
+        sample_scores, explanations = self._allocate_scores(n_samples, is_explain, dtype)
+        if n_samples == 0:
+            return sample_scores, explanations
+
+        for term_idx, dimensions in enumerate(self.term_dimensions):
+            cells = np.full(n_samples, self.term_offsets[term_idx], np.int64)
+            for slot_idx, stride in dimensions:
+                cells += bin_indexes[slot_idx] * stride
+            term_scores = scores[cells].astype(dtype, copy=False)
+            if scales is not None:
+                term_scores *= dtype.type(scales[term_idx])
+            sample_scores += term_scores
+            if is_explain:
+                explanations[:, term_idx] = term_scores
+
+        return sample_scores, explanations
+
+    def _score_binned(self, bin_indexes, n_samples, scores, is_explain, scales=None):
+        n_terms = len(self.term_dimensions)
+        if scores.dtype != np.float64 or self.accumulate_dtype != np.float64 or scales is not None:
+            return self._score_gathered(bin_indexes, n_samples, scores, is_explain, scales)
+
+        sample_scores, explanations = self._allocate_scores(n_samples, is_explain)
+
+        if 0 < n_samples and 0 < n_terms:
+            native = Native.get_native_singleton()
+            native.score_terms(
+                self.slot_n_bins,
+                bin_indexes,
+                self.dimension_counts,
+                self.column_indexes,
+                self.strides,
+                self.term_offsets,
+                scores,
+                sample_scores,
+                explanations,
+                self.n_threads,
+            )
+
+        return sample_scores, explanations
+
+    def _flatten_scores(self, term_scores):
+        if len(term_scores) != len(self.term_dimensions):
+            msg = f"term_scores has {len(term_scores)} terms, but the scorer was compiled with {len(self.term_dimensions)}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        flat_scores = []
+        for term_idx, tensor in enumerate(term_scores):
+            n_cells = int(np.prod([self.slot_n_bins[slot_idx] for slot_idx, _ in self.term_dimensions[term_idx]], dtype=np.int64))
+            if tensor.size != n_cells * self.n_scores:
+                msg = f"term_scores[{term_idx}] has shape {tensor.shape}, which does not match the compiled bins"
+                _log.error(msg)
+                raise ValueError(msg)
+            flat_scores.append(tensor.reshape((n_cells,) if self.n_scores == 1 else (n_cells, self.n_scores)))
+
+        if len(flat_scores) == 0:
+            return np.empty((0,) if self.n_scores == 1 else (0, self.n_scores), np.float64)
+        return np.ascontiguousarray(np.concatenate(flat_scores), np.float64)
+
+    def decision_function_bags(self, X, bagged_term_scores):
+        """ Predict scores for several sets of term scores that share the compiled bins and term features.
+
+        X is unified and discretized only once, and the resulting bin indexes are reused for each set of
+        term scores, which is much cheaper than calling decision_function on a separate scorer per set.
+
+        Args:
+            X: Numpy array for samples, or a _BinnedData holding X already binned with the compiled bins.
+            bagged_term_scores: List of per-term score tensors, each shaped like the compiled term_scores.
+
+        Returns:
+            List with the sum of the additive term contributions for each set of term scores.
+        """
+        flat_scores = [self._flatten_scores(term_scores) for term_scores in bagged_term_scores]
+
+        if isinstance(X, _BinnedData):
+            n_samples = X.n_samples
+            if n_samples == 0 or len(self.term_dimensions) == 0:
+                return [self._score_binned(None, n_samples, scores, False)[0] for scores in flat_scores]
+
+            scores_bags = [self._allocate_scores(n_samples, False)[0] for _ in flat_scores]
+            for start in range(0, n_samples, _BINNED_CHUNK_SAMPLES):
+                end = min(start + _BINNED_CHUNK_SAMPLES, n_samples)
+                bin_indexes = np.empty((len(self.slot_n_bins), end - start), np.int64)
+                for slot_idx, (feature_idx, feature_bins) in enumerate(self.slot_bins):
+                    bin_indexes[slot_idx] = X.get(feature_idx, feature_bins, start, end)
+                for sample_scores, scores in zip(scores_bags, flat_scores):
+                    sample_scores[start:end] = self._score_binned(bin_indexes, end - start, scores, False)[0]
+            return scores_bags
+
+        X, n_samples = self._clean(X)
+        bin_indexes = None
+        if 0 < n_samples and 0 < len(self.term_dimensions):
+            bin_indexes = self._bin_slots(X, n_samples)
+        return [self._score_binned(bin_indexes, n_samples, scores, False)[0] for scores in flat_scores]
+
+    def decision_function(self, X):
+        """ Predict scores from the compiled model before calling the link function.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            The sum of the additive term contributions.
+        """
+        return self._score(X, False)[0]
+
+    def decision_function_and_explain(self, X):
+        """ Predict scores from the compiled model along with the per-term contributions.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            The sum of the additive term contributions, and the per-term contributions for each sample.
+        """
+        return self._score(X, True)
+
+    def predict_proba(self, X):
+        """ Probability estimates on provided samples.  Only available for classifiers.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            Probability estimate of sample for each class.
+        """
+        if self.classes is None:
+            msg = "predict_proba is only available for classification models"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        if len(self.classes) == 1:
+            # if there is only one class then all probabilities are 100%
+            X, n_samples = self._clean(X)
+            return np.full((n_samples, 1), 1, np.float64)
+
+        log_odds_vector = self.decision_function(X)
+        if log_odds_vector.ndim == 1:
+            # Handle binary classification case -- softmax only works with 0s appended
+            log_odds_vector = np.c_[np.zeros(log_odds_vector.shape), log_odds_vector]
+
+        return softmax(log_odds_vector)
+
+    def predict(self, X):
+        """ Predicts on provided samples.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            Predicted class label per sample for classifiers, or the predicted values for regressors.
+        """
+        scores = self.decision_function(X)
+        if self.classes is None:
+            return scores
+
+        if scores.ndim == 1:
+            # Handle binary classification case -- softmax only works with 0s appended
+            scores = np.c_[np.zeros(scores.shape), scores]
+
+        return self.classes[np.argmax(scores, axis=1)]
+
+def quantize_term_scores(term_scores, dtype):
+    """ Converts term score tensors into a smaller type for inference.
+
+    Args:
+        term_scores: Per-term float64 score tensors
+        dtype: np.float64, np.float32, or np.int16.  int16 tensors are scaled per term so that the 
+            largest absolute score maps to 32767
+
+    Returns:
+        The converted tensors, the per-term scales for int16 or None otherwise, and the per-term 
+        maximum absolute difference between the converted and the original scores.
+    """
+
+    dtype = np.dtype(dtype)
+    if dtype != np.float64 and dtype != np.float32 and dtype != np.int16:
+        msg = f"dtype must be np.float64, np.float32 or np.int16, but got {dtype}"
+        _log.error(msg)
+        raise ValueError(msg)
+
+    tensors = []
+    scales = [] if dtype == np.int16 else None
+    errors = np.zeros(len(term_scores), np.float64)
+    for term_idx, scores in enumerate(term_scores):
+        scores = np.asarray(scores, np.float64)
+        if dtype == np.int16:
+            if not np.isfinite(scores).all():
+                msg = f"term_scores[{term_idx}] has non-finite scores, which cannot be quantized to int16"
+                _log.error(msg)
+                raise ValueError(msg)
+            max_abs = np.abs(scores).max() if 0 < scores.size else 0.0
+            scale = max_abs / 32767.0 if 0.0 < max_abs else 1.0
+            tensor = np.rint(scores / scale).astype(np.int16)
+            scales.append(scale)
+            restored = tensor * scale
+        else:
+            tensor = scores.astype(dtype)
+            restored = tensor.astype(np.float64)
+
+        finite = np.isfinite(scores)
+        if 0 < scores.size and finite.any():
+            errors[term_idx] = np.abs(restored[finite] - scores[finite]).max()
+        tensors.append(tensor)
+    return tensors, scales, errors
+
+class EBMPredictor:
+    """ Minimal prediction-only copy of an EBM.
+
+    Only the cuts, category maps, term features, term scores and intercept are kept, so pickling a 
+    predictor is much smaller than pickling the model, which also holds the bagged scores, standard 
+    deviations, bin weights and histograms.  The flat EBMScorer structures are compiled on the first 
+    prediction and are not pickled, so each process that unpickles a predictor compiles its own.
+
+    The term scores can be stored as float32, or as int16 with a scale per term, and summed in float32.
+    error_bound then holds an upper bound on the absolute difference between decision_function and the
+    decision_function of the float64 model.
+    """
+
+    __slots__ = ('feature_names_in', 'feature_types_in', 'bins', 'term_features', 'term_scores', 'scales', 'intercept', 'classes', 'accumulate_dtype', 'error_bound', '_scorer')
+
+    def __init__(self, feature_names_in, feature_types_in, bins, intercept, term_scores, term_features, classes=None, dtype=np.float64, accumulate_dtype=np.float64):
+        """ Copies the model state needed for prediction.
+
+        Args:
+            feature_names_in: Feature names of the model
+            feature_types_in: Feature types of the model
+            bins: Per-feature list of bin levels, as stored in bins_
+            intercept: Intercept of the model
+            term_scores: Per-term score tensors, as stored in term_scores_
+            term_features: Per-term feature indexes, as stored in term_features_
+            classes: Class labels for classifiers, or None for regressors
+            dtype: np.float64, np.float32 or np.int16 for the stored term scores
+            accumulate_dtype: np.float64 or np.float32 for the sums of the term scores
+        """
+
+        accumulate_dtype = np.dtype(accumulate_dtype)
+        if accumulate_dtype != np.float64 and accumulate_dtype != np.float32:
+            msg = f"accumulate_dtype must be np.float64 or np.float32, but got {accumulate_dtype}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        self.feature_names_in = list(feature_names_in)
+        self.feature_types_in = list(feature_types_in)
+        # only the levels used by the terms are kept
+        max_levels = [0] * len(bins)
+        for feature_idxs in term_features:
+            for feature_idx in feature_idxs:
+                max_levels[feature_idx] = max(max_levels[feature_idx], len(feature_idxs))
+        self.bins = [[dict(feature_bins) if isinstance(feature_bins, dict) else np.array(feature_bins, np.float64) for feature_bins in bin_levels[:n_levels]] for bin_levels, n_levels in zip(bins, max_levels)]
+        self.term_features = [tuple(feature_idxs) for feature_idxs in term_features]
+        self.term_scores, self.scales, errors = quantize_term_scores(term_scores, dtype)
+        self.intercept = float(intercept) if type(intercept) is float else np.array(intercept, np.float64)
+        self.classes = None if classes is None else np.array(classes)
+        self.accumulate_dtype = accumulate_dtype
+
+        # each sample adds exactly one cell per term, so the conversion error is at most the sum of the
+        # per-term maximums.  Summing n values in floating point adds at most about n * eps / 2 of the sum 
+        # of their magnitudes, which we bound with the largest magnitudes.  The float64 model rounds its
+        # sums too, and in a different order, so its summation error is included as well
+        error_bound = float(errors.sum())
+        magnitude = float(np.abs(self.intercept).max())
+        for scores in term_scores:
+            scores = np.abs(np.asarray(scores, np.float64))
+            scores = scores[np.isfinite(scores)]
+            if 0 < scores.size:
+                magnitude += float(scores.max())
+        unit_roundoff = (np.finfo(accumulate_dtype).eps + np.finfo(np.float64).eps) / 2
+        error_bound += (len(term_scores) + 1) * unit_roundoff * (magnitude + error_bound)
+        self.error_bound = error_bound
+        self._scorer = None
+
+    def __getstate__(self):
+        # the compiled scorer is rebuilt on demand, so it is left out of pickles
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_scorer'}
+
+    def __setstate__(self, state):
+        for name, val in state.items():
+            setattr(self, name, val)
+        self._scorer = None
+
+    def _get_scorer(self):
+        scorer = self._scorer
+        if scorer is None:
+            scorer = EBMScorer(
+                self.feature_names_in, 
+                self.feature_types_in, 
+                self.bins, 
+                self.intercept, 
+                self.term_scores, 
+                self.term_features, 
+                self.classes,
+                scales=self.scales,
+                accumulate_dtype=self.accumulate_dtype
+            )
+            self._scorer = scorer
+        return scorer
+
+    def decision_function(self, X):
+        """ Predict scores before calling the link function.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            The sum of the additive term contributions.
+        """
+        return self._get_scorer().decision_function(X)
+
+    def predict_proba(self, X):
+        """ Probability estimates on provided samples.  Only available for classifiers.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            Probability estimate of sample for each class.
+        """
+        return self._get_scorer().predict_proba(X)
+
+    def predict(self, X):
+        """ Predicts on provided samples.
+
+        Args:
+            X: Numpy array for samples.
+
+        Returns:
+            Predicted class label per sample for classifiers, or the predicted values for regressors.
+        """
+        return self._get_scorer().predict(X)
+
+    def predict_and_contrib(self, X, output='probabilities'):
+        """ Predicts on provided samples, returning predictions and explanations for each sample.
+
+        Args:
+            X: Numpy array for samples.
+            output: For classifiers, the prediction type to output (i.e. one of 'probabilities', 'labels', 'logits').
+                Ignored for regressors.
+
+        Returns:
+            Predictions and local explanations for each sample.
+        """
+        scores, explanations = self._get_scorer().decision_function_and_explain(X)
+        if self.classes is None:
+            return scores, explanations
+
+        if output == 'logits':
+            return scores, explanations
+        elif output == 'probabilities':
+            if len(self.classes) == 1:
+                # if there is only one class then all probabilities are 100%
+                return np.full((scores.shape[0], 1), 1, np.float64), explanations
+            if scores.ndim == 1:
+                scores = np.c_[np.zeros(scores.shape), scores]
+            return softmax(scores), explanations
+        elif output == 'labels':
+            if scores.ndim == 1:
+                scores = np.c_[np.zeros(scores.shape), scores]
+            return self.classes[np.argmax(scores, axis=1)], explanations
+        else:
+            msg = f"Argument 'output' has invalid value. Got '{output}', expected 'probabilities', 'labels', or 'logits'" 
+            _log.error(msg)
+            raise ValueError(msg)
 
 def make_bin_weights(X, n_samples, sample_weight, feature_names_in, feature_types_in, bins, term_features):
+    if isinstance(X, _BinnedData):
+        binned_terms = ((term_idx, [X.get(feature_idx, bins[feature_idx][min(len(bins[feature_idx]), len(feature_idxs)) - 1]) for feature_idx in feature_idxs]) for term_idx, feature_idxs in enumerate(term_features))
+    else:
+        binned_terms = eval_terms(X, n_samples, feature_names_in, feature_types_in, bins, term_features)
+
     bin_weights = _none_list * len(term_features)
-    for term_idx, bin_indexes in eval_terms(X, n_samples, feature_names_in, feature_types_in, bins, term_features):
+    for term_idx, bin_indexes in binned_terms:
         feature_idxs = term_features[term_idx]
         multiple = 1
         dimensions = []
@@ -3,23 +3,25 @@
 
 
 from typing import DefaultDict
+from collections.abc import Sequence
 
 from interpret.provider.visualize import PreserveProvider
-from ...utils import gen_perf_dicts
+from ...utils import LocalPerfDicts
 from .utils import EBMUtils
-from .utils import _process_terms, make_all_histogram_edges, _order_terms, _remove_unused_higher_bins, _generate_term_names, _generate_term_types
-from ...utils._binning import determine_min_cols, clean_X, clean_dimensions, typify_classification, construct_bins, bin_native_by_dimension, unify_data2, _deduplicate_bins, normalize_initial_seed
-from .bin import ebm_decision_function, ebm_decision_function_and_explain, make_boosting_weights, after_boosting, remove_last2, make_bin_weights, trim_tensor, eval_terms
+from .utils import _write_binary, _read_binary, _iterencode_json, _decode_json_tensor, _process_terms, make_all_histogram_edges, _order_terms, _remove_unused_higher_bins, _generate_term_names, _generate_term_types
+from ...utils._binning import determine_min_cols, clean_X, clean_dimensions, typify_classification, construct_bins, construct_bins_chunked, bin_native_by_dimension, unify_data2, _deduplicate_bins, normalize_initial_seed, _iter_chunks, _is_chunked_source
+from .bin import make_boosting_weights, after_boosting, remove_last2, make_bin_weights, trim_tensor, EBMScorer, EBMPredictor
 from ...utils._native import Native
 from ...utils import unify_data, autogen_schema, unify_vector
 from ...api.base import ExplainerMixin
 from ...api.templates import FeatureValueExplanation
 from ...provider.compute import JobLibProvider
-from ...utils import gen_name_from_class, gen_global_selector, gen_global_selector2, gen_local_selector
-from ...utils._interaction import _get_ranked_interactions
+from ...utils import gen_name_from_class, gen_global_selector, gen_global_selector2
+from ...utils._interaction import _get_ranked_interactions, _rank_features_by_gain, _screen_pairs
 from ...utils._privacy import validate_eps_delta, calc_classic_noise_multi, calc_gdp_noise_multi
 
 import json
+import os
 from math import isnan
 
 import numpy as np
@@ -45,6 +47,51 @@ import logging
 _log = logging.getLogger(__name__)
 
 
+class EBMLocalDicts(Sequence):
+    """ The per-sample data of an EBM local explanation, stored column-wise.
+
+    Indexing builds the dictionary of a single sample that is used by EBMExplanation.visualize,
+    so explaining many samples does not create a dictionary for each of them.
+
+    Attributes:
+        term_names: List of term names.
+        contributions: Array of shape (n_samples, n_terms) for regression and binary classification, or
+            (n_samples, n_terms, n_classes) for multiclass, holding the score of each term for each sample.
+        values: Object array of shape (n_samples, n_terms) holding the feature value of each main term,
+            and "" for interaction terms.
+        intercept: The intercept of the model.
+        label_names: List of class labels for classification, otherwise None.
+        perf: LocalPerfDicts holding the predictions for each sample.
+    """
+
+    def __init__(self, term_names, contributions, values, intercept, label_names, perf):
+        self.term_names = term_names
+        self.contributions = contributions
+        self.values = values
+        self.intercept = intercept
+        self.label_names = label_names
+        self.perf = perf
+
+    def __len__(self):
+        return len(self.contributions)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+
+        data_dict = {
+            "type": "univariate",
+            "names": list(self.term_names),
+            "scores": list(self.contributions[key]),
+            "values": list(self.values[key]),
+            "extra": {"names": ["Intercept"], "scores": [self.intercept], "values": [1]},
+        }
+        if self.label_names is not None:
+            data_dict["meta"] = {"label_names": self.label_names}
+        data_dict["perf"] = self.perf[key]
+        return data_dict
+
+
 class EBMExplanation(FeatureValueExplanation):
     """ Visualizes specifically for EBM. """
 
@@ -189,6 +236,30 @@ def is_private(estimator):
 
     return isinstance(estimator, (DPExplainableBoostingClassifier, DPExplainableBoostingRegressor))
 
+def _top_k_contributions(contributions, k):
+    # keeps the k terms with the largest absolute contribution in each sample, ordered from largest to 
+    # smallest.  For multiclass the magnitude of a term is the sum of its absolute contributions across classes
+
+    magnitudes = np.abs(contributions)
+    if magnitudes.ndim == 3:
+        magnitudes = magnitudes.sum(axis=2)
+
+    n_terms = magnitudes.shape[1]
+    k = min(k, n_terms)
+    if k < n_terms:
+        # argpartition avoids sorting all the terms when only a few are kept
+        term_idxs = np.argpartition(-magnitudes, k - 1, axis=1)[:, :k]
+    else:
+        term_idxs = np.broadcast_to(np.arange(n_terms), magnitudes.shape)
+
+    order = np.argsort(-np.take_along_axis(magnitudes, term_idxs, axis=1), axis=1, kind='stable')
+    term_idxs = np.take_along_axis(term_idxs, order, axis=1)
+
+    gather_idxs = term_idxs if contributions.ndim == 2 else term_idxs[:, :, np.newaxis]
+    values = np.take_along_axis(contributions, gather_idxs, axis=1)
+
+    return term_idxs, values
+
 class EBMModel(BaseEstimator):
     """Base class for all EBMs"""
 
@@ -213,10 +284,13 @@ class EBMModel(BaseEstimator):
         # Core
         mains, # TODO PK v.3 replace "mains" with a more flexible "exclude" parameter
         interactions,
+        max_interaction_features,
         validation_size,
         max_rounds,
         early_stopping_tolerance,
         early_stopping_rounds,
+        early_stopping_window,
+        early_stopping_relative,
         # Native
         learning_rate,
         # Holte, R. C. (1993) "Very simple classification rules perform well on most commonly used datasets"
@@ -227,6 +301,7 @@ class EBMModel(BaseEstimator):
         # Overall
         n_jobs,
         random_state,
+        parallel_backend,
         # Preprocessor
         binning,
         max_bins,
@@ -251,11 +326,14 @@ class EBMModel(BaseEstimator):
         self.mains = mains
         if not is_private(self):
             self.interactions = interactions
+            self.max_interaction_features = max_interaction_features
         self.validation_size = validation_size
         self.max_rounds = max_rounds
         if not is_private(self):
             self.early_stopping_tolerance = early_stopping_tolerance
             self.early_stopping_rounds = early_stopping_rounds
+            self.early_stopping_window = early_stopping_window
+            self.early_stopping_relative = early_stopping_relative
 
         # Arguments for internal EBM.
         self.learning_rate = learning_rate
@@ -265,6 +343,7 @@ class EBMModel(BaseEstimator):
         # Arguments for overall
         self.n_jobs = n_jobs
         self.random_state = random_state
+        self.parallel_backend = parallel_backend
 
         # Arguments for preprocessor
         self.binning = binning
@@ -288,7 +367,11 @@ class EBMModel(BaseEstimator):
         """ Fits model to provided samples.
 
         Args:
-            X: Numpy array for training samples.
+            X: Numpy array for training samples. A pyarrow Table or RecordBatch is read directly without
+                converting it to pandas. For data that does not fit into memory, X can instead be a
+                path to a Parquet or .npy file, a list of such paths or of DataFrame/numpy/pyarrow chunks, or a zero 
+                argument callable that returns a new iterable of chunks each time it is called. Chunked X is 
+                read twice, one chunk at a time, and only its binned representation is kept in memory.
             y: Numpy array as training labels.
             sample_weight: Optional array of weights per sample. Should be same length as X and y.
 
@@ -330,8 +413,13 @@ class EBMModel(BaseEstimator):
                 raise ValueError(msg)
             sample_weight = sample_weight.astype(np.float64, copy=False)
 
-        min_cols = determine_min_cols(self.feature_names, self.feature_types)
-        X, n_samples = clean_X(X, min_cols, len(y))
+        is_chunked = _is_chunked_source(X)
+        if is_chunked:
+            # the chunks are counted while binning, which checks them against the length of y
+            n_samples = len(y)
+        else:
+            min_cols = determine_min_cols(self.feature_names, self.feature_types)
+            X, n_samples = clean_X(X, min_cols, len(y))
 
         # Privacy calculations
         is_differential_privacy = is_private(self)
@@ -375,22 +463,43 @@ class EBMModel(BaseEstimator):
         # exactly as passed to us. This means that we should get the same preprocessed data for the mains
         # if we create an EBMPreprocessor with the same seed.  For interactions, we increment by one
         # so it can be replicated without creating an EBM
-        binning_result = construct_bins(
-            X=X,
-            y=y,
-            sample_weight=sample_weight,
-            feature_names_given=self.feature_names, 
-            feature_types_given=self.feature_types, 
-            max_bins_leveled=bin_levels, 
-            binning=self.binning, 
-            min_samples_bin=1, 
-            min_unique_continuous=3, 
-            epsilon=bin_eps, 
-            delta=bin_delta, 
-            composition=composition,
-            privacy_schema=privacy_schema,
-            random_state=init_random_state,
-        )
+        if is_chunked:
+            if is_differential_privacy:
+                msg = "Differentially private EBMs do not support chunked X"
+                _log.error(msg)
+                raise ValueError(msg)
+
+            binning_result = construct_bins_chunked(
+                X=X,
+                n_samples=n_samples,
+                sample_weight=sample_weight,
+                feature_names_given=self.feature_names, 
+                feature_types_given=self.feature_types, 
+                max_bins_leveled=bin_levels, 
+                binning=self.binning, 
+                min_samples_bin=1, 
+                min_unique_continuous=3, 
+            )
+            # from here on X is the binned data, which is all that the rest of fit needs
+            X = binning_result[9]
+        else:
+            binning_result = construct_bins(
+                X=X,
+                y=y,
+                sample_weight=sample_weight,
+                feature_names_given=self.feature_names, 
+                feature_types_given=self.feature_types, 
+                max_bins_leveled=bin_levels, 
+                binning=self.binning, 
+                min_samples_bin=1, 
+                min_unique_continuous=3, 
+                epsilon=bin_eps, 
+                delta=bin_delta, 
+                composition=composition,
+                privacy_schema=privacy_schema,
+                random_state=init_random_state,
+                n_jobs=self.n_jobs,
+            )
         feature_names_in = binning_result[0]
         feature_types_in = binning_result[1]
         bins = binning_result[2]
@@ -442,7 +551,10 @@ class EBMModel(BaseEstimator):
             inner_bags = 0
             early_stopping_rounds = -1
             early_stopping_tolerance = -1
+            early_stopping_window = None
+            early_stopping_relative = False
             interactions = 0
+            max_interaction_features = None
         else:
             noise_scale = None
             bin_data_weights = None
@@ -450,7 +562,18 @@ class EBMModel(BaseEstimator):
             inner_bags = self.inner_bags
             early_stopping_rounds = self.early_stopping_rounds
             early_stopping_tolerance = self.early_stopping_tolerance
+            early_stopping_window = self.early_stopping_window
+            early_stopping_relative = self.early_stopping_relative
+            if early_stopping_window is not None and early_stopping_window < 1:
+                msg = f"early_stopping_window was {early_stopping_window}, but must be None or a positive number of rounds"
+                _log.error(msg)
+                raise ValueError(msg)
             interactions = self.interactions
+            max_interaction_features = self.max_interaction_features
+            if max_interaction_features is not None and max_interaction_features < 2:
+                msg = f"max_interaction_features was {max_interaction_features}, but must be None or 2 or more to form pairs"
+                _log.error(msg)
+                raise ValueError(msg)
 
         native = Native.get_native_singleton()
         rng = native.create_rng(init_random_state)
@@ -512,7 +635,7 @@ class EBMModel(BaseEstimator):
                     tensors.append(tensor)
                 models.append(tensors)
         else:
-            provider = JobLibProvider(n_jobs=self.n_jobs)
+            provider = JobLibProvider(n_jobs=self.n_jobs, backend=self.parallel_backend)
 
             dataset = bin_native_by_dimension(
                 n_classes, 
@@ -540,6 +663,8 @@ class EBMModel(BaseEstimator):
                         self.max_leaves,
                         early_stopping_rounds,
                         early_stopping_tolerance,
+                        early_stopping_window,
+                        early_stopping_relative,
                         self.max_rounds,
                         noise_scale,
                         bin_data_weights,
@@ -572,20 +697,19 @@ class EBMModel(BaseEstimator):
 
             if isinstance(interactions, int) and 0 < interactions or not isinstance(interactions, int) and 0 < len(interactions):
                 initial_intercept = np.zeros(Native.get_count_scores_c(n_classes), np.float64)
-                scores_bags = []
-                for model in models:
-                    # TODO: instead of going back to the original data in X, we 
-                    # could use the compressed and already binned data in dataset
-                    scores_bags.append(ebm_decision_function(
-                        X, 
-                        n_samples, 
-                        feature_names_in, 
-                        feature_types_in, 
-                        bins, 
-                        initial_intercept, 
-                        model, 
-                        term_features
-                    ))
+
+                # all the bags share the same bins and mains, so X only needs to be unified and discretized 
+                # once, and then each bag's model is scored against the same binned data
+                scorer = EBMScorer(
+                    feature_names_in, 
+                    feature_types_in, 
+                    bins, 
+                    initial_intercept, 
+                    models[0], 
+                    term_features,
+                )
+                scores_bags = scorer.decision_function_bags(X, models)
+                del scorer
 
                 dataset = bin_native_by_dimension(
                     n_classes, 
@@ -597,6 +721,22 @@ class EBMModel(BaseEstimator):
                     feature_names_in, 
                     feature_types_in, 
                 )
+
+                screen_features = isinstance(interactions, int) and max_interaction_features is not None and max_interaction_features < n_features_in
+                if screen_features:
+                    # rank the features once against the average of the bagged main effect scores so that 
+                    # FAST only needs to evaluate the pairs among the top features instead of all O(p^2) pairs
+                    ranked_features = _rank_features_by_gain(
+                        X, 
+                        n_samples, 
+                        feature_names_in, 
+                        feature_types_in, 
+                        bins, 
+                        y, 
+                        n_classes, 
+                        np.mean(scores_bags, axis=0), 
+                        sample_weight,
+                    )
                 del y # we no longer need this, so allow the garbage collector to reclaim it
 
                 if isinstance(interactions, int):
@@ -610,7 +750,7 @@ class EBMModel(BaseEstimator):
                                 dataset,
                                 bags[idx],
                                 scores_bags[idx],
-                                combinations(range(n_features_in), 2),
+                                _screen_pairs(ranked_features, max_interaction_features) if screen_features else combinations(range(n_features_in), 2),
                                 Native.InteractionFlags_Default, 
                                 self.min_samples_leaf,
                                 None,
@@ -677,6 +817,8 @@ class EBMModel(BaseEstimator):
                             self.max_leaves,
                             early_stopping_rounds,
                             early_stopping_tolerance,
+                            early_stopping_window,
+                            early_stopping_relative,
                             self.max_rounds,
                             noise_scale,
                             bin_data_weights,
@@ -789,7 +931,7 @@ class EBMModel(BaseEstimator):
             properties: 'minimal', 'interpretable', 'mergeable', 'all'
 
         Returns:
-            JSONable object
+            JSONable object, except that tensors are left as numpy arrays for _iterencode_json
         """
 
         check_is_fitted(self, "has_fitted_")
@@ -836,7 +978,7 @@ class EBMModel(BaseEstimator):
             # for our JSON format to harmonize the cross-language representation
             j['intercept'] = [EBMUtils.jsonify_item(self.intercept_)]
         else:
-            j['intercept'] = EBMUtils.jsonify_lists(self.intercept_.tolist())
+            j['intercept'] = self.intercept_
 
         if 3 <= level:
             noise_scale = getattr(self, 'noise_scale_', None)
@@ -849,7 +991,7 @@ class EBMModel(BaseEstimator):
         if 2 <= level:
             bag_weights = getattr(self, 'bag_weights_', None)
             if bag_weights is not None:
-                j['bag_weights'] = EBMUtils.jsonify_lists(bag_weights.tolist())
+                j['bag_weights'] = bag_weights
         if 3 <= level:
             breakpoint_iteration = getattr(self, 'breakpoint_iteration_', None)
             if breakpoint_iteration is not None:
@@ -880,6 +1022,8 @@ class EBMModel(BaseEstimator):
 
             if hasattr(self, 'interactions'):
                 params['interactions'] = self.interactions
+            if hasattr(self, 'max_interaction_features'):
+                params['max_interaction_features'] = self.max_interaction_features
 
             if hasattr(self, 'validation_size'):
                 params['validation_size'] = self.validation_size
@@ -893,6 +1037,12 @@ class EBMModel(BaseEstimator):
             if hasattr(self, 'early_stopping_rounds'):
                 params['early_stopping_rounds'] = self.early_stopping_rounds
 
+            if hasattr(self, 'early_stopping_window'):
+                params['early_stopping_window'] = self.early_stopping_window
+
+            if hasattr(self, 'early_stopping_relative'):
+                params['early_stopping_relative'] = self.early_stopping_relative
+
             if hasattr(self, 'learning_rate'):
                 params['learning_rate'] = self.learning_rate
 
@@ -908,6 +1058,9 @@ class EBMModel(BaseEstimator):
             if hasattr(self, 'random_state'):
                 params['random_state'] = self.random_state
 
+            if hasattr(self, 'parallel_backend'):
+                params['parallel_backend'] = self.parallel_backend
+
             if hasattr(self, 'binning'):
                 params['binning'] = self.binning
 
@@ -954,10 +1107,7 @@ class EBMModel(BaseEstimator):
                     feature['num_zero_vals'] = int(zero_val_counts[i])
 
             if feature_type == 'continuous':
-                cuts = []
-                for bins in self.bins_[i]:
-                    cuts.append(bins.tolist())
-                feature['cuts'] = cuts
+                feature['cuts'] = list(self.bins_[i])
                 if 1 <= level:
                     if feature_bounds is not None:
                         feature_min = feature_bounds[i, 0]
@@ -969,7 +1119,7 @@ class EBMModel(BaseEstimator):
                     if histogram_counts is not None:
                         feature_histogram_counts = histogram_counts[i]
                         if feature_histogram_counts is not None:
-                            feature['histogram_counts'] = feature_histogram_counts.tolist()
+                            feature['histogram_counts'] = feature_histogram_counts
             else:
                 categories = []
                 for bins in self.bins_[i]:
@@ -995,19 +1145,19 @@ class EBMModel(BaseEstimator):
         for term_idx in range(len(self.term_features_)):
             term = {}
             term['term_features'] = [self.feature_names_in_[feature_idx] for feature_idx in self.term_features_[term_idx]]
-            term['scores'] = EBMUtils.jsonify_lists(self.term_scores_[term_idx].tolist())
+            term['scores'] = self.term_scores_[term_idx]
             if 1 <= level:
                 if standard_deviations_all is not None:
                    standard_deviations = standard_deviations_all[term_idx] 
                    if standard_deviations is not None:
-                        term['standard_deviations'] = EBMUtils.jsonify_lists(standard_deviations.tolist())
+                        term['standard_deviations'] = standard_deviations
             if 2 <= level:
                 if bagged_scores_all is not None:
                    bagged_scores = bagged_scores_all[term_idx] 
                    if bagged_scores is not None:
-                        term['bagged_scores'] = EBMUtils.jsonify_lists(bagged_scores.tolist())
+                        term['bagged_scores'] = bagged_scores
             if 1 <= level:
-                term['bin_weights'] = EBMUtils.jsonify_lists(self.bin_weights_[term_idx].tolist())
+                term['bin_weights'] = self.bin_weights_[term_idx]
             
             terms.append(term)
         j['terms'] = terms
@@ -1021,7 +1171,7 @@ class EBMModel(BaseEstimator):
             properties: 'minimal', 'interpretable', 'mergeable', 'all'
 
         Returns:
-            JSONable object
+            JSONable object, except that tensors are left as numpy arrays for _iterencode_json
         """
 
         # NOTES: When recording edits to the EBM within a single file, we should:
@@ -1090,7 +1240,311 @@ class EBMModel(BaseEstimator):
         """
 
         outer = self._to_outer_jsonable(properties)
-        return json.dumps(outer, allow_nan=False, indent=2)
+        return ''.join(_iterencode_json(outer, indent=2))
+
+    def to_json(self, file, properties='interpretable', indent=2):
+        """ Writes the model in JSON format.
+
+            The JSON is streamed to the file one tensor at a time instead of being built as a 
+            single string, and each tensor is written on a single line.
+
+        Args:
+            file: Path or writable text file object.
+            properties: 'minimal', 'interpretable', 'mergeable', 'all'
+            indent: Indentation of the JSON structure outside of the tensors. None for compact output.
+        """
+
+        outer = self._to_outer_jsonable(properties)
+        if isinstance(file, (str, bytes, os.PathLike)):
+            with open(file, 'w', encoding='utf-8') as f:
+                f.writelines(_iterencode_json(outer, indent))
+        else:
+            file.writelines(_iterencode_json(outer, indent))
+
+    @classmethod
+    def from_json(cls, file):
+        """ Loads a model from JSON written by to_json.
+
+            The returned model is ready for prediction. Hyperparameters are restored when the
+            JSON was written with properties='all', otherwise the model has default hyperparameters.
+
+        Args:
+            file: Path or readable text file object.
+
+        Returns:
+            The fitted model.
+        """
+
+        if isinstance(file, (str, bytes, os.PathLike)):
+            with open(file, 'r', encoding='utf-8') as f:
+                outer = json.load(f)
+        else:
+            outer = json.load(file)
+
+        j = outer['ebm']
+
+        outputs = j['outputs']
+        if len(outputs) != 1:
+            msg = f"Only single output models are supported, but got {len(outputs)} outputs"
+            _log.error(msg)
+            raise ValueError(msg)
+        output = outputs[0]
+
+        is_classification = output['output_type'] == 'classification'
+        if cls is EBMModel:
+            model_class = ExplainableBoostingClassifier if is_classification else ExplainableBoostingRegressor
+        elif issubclass(cls, ClassifierMixin) == is_classification:
+            model_class = cls
+        else:
+            msg = f"The JSON holds a {output['output_type']} model which cannot be loaded as a {cls.__name__}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        model = model_class()
+
+        params = j.get('implementation_params', None)
+        if params is not None:
+            valid_params = model.get_params()
+            model.set_params(**{k: v for k, v in params.items() if k in valid_params})
+
+        features = j['features']
+        feature_names_in = [feature['name'] for feature in features]
+        feature_types_in = [feature['type'] for feature in features]
+        feature_idxs = {name: idx for idx, name in enumerate(feature_names_in)}
+
+        bins = []
+        feature_bounds = np.full((len(features), 2), np.nan, np.float64)
+        histogram_counts = []
+        for feature_idx, feature in enumerate(features):
+            if 'cuts' in feature:
+                bins.append([_decode_json_tensor(cuts) for cuts in feature['cuts']])
+                feature_bounds[feature_idx, 0] = feature.get('min', np.nan)
+                feature_bounds[feature_idx, 1] = feature.get('max', np.nan)
+                counts = feature.get('histogram_counts', None)
+                histogram_counts.append(None if counts is None else np.array(counts, np.int64))
+            else:
+                feature_bins = []
+                for leveled_categories in feature['categories']:
+                    # categories are written in bin order, and categories that share a bin are grouped in a list
+                    categories = {}
+                    for bin_idx, category_group in enumerate(leveled_categories):
+                        if isinstance(category_group, list):
+                            for category in category_group:
+                                categories[category] = bin_idx + 1
+                        else:
+                            categories[category_group] = bin_idx + 1
+                    feature_bins.append(categories)
+                bins.append(feature_bins)
+                histogram_counts.append(None)
+
+        term_features = []
+        term_scores = []
+        standard_deviations = []
+        bagged_scores = []
+        bin_weights = []
+        for term in j['terms']:
+            term_features.append(tuple(feature_idxs[name] for name in term['term_features']))
+            term_scores.append(_decode_json_tensor(term['scores']))
+            if 'standard_deviations' in term:
+                standard_deviations.append(_decode_json_tensor(term['standard_deviations']))
+            if 'bagged_scores' in term:
+                bagged_scores.append(_decode_json_tensor(term['bagged_scores']))
+            if 'bin_weights' in term:
+                bin_weights.append(_decode_json_tensor(term['bin_weights']))
+
+        model.n_features_in_ = len(features)
+        model.term_names_ = _generate_term_names(feature_names_in, term_features)
+
+        if 'noise_scale' in j:
+            model.noise_scale_ = float(j['noise_scale'])
+        if 'num_samples' in j:
+            model.n_samples_ = j['num_samples']
+        if any(x is not None for x in histogram_counts):
+            model.histogram_counts_ = histogram_counts
+        if all('num_unique_vals' in feature for feature in features):
+            model.unique_val_counts_ = np.array([feature['num_unique_vals'] for feature in features], np.int64)
+        if all('num_zero_vals' in feature for feature in features):
+            model.zero_val_counts_ = np.array([feature['num_zero_vals'] for feature in features], np.int64)
+
+        if is_classification:
+            model.classes_ = np.array(output['classes'])
+            model._class_idx_ = {x: index for index, x in enumerate(model.classes_)}
+            model.intercept_ = _decode_json_tensor(j['intercept'])
+        else:
+            model.min_target_ = float(output.get('min_target', np.nan))
+            model.max_target_ = float(output.get('max_target', np.nan))
+            model.intercept_ = float(_decode_json_tensor(j['intercept'])[0])
+
+        model.bins_ = bins
+        model.feature_names_in_ = feature_names_in
+        model.feature_types_in_ = feature_types_in
+        if not np.isnan(feature_bounds).all():
+            model.feature_bounds_ = feature_bounds
+
+        model.term_features_ = term_features
+        model.term_scores_ = term_scores
+        if len(standard_deviations) == len(term_features):
+            model.standard_deviations_ = standard_deviations
+        if len(bagged_scores) == len(term_features):
+            model.bagged_scores_ = bagged_scores
+        if len(bin_weights) == len(term_features):
+            model.bin_weights_ = bin_weights
+
+        if 'bag_weights' in j:
+            model.bag_weights_ = _decode_json_tensor(j['bag_weights'])
+        if 'breakpoint_iteration' in j:
+            model.breakpoint_iteration_ = np.array(j['breakpoint_iteration'], np.int64)
+
+        model.has_fitted_ = True
+        return model
+
+    def save(self, path, properties='minimal'):
+        """ Saves the model into a compact binary file that can be reopened with load.
+
+            The file holds a small JSON header with the feature, term, and category definitions
+            followed by the bin cuts and term score tensors as aligned little endian arrays. Loading
+            memory maps the arrays instead of parsing them, so large models open almost instantly
+            and worker processes that load the same file share its pages.
+
+        Args:
+            path: Path of the file to write.
+            properties: 'minimal' writes only what is needed for prediction. 'interpretable' 
+                also writes the standard deviations, bin weights, and feature statistics 
+                used by explain_global.
+        """
+        check_is_fitted(self, "has_fitted_")
+
+        if properties == 'minimal':
+            level = 0
+        elif properties == 'interpretable':
+            level = 1
+        else:
+            msg = f"Unrecognized save properties: {properties}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        arrays = []
+        def add_array(arr):
+            if arr is None:
+                return None
+            arrays.append(np.asarray(arr))
+            return len(arrays) - 1
+
+        bins = []
+        for feature_bins in self.bins_:
+            levels = []
+            for bin_levels in feature_bins:
+                if isinstance(bin_levels, dict):
+                    levels.append({'categories': {str(k): int(v) for k, v in bin_levels.items()}})
+                else:
+                    levels.append({'cuts': add_array(bin_levels.astype(np.float64, copy=False))})
+            bins.append(levels)
+
+        header = {}
+        header['version'] = '1.0'
+        header['class'] = type(self).__name__
+        header['feature_names_in'] = list(self.feature_names_in_)
+        header['feature_types_in'] = list(self.feature_types_in_)
+        header['bins'] = bins
+        header['term_features'] = [list(feature_idxs) for feature_idxs in self.term_features_]
+        header['term_names'] = list(self.term_names_)
+        if is_classifier(self):
+            header['classes'] = self.classes_.tolist()
+            header['classes_dtype'] = self.classes_.dtype.str
+        header['intercept'] = add_array(np.atleast_1d(np.asarray(self.intercept_, np.float64)))
+        header['term_scores'] = [add_array(scores) for scores in self.term_scores_]
+
+        if 1 <= level:
+            header['standard_deviations'] = [add_array(x) for x in self.standard_deviations_]
+            header['bin_weights'] = [add_array(x) for x in self.bin_weights_]
+            header['feature_bounds'] = add_array(getattr(self, 'feature_bounds_', None))
+            for name in ['histogram_edges_', 'histogram_counts_']:
+                values = getattr(self, name, None)
+                if values is not None:
+                    header[name[:-1]] = [add_array(x) for x in values]
+            for name in ['unique_val_counts_', 'zero_val_counts_']:
+                header[name[:-1]] = add_array(getattr(self, name, None))
+            n_samples = getattr(self, 'n_samples_', None)
+            if n_samples is not None:
+                header['n_samples'] = int(n_samples)
+
+        _write_binary(path, header, arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """ Loads a model written by save.
+
+            The returned model predicts identically to the saved model, but has default
+            hyperparameters since only the fitted attributes are saved.
+
+        Args:
+            path: Path of the file to read.
+            mmap: If True, the arrays are read-only views into a memory map of the file.
+                If False, the file is read into memory.
+
+        Returns:
+            The fitted model.
+        """
+        header, arrays = _read_binary(path, mmap)
+
+        model_classes = {x.__name__: x for x in [
+            ExplainableBoostingClassifier, 
+            ExplainableBoostingRegressor, 
+            DPExplainableBoostingClassifier, 
+            DPExplainableBoostingRegressor,
+        ]}
+        model_class = model_classes.get(header['class'], None)
+        if model_class is None or not issubclass(model_class, cls):
+            msg = f"{path} holds a {header['class']} which cannot be loaded as a {cls.__name__}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        def get_array(idx):
+            return None if idx is None else arrays[idx]
+
+        model = model_class()
+
+        bins = []
+        for levels in header['bins']:
+            feature_bins = []
+            for bin_levels in levels:
+                if 'categories' in bin_levels:
+                    feature_bins.append(bin_levels['categories'])
+                else:
+                    feature_bins.append(get_array(bin_levels['cuts']))
+            bins.append(feature_bins)
+
+        model.n_features_in_ = len(header['feature_names_in'])
+        model.term_names_ = header['term_names']
+        if 'classes' in header:
+            model.classes_ = np.array(header['classes'], dtype=np.dtype(header['classes_dtype']))
+            model._class_idx_ = {x: index for index, x in enumerate(model.classes_)}
+        model.bins_ = bins
+        model.feature_names_in_ = header['feature_names_in']
+        model.feature_types_in_ = header['feature_types_in']
+        model.term_features_ = [tuple(feature_idxs) for feature_idxs in header['term_features']]
+        model.term_scores_ = [get_array(idx) for idx in header['term_scores']]
+
+        intercept = get_array(header['intercept'])
+        # regression models use a float intercept for scikit-learn compatibility
+        model.intercept_ = intercept if is_classifier(model) else float(intercept[0])
+
+        if 'standard_deviations' in header:
+            model.standard_deviations_ = [get_array(idx) for idx in header['standard_deviations']]
+            model.bin_weights_ = [get_array(idx) for idx in header['bin_weights']]
+            model.feature_bounds_ = get_array(header['feature_bounds'])
+            for name in ['histogram_edges_', 'histogram_counts_']:
+                if name[:-1] in header:
+                    setattr(model, name, [get_array(idx) for idx in header[name[:-1]]])
+            for name in ['unique_val_counts_', 'zero_val_counts_']:
+                values = get_array(header[name[:-1]])
+                if values is not None:
+                    setattr(model, name, values)
+            if 'n_samples' in header:
+                model.n_samples_ = header['n_samples']
+
+        model.has_fitted_ = True
+        return model
 
     def decision_function(self, X):
         """ Predict scores from model before calling the link function.
@@ -1106,17 +1560,119 @@ class EBMModel(BaseEstimator):
         min_cols = determine_min_cols(self.feature_names_in_, self.feature_types_in_)
         X, n_samples = clean_X(X, min_cols)
 
-        return ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
+        return self.to_scorer()._score_cleaned(X, n_samples, False)[0]
+
+    def to_scorer(self):
+        """ Compiles the fitted model into a flat scoring engine for low overhead batch prediction.
+
+            The returned scorer is a frozen snapshot. Modifications made to this model afterwards
+            are not reflected in the scorer.
+
+            Returns:
+                An EBMScorer with decision_function, decision_function_and_explain, predict,
+                and for classifiers predict_proba methods.
+        """
+        check_is_fitted(self, "has_fitted_")
+
+        return EBMScorer(
+            self.feature_names_in_,
+            self.feature_types_in_,
+            self.bins_,
+            self.intercept_,
+            self.term_scores_,
+            self.term_features_,
+            self.classes_ if is_classifier(self) else None
         )
 
+    def to_predictor(self, dtype=np.float64, accumulate_dtype=np.float64):
+        """ Copies the state needed for prediction into a minimal predictor for deployment.
+
+            The predictor holds only the cuts, category maps, term features, term scores and intercept, 
+            so it pickles to a fraction of the size of the model, which also holds the bagged scores, 
+            standard deviations, bin weights and histograms.
+
+            Args:
+                dtype: np.float64, np.float32 or np.int16 for the stored term scores. float32 halves and int16 
+                    quarters the size of the scores at the cost of rounding them. int16 scores are scaled 
+                    per term.
+                accumulate_dtype: np.float64 or np.float32 for the sums of the term scores.
+
+            The predictor's error_bound holds an upper bound on the absolute difference between its 
+            decision_function and the decision_function of this model caused by the dtypes.
+
+            Returns:
+                An EBMPredictor with decision_function, predict, predict_and_contrib, and for 
+                classifiers predict_proba methods.
+        """
+        check_is_fitted(self, "has_fitted_")
+
+        return EBMPredictor(
+            self.feature_names_in_,
+            self.feature_types_in_,
+            self.bins_,
+            self.intercept_,
+            self.term_scores_,
+            self.term_features_,
+            self.classes_ if is_classifier(self) else None,
+            dtype,
+            accumulate_dtype
+        )
+
+    def _iter_predict_and_contrib(self, X, chunk_size, top_k, out):
+        # called under: iter_predict_and_contrib
+
+        if chunk_size < 1:
+            msg = f"chunk_size must be 1 or greater, but is {chunk_size}"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        if top_k is not None:
+            if top_k < 1:
+                msg = f"top_k must be 1 or greater, but is {top_k}"
+                _log.error(msg)
+                raise ValueError(msg)
+            if out is not None:
+                msg = "top_k and out cannot be used together since out holds the full contributions"
+                _log.error(msg)
+                raise ValueError(msg)
+
+        # the model is compiled once for all the chunks
+        scorer = self.to_scorer()
+
+        start = 0
+        for X_chunk in _iter_chunks(X, chunk_size):
+            scores, explanations = scorer.decision_function_and_explain(X_chunk)
+            end = start + scores.shape[0]
+
+            if out is not None:
+                if out.shape[0] < end or out.shape[1:] != explanations.shape[1:]:
+                    msg = f"out has shape {out.shape}, but at least {(end,) + explanations.shape[1:]} is required"
+                    _log.error(msg)
+                    raise ValueError(msg)
+                out[start:end] = explanations
+                explanations = out[start:end]
+            elif top_k is not None:
+                explanations = _top_k_contributions(explanations, top_k)
+
+            start = end
+            yield scores, explanations
+
+    def decision_function_row(self, row):
+        """ Predict the score of a single sample before calling the link function.
+
+            The model is compiled on each call so that the prediction reflects the current
+            fitted attributes.  For low latency scoring of many single samples, compile the
+            model once with to_scorer and call decision_function_row on the returned scorer,
+            which avoids creating numpy arrays.
+
+            Args:
+                row: Dictionary from feature name to value, or a sequence of values in the column order of X.
+
+            Returns:
+                The sum of the additive term contributions. A list with one score per class for multiclass.
+        """
+        return self.to_scorer().decision_function_row(row)
+
     def explain_global(self, name=None):
         """ Provides global explanation for model.
 
@@ -1386,73 +1942,50 @@ class EBMModel(BaseEstimator):
         term_names = self.term_names_
         term_types = _generate_term_types(self.feature_types_in_, self.term_features_)
 
-        data_dicts = []
-        perf_list = []
+        intercept = self.intercept_
+        if not is_classifier(self) or len(self.classes_) <= 2:
+            if isinstance(intercept, np.ndarray) or isinstance(intercept, list):
+                intercept = intercept[0]
+
+        # the explanations are built column-wise as (n_samples, n_terms) arrays, and the dictionary for 
+        # each sample is only built if it is accessed, which avoids n_samples * n_terms python objects
+        n_terms = len(self.term_features_)
+        score_shape = () if n_terms == 0 else self.term_scores_[0].shape[len(self.term_features_[0]):]
+        contributions = np.empty((n_samples, n_terms) + score_shape, np.float64)
+        values = np.full((n_samples, n_terms), "", np.object_)
         if n_samples == 0:
             X_unified = np.empty((0, len(self.feature_names_in_)), dtype=np.object_)
+            pred = np.empty((0,) + score_shape, np.float64)
         else:
             X_unified, _, _ = unify_data2(X, n_samples, self.feature_names_in_, self.feature_types_in_, True)
 
-            intercept = self.intercept_
-            if not is_classifier(self) or len(self.classes_) <= 2:
-                if isinstance(intercept, np.ndarray) or isinstance(intercept, list):
-                    intercept = intercept[0]
-
-            for _ in range(n_samples):
-                data_dict = {
-                    "type": "univariate",
-                    "names": [None] * len(self.term_features_),
-                    "scores": [None] * len(self.term_features_),
-                    "values": [None] * len(self.term_features_),
-                    "extra": {"names": ["Intercept"], "scores": [intercept], "values": [1]},
-                }
-                if is_classifier(self):
-                    data_dict["meta"] = {
-                        "label_names": self.classes_.tolist()  # Classes should be numpy array, convert to list.
-                    }
-                data_dicts.append(data_dict)
-
-            for term_idx, bin_indexes in eval_terms(X, n_samples, self.feature_names_in_, self.feature_types_in_, self.bins_, self.term_features_):
-                scores = self.term_scores_[term_idx][tuple(bin_indexes)]
-                feature_idxs = self.term_features_[term_idx]
-                for row_idx in range(n_samples):
-                    term_name = term_names[term_idx]
-                    data_dicts[row_idx]["names"][term_idx] = term_name
-                    data_dicts[row_idx]["scores"][term_idx] = scores[row_idx]
-                    if len(feature_idxs) == 1:
-                        data_dicts[row_idx]["values"][term_idx] = X_unified[row_idx, feature_idxs[0]]
-                    else:
-                        data_dicts[row_idx]["values"][term_idx] = ""
-
-            pred = ebm_decision_function(
-                X, 
-                n_samples, 
-                self.feature_names_in_, 
-                self.feature_types_in_, 
-                self.bins_, 
-                self.intercept_, 
-                self.term_scores_, 
-                self.term_features_
-            )
-
-            if is_classifier(self):
-                if len(self.classes_) == 1:
-                    # if there is only one class then all probabilities are 100%
-                    pred = np.full((n_samples, 1), 1, np.float64)
-                else:
-                    if pred.ndim == 1:
-                        # Handle binary classification case -- softmax only works with 0s appended
-                        pred = np.c_[np.zeros(pred.shape), pred]
-
-                    pred = softmax(pred)
+            for term_idx, feature_idxs in enumerate(self.term_features_):
+                if len(feature_idxs) == 1:
+                    values[:, term_idx] = X_unified[:, feature_idxs[0]]
 
-            perf_dicts = gen_perf_dicts(pred, y, is_classifier(self))
-            for row_idx in range(n_samples):
-                perf = None if perf_dicts is None else perf_dicts[row_idx]
-                perf_list.append(perf)
-                data_dicts[row_idx]["perf"] = perf
+            pred, contributions = self.to_scorer()._score_cleaned(X, n_samples, True)
 
-        selector = gen_local_selector(data_dicts, is_classification=is_classifier(self))
+        if is_classifier(self):
+            if len(self.classes_) == 1:
+                # if there is only one class then all probabilities are 100%
+                pred = np.full((n_samples, 1), 1, np.float64)
+            else:
+                if pred.ndim == 1:
+                    # Handle binary classification case -- softmax only works with 0s appended
+                    pred = np.c_[np.zeros(pred.shape), pred]
+
+                pred = softmax(pred) if n_samples != 0 else pred
+
+        perf_dicts = LocalPerfDicts(pred, y, is_classifier(self))
+        data_dicts = EBMLocalDicts(
+            term_names, 
+            contributions, 
+            values, 
+            intercept, 
+            self.classes_.tolist() if is_classifier(self) else None, 
+            perf_dicts,
+        )
+        selector = perf_dicts.to_selector()
 
         term_scores = remove_last2(self.term_scores_, self.bin_weights_)
         for term_idx, feature_idxs in enumerate(self.term_features_):
@@ -1467,7 +2000,7 @@ class EBMModel(BaseEstimator):
                     "value": {
                         "scores": term_scores,
                         "intercept": self.intercept_,
-                        "perf": perf_list,
+                        "perf": perf_dicts,
                     },
                 }
             ],
@@ -1541,6 +2074,7 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
         # Stages
         mains="all",
         interactions=10,
+        max_interaction_features=None,
         # Ensemble
         outer_bags=8,
         inner_bags=0,
@@ -1549,6 +2083,8 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
         validation_size=0.15,
         early_stopping_rounds=50,
         early_stopping_tolerance=1e-4,
+        early_stopping_window=None,
+        early_stopping_relative=False,
         max_rounds=5000,
         # Trees
         min_samples_leaf=2,
@@ -1556,6 +2092,7 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
         # Overall
         n_jobs=-2,
         random_state=42,
+        parallel_backend=None,
     ):
         """ Explainable Boosting Classifier. The arguments will change in a future release, watch the changelog.
 
@@ -1564,22 +2101,33 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
             feature_types: List of feature types.
             max_bins: Max number of bins per feature for pre-processing stage.
             max_interaction_bins: Max number of bins per feature for pre-processing stage on interaction terms. Only used if interactions is non-zero.
-            binning: Method to bin values for pre-processing. Choose "uniform", "quantile", or "rounded_quantile". 'rounded_quantile' will round to as few decimals as possible while preserving the same bins as 'quantile'.
+            binning: Method to bin values for pre-processing. Choose "uniform", "quantile", "rounded_quantile", or "quantile_sketch". 'rounded_quantile' will round to as few decimals as possible while preserving the same bins as 'quantile'. 'quantile_sketch' approximates 'quantile' from a small mergeable sketch of each feature, which is faster on large datasets. When X is chunked, the cuts always come from sketches.
             mains: Features to be trained on in main effects stage. Either "all" or a list of feature indexes.
             interactions: Interactions to be trained on.
                 Either a list of lists of feature indices, or an integer for number of automatically detected interactions.
                 Interactions are forcefully set to 0 for multiclass problems.
+            max_interaction_features: If not None, the features are first ranked by the gain of their bins on the 
+                residuals of the main effects, and FAST only evaluates the pairs among this many top ranked features.
+                Only used if interactions is an integer.
             outer_bags: Number of outer bags.
             inner_bags: Number of inner bags.
             learning_rate: Learning rate for boosting.
             validation_size: Validation set size for boosting.
             early_stopping_rounds: Number of rounds of no improvement to trigger early stopping.
             early_stopping_tolerance: Tolerance that dictates the smallest delta required to be considered an improvement.
+            early_stopping_window: If None, a round improves when the best validation metric beats the metric at the
+                start of the current run of rounds without improvement. Otherwise, the number of rounds over which the 
+                best validation metric must improve by more than early_stopping_tolerance to count as an improvement.
+            early_stopping_relative: If True, early_stopping_tolerance is relative to the magnitude of the metric 
+                being compared against instead of an absolute difference.
             max_rounds: Number of rounds for boosting.
             min_samples_leaf: Minimum number of cases for tree splits used in boosting.
             max_leaves: Maximum leaf nodes used in boosting.
             n_jobs: Number of jobs to run in parallel.
             random_state: Random state.
+            parallel_backend: joblib backend used to boost the outer bags in parallel. None uses the joblib default,
+                which is a pool of processes. "threading" boosts the bags on threads that share a single native 
+                dataset in this process, which is useful where nested process pools are not allowed.
         """
         super(ExplainableBoostingClassifier, self).__init__(
             # Explainer
@@ -1592,6 +2140,7 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
             # Stages
             mains=mains,
             interactions=interactions,
+            max_interaction_features=max_interaction_features,
             # Ensemble
             outer_bags=outer_bags,
             inner_bags=inner_bags,
@@ -1600,6 +2149,8 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
             validation_size=validation_size,
             early_stopping_rounds=early_stopping_rounds,
             early_stopping_tolerance=early_stopping_tolerance,
+            early_stopping_window=early_stopping_window,
+            early_stopping_relative=early_stopping_relative,
             max_rounds=max_rounds,
             # Trees
             min_samples_leaf=min_samples_leaf,
@@ -1607,6 +2158,7 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
             # Overall
             n_jobs=n_jobs,
             random_state=random_state,
+            parallel_backend=parallel_backend,
         )
 
     def predict_proba(self, X):
@@ -1627,16 +2179,7 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
             # if there is only one class then all probabilities are 100%
             return np.full((n_samples, 1), 1, np.float64)
 
-        log_odds_vector = ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        log_odds_vector = self.to_scorer()._score_cleaned(X, n_samples, False)[0]
 
         if log_odds_vector.ndim == 1:
             # Handle binary classification case -- softmax only works with 0s appended
@@ -1658,16 +2201,7 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
         min_cols = determine_min_cols(self.feature_names_in_, self.feature_types_in_)
         X, n_samples = clean_X(X, min_cols)
 
-        log_odds_vector = ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        log_odds_vector = self.to_scorer()._score_cleaned(X, n_samples, False)[0]
 
         # TODO: for binary classification we could just look for values greater than zero instead of expanding
         if log_odds_vector.ndim == 1:
@@ -1676,6 +2210,20 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
 
         return self.classes_[np.argmax(log_odds_vector, axis=1)]
 
+    def predict_one(self, row):
+        """ Predicts a single sample.
+
+        The model is compiled on each call. For low latency scoring of many single samples, 
+        compile the model once with to_scorer and call predict_row on the returned scorer.
+
+        Args:
+            row: Dictionary from feature name to value, or a sequence of values in the column order of X.
+
+        Returns:
+            Predicted class label.
+        """
+        return self.to_scorer().predict_row(row)
+
     def predict_and_contrib(self, X, output='probabilities'):
         """Predicts on provided samples, returning predictions and explanations for each sample.
 
@@ -1692,38 +2240,57 @@ class ExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
         min_cols = determine_min_cols(self.feature_names_in_, self.feature_types_in_)
         X, n_samples = clean_X(X, min_cols)
 
-        scores, explanations = ebm_decision_function_and_explain(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        scores, explanations = self.to_scorer()._score_cleaned(X, n_samples, True)
+
+        return self._scores_to_output(scores, output), explanations
+
+    def iter_predict_and_contrib(self, X, output='probabilities', chunk_size=65536, top_k=None, out=None):
+        """Lazily predicts on provided samples in chunks, yielding predictions and explanations for each chunk.
+
+        Only one chunk is held in memory at a time, so datasets larger than memory can be explained.
+
+        Args:
+            X: Numpy array or DataFrame for samples, an iterable of them (e.g. a generator 
+                of DataFrame chunks), or a path to a Parquet file (requires pyarrow).
+            output: Prediction type to output (i.e. one of 'probabilities', 'labels', 'logits')
+            chunk_size: Maximum number of samples processed at a time.
+            top_k: If given, only the top_k terms with the largest absolute contributions are kept 
+                for each sample, and the explanations are a tuple of term indexes and contributions.
+            out: Optional preallocated array (e.g. a numpy.memmap) into which the contributions of 
+                all samples are written in order. The yielded explanations are views into out.
+
+        Returns:
+            A generator of predictions and local explanations for each chunk.
+        """
+        self._scores_to_output(None, output)  # check output before any work is done
+        for scores, explanations in self._iter_predict_and_contrib(X, chunk_size, top_k, out):
+            yield self._scores_to_output(scores, output), explanations
+
+    def _scores_to_output(self, scores, output):
+        # called under: predict_and_contrib, iter_predict_and_contrib
+
+        if output not in ('probabilities', 'labels', 'logits'):
+            msg = f"Argument 'output' has invalid value. Got '{output}', expected 'probabilities', 'labels', or 'logits'" 
+            _log.error(msg)
+            raise ValueError(msg)
+
+        if scores is None:
+            return None
 
         if output == 'probabilities':
             if len(self.classes_) == 1:
                 # if there is only one class then all probabilities are 100%
-                result = np.full((n_samples, 1), 1, np.float64)
-            else:
-                if scores.ndim == 1:
-                    scores= np.c_[np.zeros(scores.shape), scores]
-                result = softmax(scores)
+                return np.full((scores.shape[0], 1), 1, np.float64)
+            if scores.ndim == 1:
+                scores = np.c_[np.zeros(scores.shape), scores]
+            return softmax(scores)
         elif output == 'labels':
             # TODO: for binary classification we could just look for values greater than zero instead of expanding
             if scores.ndim == 1:
                 scores = np.c_[np.zeros(scores.shape), scores]
-            result = self.classes_[np.argmax(scores, axis=1)]
-        elif output == 'logits':
-            result = scores
+            return self.classes_[np.argmax(scores, axis=1)]
         else:
-            msg = f"Argument 'output' has invalid value. Got '{output}', expected 'probabilities', 'labels', or 'logits'" 
-            _log.error(msg)
-            raise ValueError(msg)
-
-        return result, explanations
+            return scores
 
 class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
     """ Explainable Boosting Regressor. The arguments will change in a future release, watch the changelog. """
@@ -1746,6 +2313,7 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
         # Stages
         mains="all",
         interactions=10,
+        max_interaction_features=None,
         # Ensemble
         outer_bags=8,
         inner_bags=0,
@@ -1754,6 +2322,8 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
         validation_size=0.15,
         early_stopping_rounds=50,
         early_stopping_tolerance=1e-4,
+        early_stopping_window=None,
+        early_stopping_relative=False,
         max_rounds=5000,
         # Trees
         min_samples_leaf=2,
@@ -1761,6 +2331,7 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
         # Overall
         n_jobs=-2,
         random_state=42,
+        parallel_backend=None,
     ):
         """ Explainable Boosting Regressor. The arguments will change in a future release, watch the changelog.
 
@@ -1769,21 +2340,32 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             feature_types: List of feature types.
             max_bins: Max number of bins per feature for pre-processing stage on main effects.
             max_interaction_bins: Max number of bins per feature for pre-processing stage on interaction terms. Only used if interactions is non-zero.
-            binning: Method to bin values for pre-processing. Choose "uniform", "quantile", or "rounded_quantile". 'rounded_quantile' will round to as few decimals as possible while preserving the same bins as 'quantile'.
+            binning: Method to bin values for pre-processing. Choose "uniform", "quantile", "rounded_quantile", or "quantile_sketch". 'rounded_quantile' will round to as few decimals as possible while preserving the same bins as 'quantile'. 'quantile_sketch' approximates 'quantile' from a small mergeable sketch of each feature, which is faster on large datasets. When X is chunked, the cuts always come from sketches.
             mains: Features to be trained on in main effects stage. Either "all" or a list of feature indexes.
             interactions: Interactions to be trained on.
                 Either a list of lists of feature indices, or an integer for number of automatically detected interactions.
+            max_interaction_features: If not None, the features are first ranked by the gain of their bins on the 
+                residuals of the main effects, and FAST only evaluates the pairs among this many top ranked features.
+                Only used if interactions is an integer.
             outer_bags: Number of outer bags.
             inner_bags: Number of inner bags.
             learning_rate: Learning rate for boosting.
             validation_size: Validation set size for boosting.
             early_stopping_rounds: Number of rounds of no improvement to trigger early stopping.
             early_stopping_tolerance: Tolerance that dictates the smallest delta required to be considered an improvement.
+            early_stopping_window: If None, a round improves when the best validation metric beats the metric at the
+                start of the current run of rounds without improvement. Otherwise, the number of rounds over which the 
+                best validation metric must improve by more than early_stopping_tolerance to count as an improvement.
+            early_stopping_relative: If True, early_stopping_tolerance is relative to the magnitude of the metric 
+                being compared against instead of an absolute difference.
             max_rounds: Number of rounds for boosting.
             min_samples_leaf: Minimum number of cases for tree splits used in boosting.
             max_leaves: Maximum leaf nodes used in boosting.
             n_jobs: Number of jobs to run in parallel.
             random_state: Random state.
+            parallel_backend: joblib backend used to boost the outer bags in parallel. None uses the joblib default,
+                which is a pool of processes. "threading" boosts the bags on threads that share a single native 
+                dataset in this process, which is useful where nested process pools are not allowed.
         """
         super(ExplainableBoostingRegressor, self).__init__(
             # Explainer
@@ -1796,6 +2378,7 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             # Stages
             mains=mains,
             interactions=interactions,
+            max_interaction_features=max_interaction_features,
             # Ensemble
             outer_bags=outer_bags,
             inner_bags=inner_bags,
@@ -1804,6 +2387,8 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             validation_size=validation_size,
             early_stopping_rounds=early_stopping_rounds,
             early_stopping_tolerance=early_stopping_tolerance,
+            early_stopping_window=early_stopping_window,
+            early_stopping_relative=early_stopping_relative,
             max_rounds=max_rounds,
             # Trees
             min_samples_leaf=min_samples_leaf,
@@ -1811,6 +2396,7 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             # Overall
             n_jobs=n_jobs,
             random_state=random_state,
+            parallel_backend=parallel_backend,
         )
 
     def predict(self, X):
@@ -1827,16 +2413,21 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
         min_cols = determine_min_cols(self.feature_names_in_, self.feature_types_in_)
         X, n_samples = clean_X(X, min_cols)
 
-        return ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        return self.to_scorer()._score_cleaned(X, n_samples, False)[0]
+
+    def predict_one(self, row):
+        """ Predicts a single sample.
+
+        The model is compiled on each call. For low latency scoring of many single samples, 
+        compile the model once with to_scorer and call predict_row on the returned scorer.
+
+        Args:
+            row: Dictionary from feature name to value, or a sequence of values in the column order of X.
+
+        Returns:
+            Predicted value.
+        """
+        return self.to_scorer().predict_row(row)
 
     def predict_and_contrib(self, X):
         """Predicts on provided samples, returning predictions and explanations for each sample.
@@ -1853,16 +2444,26 @@ class ExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
         min_cols = determine_min_cols(self.feature_names_in_, self.feature_types_in_)
         X, n_samples = clean_X(X, min_cols)
 
-        return ebm_decision_function_and_explain(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        return self.to_scorer()._score_cleaned(X, n_samples, True)
+
+    def iter_predict_and_contrib(self, X, chunk_size=65536, top_k=None, out=None):
+        """Lazily predicts on provided samples in chunks, yielding predictions and explanations for each chunk.
+
+        Only one chunk is held in memory at a time, so datasets larger than memory can be explained.
+
+        Args:
+            X: Numpy array or DataFrame for samples, an iterable of them (e.g. a generator 
+                of DataFrame chunks), or a path to a Parquet file (requires pyarrow).
+            chunk_size: Maximum number of samples processed at a time.
+            top_k: If given, only the top_k terms with the largest absolute contributions are kept 
+                for each sample, and the explanations are a tuple of term indexes and contributions.
+            out: Optional preallocated array (e.g. a numpy.memmap) into which the contributions of 
+                all samples are written in order. The yielded explanations are views into out.
+
+        Returns:
+            A generator of predictions and local explanations for each chunk.
+        """
+        return self._iter_predict_and_contrib(X, chunk_size, top_k, out)
 
 
 class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin):
@@ -1895,6 +2496,7 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
         # Overall
         n_jobs=-2,
         random_state=None,
+        parallel_backend=None,
         # Differential Privacy
         epsilon=1,
         delta=1e-5,
@@ -1918,6 +2520,9 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
             min_samples_leaf: Minimum number of cases for tree splits used in boosting.
             n_jobs: Number of jobs to run in parallel.
             random_state: Random state.
+            parallel_backend: joblib backend used to boost the outer bags in parallel. None uses the joblib default,
+                which is a pool of processes. "threading" boosts the bags on threads that share a single native 
+                dataset in this process, which is useful where nested process pools are not allowed.
             epsilon: Total privacy budget to be spent across all rounds of training.
             delta: Additive component of differential privacy guarantee. Should be smaller than 1/n_training_samples.
             composition: composition.
@@ -1936,6 +2541,7 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
             # Stages
             mains=mains,
             interactions=0,
+            max_interaction_features=None,
             # Ensemble
             outer_bags=outer_bags,
             inner_bags=0,
@@ -1944,6 +2550,8 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
             validation_size=validation_size,
             early_stopping_rounds=-1,
             early_stopping_tolerance=-1,
+            early_stopping_window=None,
+            early_stopping_relative=False,
             max_rounds=max_rounds,
             # Trees
             min_samples_leaf=min_samples_leaf,
@@ -1951,6 +2559,7 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
             # Overall
             n_jobs=n_jobs,
             random_state=random_state,
+            parallel_backend=parallel_backend,
             # Differential Privacy
             epsilon=epsilon,
             delta=delta,
@@ -1977,16 +2586,7 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
             # if there is only one class then all probabilities are 100%
             return np.full((n_samples, 1), 1, np.float64)
 
-        log_odds_vector = ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        log_odds_vector = self.to_scorer()._score_cleaned(X, n_samples, False)[0]
 
         if log_odds_vector.ndim == 1:
             # Handle binary classification case -- softmax only works with 0s appended
@@ -2008,16 +2608,7 @@ class DPExplainableBoostingClassifier(EBMModel, ClassifierMixin, ExplainerMixin)
         min_cols = determine_min_cols(self.feature_names_in_, self.feature_types_in_)
         X, n_samples = clean_X(X, min_cols)
 
-        log_odds_vector = ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        log_odds_vector = self.to_scorer()._score_cleaned(X, n_samples, False)[0]
 
         # TODO: for binary classification we could just look for values greater than zero instead of expanding
         if log_odds_vector.ndim == 1:
@@ -2058,6 +2649,7 @@ class DPExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
         # Overall
         n_jobs=-2,
         random_state=None,
+        parallel_backend=None,
         # Differential Privacy
         epsilon=1,
         delta=1e-5,
@@ -2081,6 +2673,9 @@ class DPExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             min_samples_leaf: Minimum number of cases for tree splits used in boosting.
             n_jobs: Number of jobs to run in parallel.
             random_state: Random state.
+            parallel_backend: joblib backend used to boost the outer bags in parallel. None uses the joblib default,
+                which is a pool of processes. "threading" boosts the bags on threads that share a single native 
+                dataset in this process, which is useful where nested process pools are not allowed.
             epsilon: Total privacy budget to be spent across all rounds of training.
             delta: Additive component of differential privacy guarantee. Should be smaller than 1/n_training_samples.
             composition: Method of tracking noise aggregation. Must be one of 'classic' or 'gdp'. 
@@ -2099,6 +2694,7 @@ class DPExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             # Stages
             mains=mains,
             interactions=0,
+            max_interaction_features=None,
             # Ensemble
             outer_bags=outer_bags,
             inner_bags=0,
@@ -2107,6 +2703,8 @@ class DPExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             validation_size=validation_size,
             early_stopping_rounds=-1,
             early_stopping_tolerance=-1,
+            early_stopping_window=None,
+            early_stopping_relative=False,
             max_rounds=max_rounds,
             # Trees
             min_samples_leaf=min_samples_leaf,
@@ -2114,6 +2712,7 @@ class DPExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
             # Overall
             n_jobs=n_jobs,
             random_state=random_state,
+            parallel_backend=parallel_backend,
             # Differential Privacy
             epsilon=epsilon,
             delta=delta,
@@ -2137,14 +2736,5 @@ class DPExplainableBoostingRegressor(EBMModel, RegressorMixin, ExplainerMixin):
 
         X, n_samples = clean_X(X, min_cols)
 
-        return ebm_decision_function(
-            X, 
-            n_samples, 
-            self.feature_names_in_, 
-            self.feature_types_in_, 
-            self.bins_, 
-            self.intercept_, 
-            self.term_scores_, 
-            self.term_features_
-        )
+        return self.to_scorer()._score_cleaned(X, n_samples, False)[0]
 
@@ -13,7 +13,10 @@ from ....test.utils import (
 )
 from ....test.utils import synthetic_regression
 from ..ebm import ExplainableBoostingRegressor, ExplainableBoostingClassifier, DPExplainableBoostingClassifier, DPExplainableBoostingRegressor
+from ..bin import ebm_decision_function
 
+import io
+import pickle
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import (
@@ -498,6 +501,319 @@ def test_ebm_predict_and_contrib_regression():
     assert np.allclose(predictions_orig, explanations_sum)
 
 
+def test_ebm_fit_chunked(tmp_path, monkeypatch):
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    sample_weight = np.random.RandomState(0).uniform(0.5, 2.0, len(y))
+
+    clf = ExplainableBoostingClassifier(interactions=2, random_state=42)
+    clf.fit(X, y, sample_weight=sample_weight)
+
+    # every continuous feature fits in the quantile sketches, so the chunked model is identical.  The
+    # binned data is also scored for the interaction detection in several sample chunks
+    from .. import bin
+    monkeypatch.setattr(bin, "_BINNED_CHUNK_SAMPLES", 64)
+    chunks = [X.iloc[start:start + 150] for start in range(0, len(X), 150)]
+    chunked = ExplainableBoostingClassifier(interactions=2, random_state=42)
+    chunked.fit(chunks, y, sample_weight=sample_weight)
+
+    assert chunked.term_features_ == clf.term_features_
+    assert chunked.feature_types_in_ == clf.feature_types_in_
+    for chunked_scores, scores in zip(chunked.term_scores_, clf.term_scores_):
+        assert np.allclose(chunked_scores, scores)
+    for chunked_weights, weights in zip(chunked.bin_weights_, clf.bin_weights_):
+        assert np.allclose(chunked_weights, weights)
+    assert np.allclose(chunked.predict_proba(X), clf.predict_proba(X))
+
+    path = str(tmp_path / "X.npy")
+    np.save(path, X.values)
+    from_file = ExplainableBoostingClassifier(interactions=2, random_state=42)
+    from_file.fit(path, y, sample_weight=sample_weight)
+    assert np.allclose(from_file.predict_proba(X.values), clf.predict_proba(X))
+
+    with pytest.raises(ValueError):
+        ExplainableBoostingClassifier().fit(chunks, y[:-1])
+    with pytest.raises(ValueError):
+        DPExplainableBoostingClassifier().fit(chunks, y)
+
+
+def test_ebm_pyarrow(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    data = synthetic_classification()
+    X = data["full"]["X"].copy()
+    y = data["full"]["y"]
+    X["cat"] = pd.Categorical(np.where(X.iloc[:, 0] < 0, "low", "high"))
+    X["str"] = np.where(X.iloc[:, 1] < 0, "a", "b")
+    table = pa.Table.from_pandas(X, preserve_index=False)
+
+    clf = ExplainableBoostingClassifier(interactions=2, random_state=42)
+    clf.fit(X, y)
+    arrow = ExplainableBoostingClassifier(interactions=2, random_state=42)
+    arrow.fit(table, y)
+
+    assert arrow.feature_names_in_ == clf.feature_names_in_
+    assert arrow.feature_types_in_ == clf.feature_types_in_
+    assert arrow.term_features_ == clf.term_features_
+    for arrow_scores, scores in zip(arrow.term_scores_, clf.term_scores_):
+        assert np.allclose(arrow_scores, scores)
+    assert np.allclose(arrow.predict_proba(table), clf.predict_proba(X))
+    assert np.allclose(clf.predict_proba(table), clf.predict_proba(X))
+
+    path = str(tmp_path / "X.parquet")
+    pq.write_table(table, path)
+    from_file = ExplainableBoostingClassifier(interactions=2, random_state=42)
+    from_file.fit(path, y)
+    assert from_file.feature_types_in_ == clf.feature_types_in_
+    assert np.allclose(from_file.predict_proba(table), clf.predict_proba(X))
+
+
+def test_ebm_iter_predict_and_contrib(tmp_path):
+    data = synthetic_multiclass()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    clf = ExplainableBoostingClassifier(interactions=0)
+    clf.fit(X, y)
+
+    probabilities, explanations = clf.predict_and_contrib(X)
+    chunks = list(clf.iter_predict_and_contrib(X, chunk_size=7))
+    assert all(len(chunk_probabilities) <= 7 for chunk_probabilities, _ in chunks)
+    assert np.allclose(probabilities, np.concatenate([p for p, _ in chunks]))
+    assert np.allclose(explanations, np.concatenate([e for _, e in chunks]))
+
+    # an iterable of chunks is re-chunked, and the results can be streamed into a memmap
+    n_terms = len(clf.term_features_)
+    out = np.lib.format.open_memmap(str(tmp_path / "contrib.npy"), mode="w+", dtype=np.float64, shape=explanations.shape)
+    generator = (X.iloc[start:start + 20] for start in range(0, len(X), 20))
+    labels = np.concatenate([p for p, _ in clf.iter_predict_and_contrib(generator, output='labels', chunk_size=15, out=out)])
+    assert np.array_equal(labels, clf.predict(X))
+    assert np.allclose(out, explanations)
+
+    term_idxs, values = next(clf.iter_predict_and_contrib(X, top_k=2))[1]
+    assert term_idxs.shape == (len(X), 2)
+    assert values.shape == (len(X), 2, len(clf.classes_))
+    magnitudes = np.abs(explanations).sum(axis=2)
+    assert np.allclose(np.take_along_axis(magnitudes, term_idxs, axis=1), -np.sort(-magnitudes, axis=1)[:, :2])
+    assert np.allclose(values, explanations[np.arange(len(X))[:, np.newaxis], term_idxs])
+
+    with pytest.raises(ValueError):
+        next(clf.iter_predict_and_contrib(X, output='bad'))
+
+    data = synthetic_regression()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    reg = ExplainableBoostingRegressor(interactions=0)
+    reg.fit(X, y)
+
+    predictions, explanations = reg.predict_and_contrib(X)
+    chunks = list(reg.iter_predict_and_contrib(X.values, chunk_size=64, top_k=n_terms + 10))
+    assert np.allclose(predictions, np.concatenate([p for p, _ in chunks]))
+    values = np.concatenate([v for _, (_, v) in chunks])
+    assert np.allclose(np.sort(values, axis=1), np.sort(explanations, axis=1))
+
+
+def test_ebm_to_scorer_classification():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    X["A"] = pd.cut(X["A"], [-np.inf, -0.5, 0.5, np.inf], labels=["low", "medium", "high"], ordered=False)
+
+    clf = ExplainableBoostingClassifier(max_bins=10, max_interaction_bins=4, interactions=[(0, 1), (1, 2)])
+    clf.fit(X, y)
+    scorer = clf.to_scorer()
+
+    X_test = X.copy()
+    X_test["A"] = X_test["A"].cat.add_categories(["unseen"])
+    X_test.iloc[0, 0] = "unseen"
+    X_test.iloc[1, 2] = np.nan
+
+    assert np.allclose(clf.decision_function(X_test), scorer.decision_function(X_test))
+    assert np.allclose(clf.predict_proba(X_test), scorer.predict_proba(X_test))
+    assert np.array_equal(clf.predict(X_test), scorer.predict(X_test))
+
+    scores, explanations = clf.predict_and_contrib(X_test, output='logits')
+    scorer_scores, scorer_explanations = scorer.decision_function_and_explain(X_test)
+    assert np.allclose(scores, scorer_scores)
+    assert np.allclose(explanations, scorer_explanations)
+
+def test_ebm_to_scorer_multiclass_and_regression():
+    data = synthetic_multiclass()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    clf = ExplainableBoostingClassifier(interactions=0)
+    clf.fit(X, y)
+    scorer = clf.to_scorer()
+    assert np.allclose(clf.predict_proba(X), scorer.predict_proba(X))
+    scores, explanations = scorer.decision_function_and_explain(X)
+    assert explanations.shape == (X.shape[0], len(clf.term_features_), len(clf.classes_))
+    assert np.allclose(scores, explanations.sum(axis=1) + clf.intercept_)
+
+    data = synthetic_regression()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    reg = ExplainableBoostingRegressor(interactions=[(0, 1), (2, 3)])
+    reg.fit(X, y)
+    scorer = reg.to_scorer()
+    assert np.allclose(reg.predict(X), scorer.predict(X))
+    assert np.allclose(reg.predict(X.values[:1]), scorer.predict(X.values[:1]))
+
+def test_ebm_to_predictor():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    X["A"] = pd.cut(X["A"], [-np.inf, -0.5, 0.5, np.inf], labels=["low", "medium", "high"], ordered=False)
+
+    clf = ExplainableBoostingClassifier(outer_bags=8, max_bins=10, max_interaction_bins=4, interactions=[(0, 1), (1, 2)])
+    clf.fit(X, y)
+    predictor = pickle.loads(pickle.dumps(clf.to_predictor()))
+    assert len(pickle.dumps(predictor)) * 4 < len(pickle.dumps(clf))
+
+    assert np.allclose(clf.decision_function(X), predictor.decision_function(X))
+    assert np.allclose(clf.predict_proba(X), predictor.predict_proba(X))
+    assert np.array_equal(clf.predict(X), predictor.predict(X))
+    for output in ['probabilities', 'labels', 'logits']:
+        labels, explanations = clf.predict_and_contrib(X, output=output)
+        predictor_labels, predictor_explanations = predictor.predict_and_contrib(X, output=output)
+        assert np.array_equal(labels, predictor_labels) if output == 'labels' else np.allclose(labels, predictor_labels)
+        assert np.allclose(explanations, predictor_explanations)
+
+    # the compiled scorer is not pickled with the predictor
+    size = len(pickle.dumps(predictor))
+    assert "_scorer" not in predictor.__getstate__()
+    assert len(pickle.dumps(predictor)) == size
+    assert np.allclose(pickle.loads(pickle.dumps(predictor)).decision_function(X), predictor.decision_function(X))
+
+    predictor32 = clf.to_predictor(np.float32)
+    assert predictor32.term_scores[0].dtype == np.float32
+    assert np.allclose(clf.predict_proba(X), predictor32.predict_proba(X), atol=1e-5)
+
+    scores = clf.decision_function(X)
+    for dtype in [np.float64, np.float32, np.int16]:
+        for accumulate_dtype in [np.float64, np.float32]:
+            predictor = clf.to_predictor(dtype, accumulate_dtype)
+            assert np.abs(predictor.decision_function(X) - scores).max() <= predictor.error_bound
+            _, explanations = predictor.predict_and_contrib(X, output='logits')
+            assert explanations.dtype == accumulate_dtype
+    assert clf.to_predictor(np.int16).term_scores[0].dtype == np.int16
+
+    data = synthetic_regression()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    reg = ExplainableBoostingRegressor(interactions=[(0, 1)])
+    reg.fit(X, y)
+    predictor = reg.to_predictor()
+    assert np.allclose(reg.predict(X), predictor.predict(X))
+    predictor16 = reg.to_predictor(np.int16, np.float32)
+    assert 0 < predictor16.error_bound
+    assert np.abs(predictor16.predict(X) - reg.predict(X)).max() <= predictor16.error_bound
+    assert predictor16._get_scorer().decision_function_row(X.values[0]) == pytest.approx(reg.predict(X.values[:1])[0], abs=predictor16.error_bound)
+    scores, explanations = predictor.predict_and_contrib(X)
+    assert np.allclose(scores, explanations.sum(axis=1) + reg.intercept_)
+
+
+def test_ebm_windowed_early_stopping():
+    data = synthetic_regression()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    reg = ExplainableBoostingRegressor(interactions=0, outer_bags=2, early_stopping_window=20, early_stopping_relative=True, early_stopping_tolerance=1e-3)
+    reg.fit(X, y)
+    assert np.all(reg.breakpoint_iteration_ < reg.max_rounds - 1)
+    assert np.all(np.isfinite(reg.predict(X)))
+
+    with pytest.raises(ValueError):
+        ExplainableBoostingRegressor(early_stopping_window=0).fit(X, y)
+
+
+def test_ebm_threading_backend():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    clf_processes = ExplainableBoostingClassifier(n_jobs=2, outer_bags=4, interactions=2)
+    clf_processes.fit(X, y)
+    clf_threads = ExplainableBoostingClassifier(n_jobs=2, outer_bags=4, interactions=2, parallel_backend="threading")
+    clf_threads.fit(X, y)
+
+    assert clf_processes.term_features_ == clf_threads.term_features_
+    for scores_processes, scores_threads in zip(clf_processes.term_scores_, clf_threads.term_scores_):
+        assert np.array_equal(scores_processes, scores_threads)
+
+
+def test_ebm_scorer_decision_function_bags():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    clf = ExplainableBoostingClassifier(interactions=[(0, 1)], outer_bags=3)
+    clf.fit(X, y)
+
+    scorer = clf.to_scorer()
+    bagged_term_scores = [[tensor[bag_idx] for tensor in clf.bagged_scores_] for bag_idx in range(3)]
+    scores_bags = scorer.decision_function_bags(X, bagged_term_scores)
+    assert len(scores_bags) == 3
+    for term_scores, scores in zip(bagged_term_scores, scores_bags):
+        expected = ebm_decision_function(X, X.shape[0], clf.feature_names_in_, clf.feature_types_in_, clf.bins_, clf.intercept_, term_scores, clf.term_features_)
+        assert np.allclose(scores, expected)
+
+    with pytest.raises(ValueError):
+        scorer.decision_function_bags(X, [bagged_term_scores[0][:-1]])
+
+
+def test_ebm_predict_one():
+    X = np.array([["a", 1.5, 3], ["b", 2.5, 2], ["c", np.nan, 1], ["a", 4.5, 0], ["b", 0.5, 3], ["c", 3.5, 2]] * 10, dtype=np.object_)
+    y = np.array([0, 1, 1, 0, 1, 0] * 10)
+
+    clf = ExplainableBoostingClassifier(feature_names=["cat", "cont", "num"], interactions=[(0, 1)])
+    clf.fit(X, y)
+
+    X_test = np.array([["a", 2.0, 3], ["d", np.nan, 1], [None, "BAD", 0], ["c", "4.5", 2]], dtype=np.object_)
+    scores = clf.decision_function(X_test)
+    labels = clf.predict(X_test)
+    for row, score, label in zip(X_test, scores, labels):
+        assert np.isclose(clf.decision_function_row(tuple(row)), score)
+        assert np.isclose(clf.decision_function_row(dict(zip(clf.feature_names_in_, row))), score)
+        assert clf.predict_one(list(row)) == label
+
+    clf = ExplainableBoostingClassifier(interactions=0)
+    clf.fit(X, np.array([0, 1, 2] * 20))
+    scores = clf.decision_function(X_test)
+    labels = clf.predict(X_test)
+    for row, score, label in zip(X_test, scores, labels):
+        assert np.allclose(clf.decision_function_row(row), score)
+        assert clf.predict_one(row) == label
+
+    reg = ExplainableBoostingRegressor(interactions=[(1, 2)])
+    reg.fit(X, np.arange(len(X), dtype=np.float64))
+    predictions = reg.predict(X_test)
+    for row, prediction in zip(X_test, predictions):
+        assert np.isclose(reg.predict_one(row), prediction)
+
+def test_ebm_predictions_follow_model_edits():
+    X = np.array([["a", 1.5, 3], ["b", 2.5, 2], ["c", np.nan, 1], ["a", 4.5, 0], ["b", 0.5, 3], ["c", 3.5, 2]] * 10, dtype=np.object_)
+    y = np.array([0, 1, 1, 0, 1, 0] * 10)
+
+    clf = ExplainableBoostingClassifier(interactions=[(0, 1)])
+    clf.fit(X, y)
+
+    scores = clf.decision_function(X)
+    assert np.allclose(scores, ebm_decision_function(X, len(X), clf.feature_names_in_, clf.feature_types_in_, clf.bins_, clf.intercept_, clf.term_scores_, clf.term_features_))
+    assert np.isclose(clf.decision_function_row(X[0]), scores[0])
+    scorer = clf.to_scorer()
+
+    # in-place edits to the fitted attributes are reflected in the next prediction
+    clf.term_scores_[0] += 1.0
+    clf.intercept_ += 5.0
+    assert np.allclose(clf.decision_function(X), scores + 6.0)
+    assert np.isclose(clf.decision_function_row(X[0]), scores[0] + 6.0)
+    assert np.allclose(clf.predict_proba(X)[:, 1], 1.0 / (1.0 + np.exp(-(scores + 6.0))))
+    _, explanations = clf.predict_and_contrib(X, output='logits')
+    assert np.allclose(explanations.sum(axis=1) + clf.intercept_, scores + 6.0)
+
+    # the compiled scorer is a snapshot taken before the edits
+    assert np.allclose(scorer.decision_function(X), scores)
+
 def test_ebm_sample_weight():
     data = adult_classification()
     X_train = data["train"]["X"][:, [0, 1]]
@@ -571,6 +887,33 @@ def test_ebm_sparse():
     _smoke_test_explanations(global_exp, local_exp, 6002)
 
 
+def test_ebm_sparse_scoring():
+    import scipy as sp
+
+    rng = np.random.RandomState(0)
+    X = sp.sparse.random(500, 6, density=0.1, format="csr", random_state=rng)
+    X.data = np.round(X.data * 5)
+    X_dense = X.toarray()
+    y = (X_dense[:, 0] + X_dense[:, 1] + rng.normal(0, 0.5, 500) > 1).astype(np.int64)
+
+    feature_types = ['continuous', 'continuous', 'nominal', 'nominal', 'continuous', 'continuous']
+    clf = ExplainableBoostingClassifier(feature_types=feature_types, interactions=[(0, 1), (0, 2), (2, 3)])
+    clf.fit(X, y)
+
+    assert np.allclose(clf.predict_proba(X), clf.predict_proba(X_dense))
+    scores, explanations = clf.predict_and_contrib(X, output='logits')
+    dense_scores, dense_explanations = clf.predict_and_contrib(X_dense, output='logits')
+    assert np.allclose(scores, dense_scores)
+    assert np.allclose(explanations, dense_explanations)
+    assert np.allclose(clf.decision_function(X), dense_scores)
+
+    # an unseen category in a stored value goes to the unknown bin
+    X = X.tolil()
+    X[0, 2] = 99.0
+    scorer = clf.to_scorer()
+    assert np.allclose(scorer.decision_function(X.tocsr()), scorer.decision_function(X.toarray()))
+
+
 @pytest.mark.slow
 def test_zero_validation():
     data = synthetic_classification()
@@ -810,6 +1153,14 @@ def test_json_classification():
 
     json_text = clf._to_json(properties='all')
 
+    loaded = ExplainableBoostingClassifier.from_json(io.StringIO(json_text))
+    assert loaded.bins_[0][0] == clf.bins_[0][0]
+    assert loaded.max_bins == clf.max_bins
+    for loaded_scores, scores in zip(loaded.term_scores_, clf.term_scores_):
+        assert np.array_equal(loaded_scores, scores, equal_nan=True)
+    for loaded_scores, scores in zip(loaded.bagged_scores_, clf.bagged_scores_):
+        assert np.array_equal(loaded_scores, scores, equal_nan=True)
+
 def test_json_multiclass():
     data = synthetic_multiclass()
     X = data["full"]["X"]
@@ -830,6 +1181,28 @@ def test_json_regression():
     clf.fit(X, y)
     json_text = clf._to_json(properties='all')
 
+    loaded = ExplainableBoostingRegressor.from_json(io.StringIO(json_text))
+    assert np.array_equal(loaded.predict(X), clf.predict(X))
+
+def test_json_file_roundtrip(tmp_path):
+    data = synthetic_multiclass()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+    feature_types = ['continuous'] * X.shape[1]
+    feature_types[0] = 'nominal'
+    clf = ExplainableBoostingClassifier(max_bins=10, feature_types=feature_types, interactions=0)
+    clf.fit(X, y)
+
+    path = tmp_path / "model.json"
+    clf.to_json(path, properties='minimal', indent=None)
+
+    loaded = ExplainableBoostingClassifier.from_json(path)
+    assert np.array_equal(loaded.classes_, clf.classes_)
+    assert np.array_equal(loaded.predict_proba(X), clf.predict_proba(X))
+
+    with pytest.raises(ValueError):
+        ExplainableBoostingRegressor.from_json(path)
+
 def test_json_dp_classification():
     data = synthetic_classification()
     X = data["full"]["X"]
@@ -852,3 +1225,86 @@ def test_json_dp_regression():
     clf = DPExplainableBoostingRegressor(max_bins=5, feature_types=feature_types)
     clf.fit(X, y)
     json_text = clf._to_json(properties='all')
+
+def test_save_load_classification(tmp_path):
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    X["A"] = pd.cut(X["A"], [-np.inf, -0.5, 0.5, np.inf], labels=["low", "medium", "high"], ordered=False)
+    y = np.where(y == 1, "yes", "no")
+
+    clf = ExplainableBoostingClassifier(outer_bags=2, max_bins=10, interactions=[(0, 1)])
+    clf.fit(X, y)
+
+    path = tmp_path / "model.ebm"
+    clf.save(path, properties='interpretable')
+
+    for mmap in [True, False]:
+        loaded = ExplainableBoostingClassifier.load(path, mmap=mmap)
+        assert loaded.term_features_ == clf.term_features_
+        assert np.array_equal(loaded.classes_, clf.classes_)
+        assert np.array_equal(loaded.predict_proba(X), clf.predict_proba(X))
+        assert np.array_equal(loaded.predict(X), clf.predict(X))
+        loaded.explain_global()
+
+    with pytest.raises(ValueError):
+        ExplainableBoostingRegressor.load(path)
+
+def test_save_load_regression(tmp_path):
+    data = synthetic_regression()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    clf = ExplainableBoostingRegressor(max_bins=10, interactions=[(1, 2)])
+    clf.fit(X, y)
+
+    path = tmp_path / "model.ebm"
+    clf.save(path)
+
+    loaded = ExplainableBoostingRegressor.load(path)
+    assert type(loaded.intercept_) is float
+    assert np.array_equal(loaded.predict(X), clf.predict(X))
+    assert loaded.predict_one(X.iloc[0]) == clf.predict_one(X.iloc[0])
+
+
+def test_ebm_max_interaction_features():
+    data = synthetic_regression()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    reg = ExplainableBoostingRegressor(interactions=3, max_interaction_features=3, outer_bags=2)
+    reg.fit(X, y)
+
+    pairs = [term for term in reg.term_features_ if len(term) == 2]
+    assert len(pairs) == 3
+    assert len(set(i for pair in pairs for i in pair)) == 3
+
+    with pytest.raises(ValueError):
+        ExplainableBoostingRegressor(max_interaction_features=1).fit(X, y)
+
+
+def test_ebm_explain_local_columnar():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    clf = ExplainableBoostingClassifier(interactions=[(0, 1)], outer_bags=2)
+    clf.fit(X, y)
+
+    local_expl = clf.explain_local(X, y)
+    specific = local_expl.data(-1)["specific"]
+    assert specific.contributions.shape == (X.shape[0], len(clf.term_features_))
+    assert specific.values.shape == (X.shape[0], len(clf.term_features_))
+    assert specific.term_names == clf.term_names_
+    assert len(local_expl.selector) == X.shape[0]
+
+    _, contributions = clf.predict_and_contrib(X, output="logits")
+    assert np.allclose(specific.contributions, contributions)
+
+    data_dict = local_expl.data(3)
+    assert data_dict["names"] == clf.term_names_
+    assert np.allclose(data_dict["scores"], contributions[3])
+    assert data_dict["values"][-1] == ""
+    assert data_dict["perf"]["actual"] == np.asarray(y).ravel()[3]
+    assert local_expl.visualize(3) is not None
@@ -127,3 +127,36 @@ def test_merge_ebms():
     global_exp = merged_ebm3.explain_global()
     local_exp = merged_ebm3.explain_local(X_te[:5, :], y_te[:5])
     _smoke_test_explanations(global_exp, local_exp, 6000)
+
+def test_merge_ebms_weights_and_threads():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = data["full"]["y"]
+
+    ebm1 = ExplainableBoostingClassifier(random_state=1, outer_bags=3, max_bins=8, interactions=[(0, 1)])
+    ebm1.fit(X[:70], y[:70])
+    ebm2 = ExplainableBoostingClassifier(random_state=2, outer_bags=2, max_bins=6, max_interaction_bins=4, interactions=[(1, 2)])
+    ebm2.fit(X[30:], y[30:])
+
+    merged = merge_ebms([ebm1, ebm2])
+    valid_ebm(merged)
+    assert len(merged.bag_weights_) == 5
+    for bagged_scores in merged.bagged_scores_:
+        assert bagged_scores.shape[0] == 5
+
+    threaded = merge_ebms([ebm1, ebm2], n_jobs=2)
+    for scores, threaded_scores in zip(merged.term_scores_, threaded.term_scores_):
+        assert np.array_equal(scores, threaded_scores)
+
+    # a model with a zero weight contributes nothing to the scores of the terms that it shares
+    weighted = merge_ebms([ebm1, ebm2], weights=[1.0, 0.0])
+    term_idx = weighted.term_features_.index((0,))
+    assert np.array_equal(weighted.bins_[0][0], merged.bins_[0][0])
+    assert not np.allclose(weighted.term_scores_[term_idx], merged.term_scores_[term_idx])
+    assert np.allclose(weighted.predict_proba(X), merge_ebms([ebm1, ebm2], weights=[2.0, 0.0]).predict_proba(X))
+
+    with pytest.raises(ValueError):
+        merge_ebms([ebm1, ebm2], weights=[1.0])
+    for weights in [[1.0, -1.0], [1.0, np.nan], [np.inf, 1.0], [0.0, 0.0]]:
+        with pytest.raises(ValueError):
+            merge_ebms([ebm1, ebm2], weights=weights)
@@ -4,14 +4,17 @@
 # TODO: Test EBMUtils
 
 from math import ceil, floor, isnan, isinf, exp, log
-from ...utils._native import Native, Booster
+from ...utils._native import Native, Booster, EarlyStoppingState
 from ...utils._binning import _deduplicate_bins
+from ...provider.compute import JobLibProvider
 
 # from scipy.special import expit
 from sklearn.utils.extmath import softmax
 from sklearn.model_selection import train_test_split
 from sklearn.base import is_classifier
 import numbers
+import json
+import re
 import numpy as np
 import warnings
 import copy
@@ -334,6 +337,113 @@ def make_all_histogram_edges(feature_bounds, histogram_counts):
             ret[idx] = make_histogram_edges(min_feature_val, max_feature_val, histogram_bin_counts)
     return ret
 
+def _harmonize_axis(feature_idx, n_dims, new_bounds, new_bins, old_bounds, old_bins, old_mapping):
+    # builds the map from the old bins of one feature onto the new bins.  Returns the new and old bin
+    # indexes of each (new, old) pair sorted by new bin, the fraction of each old bin's weight that
+    # falls into each new bin, and the number of old bins that contribute to each new bin
+
+    old_bin_levels = old_bins[feature_idx]
+    old_feature_bins = old_bin_levels[min(len(old_bin_levels), n_dims) - 1]
+
+    mapping_levels = old_mapping[feature_idx]
+    old_feature_mapping = mapping_levels[min(len(mapping_levels), n_dims) - 1]
+
+    new_bin_levels = new_bins[feature_idx]
+    new_feature_bins = new_bin_levels[min(len(new_bin_levels), n_dims) - 1]
+
+    if isinstance(new_feature_bins, dict):
+        # categorical feature
+
+        old_reversed = dict()
+        for category, bin_idx in old_feature_bins.items():
+            category_list = old_reversed.get(bin_idx)
+            if category_list is None:
+                old_reversed[bin_idx] = [category]
+            else:
+                category_list.append(category)
+
+        new_reversed = dict()
+        for category, bin_idx in new_feature_bins.items():
+            category_list = new_reversed.get(bin_idx)
+            if category_list is None:
+                new_reversed[bin_idx] = [category]
+            else:
+                category_list.append(category)
+        new_reversed = sorted(new_reversed.items())
+
+        lookup = [0]
+        percentage = [1.0]
+        for _, new_categories in new_reversed:
+            # if there are two items in new_categories then they should both resolve
+            # to the same index in old_feature_bins otherwise they would have been
+            # split into two categories
+            old_bin_idx = old_feature_bins.get(new_categories[0], -1)
+            if 0 <= old_bin_idx:
+                percentage.append(len(new_categories) / len(old_reversed[old_bin_idx]))
+            else:
+                # map to the unknown bin for scores, but take no percentage of the weight
+                percentage.append(0.0)
+            lookup.append(old_bin_idx)
+        percentage.append(1.0)
+        lookup.append(-1)
+
+        lookup = np.array(lookup, np.int64)
+        percentage = np.array(percentage, np.float64)
+    else:
+        # continuous feature
+
+        # the regular new bins each fall within a single old bin since the new cuts are a superset of the old
+        lookup = np.searchsorted(old_feature_bins, new_feature_bins, side='left') + 1
+        lookup = np.append(lookup, len(old_feature_bins) + 1)
+
+        # TODO: if the bounds are nan OR out of bounds from the cuts, estimate them.  If -inf or +inf, change them to min/max for float
+        new_edges = np.concatenate(([new_bounds[feature_idx, 0]], new_feature_bins, [new_bounds[feature_idx, 1]]))
+        old_edges = np.concatenate(([old_bounds[feature_idx, 0]], old_feature_bins, [old_bounds[feature_idx, 1]]))
+        new_low = new_edges[:-1]
+        new_high = new_edges[1:]
+        old_low = old_edges[lookup - 1]
+        old_high = old_edges[lookup]
+
+        # the new min can be lower than the old min, and the new max can be higher than the old max.  In those
+        # regions we know the old data had zero contribution.  If the new bins are entirely outside of where the 
+        # old data extended, then the old data has zero contribution to them
+        is_outside = (old_high <= new_low) | (new_high <= old_low)
+        new_low = np.where(new_low < old_low, old_low, new_low)
+        new_high = np.where(old_high < new_high, old_high, new_high)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage = np.where(is_outside, 0.0, (new_high - new_low) / (old_high - old_low))
+
+        lookup = np.concatenate(([0], lookup, [-1]))
+        percentage = np.concatenate(([1.0], percentage, [1.0]))
+
+    # the -1 lookups refer to the unknown bin, which is the last one.  np.take and list indexing both accept them
+    if old_feature_mapping is None:
+        new_idxs = np.arange(len(lookup), dtype=np.int64)
+        n_old_cells = np.ones(len(lookup), np.int64)
+        return new_idxs, lookup, percentage, n_old_cells
+
+    # the old bins were converted from categoricals, and each converted bin maps to several original bins
+    old_cells = [old_feature_mapping[old_bin_idx] for old_bin_idx in lookup.tolist()]
+    n_old_cells = np.fromiter((len(cells) for cells in old_cells), np.int64, count=len(old_cells))
+    new_idxs = np.repeat(np.arange(len(lookup), dtype=np.int64), n_old_cells)
+    old_idxs = np.fromiter(chain.from_iterable(old_cells), np.int64, count=int(n_old_cells.sum()))
+    return new_idxs, old_idxs, percentage, n_old_cells
+
+def _sum_over_axes(tensor, axis_maps, n_lead):
+    # for each new bin, sums the old bins that map to it, one axis at a time
+    for dimension_idx, (new_idxs, old_idxs, percentages, n_old_cells) in enumerate(axis_maps):
+        axis = n_lead + dimension_idx
+        gathered = np.take(tensor, old_idxs, axis=axis)
+        if len(new_idxs) == len(percentages) and (n_old_cells == 1).all():
+            # one old bin per new bin, so we can use the gathered values directly
+            tensor = gathered
+        else:
+            gathered = np.moveaxis(gathered, axis, 0)
+            summed = np.zeros((len(percentages),) + gathered.shape[1:], np.float64)
+            np.add.at(summed, new_idxs, gathered)
+            tensor = np.moveaxis(summed, 0, axis)
+    return tensor
+
 def _harmonize_tensor(
     new_feature_idxs, 
     new_bounds, 
@@ -343,8 +453,17 @@ def _harmonize_tensor(
     old_bins, 
     old_mapping, 
     old_tensor, 
-    bin_evidence_weight
+    bin_evidence_weight,
+    axis_cache=None,
+    batched=False
 ):
+    # The old tensor is remapped onto the new bins of each axis. If bin_evidence_weight is None the tensor
+    # holds weights, which are split between new bins in proportion to their overlap with the old bins.
+    # Otherwise it holds scores, which are copied to the new bins, and averaged by bin_evidence_weight
+    # wherever a new bin covers several old bins. If batched is True, the first axis of old_tensor is a 
+    # batch axis (eg: the outer bags) that is carried through. axis_cache is a dict that holds the per-axis
+    # maps between calls for the same old model.
+
     # TODO: don't pass in new_bound and old_bounds.  We use the bounds to proportion
     # weights at the tail ends of the graphs, but the problem with that is that
     # you can have outliers that'll stretch the weight very thin.  If you have an
@@ -373,6 +492,7 @@ def _harmonize_tensor(
     # the bin level that we're handling!
 
     old_feature_idxs = list(old_feature_idxs)
+    n_dims = len(old_feature_idxs)
 
     axes = []
     for feature_idx in new_feature_idxs:
@@ -380,184 +500,216 @@ def _harmonize_tensor(
         old_feature_idxs[old_idx] = -1 # in case we have duplicate feature idxs
         axes.append(old_idx)
 
-    if len(axes) != old_tensor.ndim:
+    n_lead = 1 if batched else 0
+    if len(axes) + n_lead != old_tensor.ndim:
         # multiclass. The last dimension always stays put
         axes.append(len(axes))
+    n_trail = len(axes) - n_dims
 
-    old_tensor = old_tensor.transpose(tuple(axes))
+    if batched:
+        old_tensor = old_tensor.transpose(tuple([0] + [axis + 1 for axis in axes]))
+    else:
+        old_tensor = old_tensor.transpose(tuple(axes))
     if bin_evidence_weight is not None:
-        bin_evidence_weight = bin_evidence_weight.transpose(tuple(axes))
+        bin_evidence_weight = bin_evidence_weight.transpose(tuple(axes[:n_dims]))
 
-    mapping = []
-    lookups = []
-    percentages = []
+    axis_maps = []
     for feature_idx in new_feature_idxs:
-        old_bin_levels = old_bins[feature_idx]
-        old_feature_bins = old_bin_levels[min(len(old_bin_levels), len(old_feature_idxs)) - 1]
-
-        mapping_levels = old_mapping[feature_idx]
-        old_feature_mapping = mapping_levels[min(len(mapping_levels), len(old_feature_idxs)) - 1]
-        if old_feature_mapping is None:
-            old_feature_mapping = list((x,) for x in range(len(old_feature_bins) + (2 if isinstance(old_feature_bins, dict) else 3)))
-        mapping.append(old_feature_mapping)
-
-        new_bin_levels = new_bins[feature_idx]
-        new_feature_bins = new_bin_levels[min(len(new_bin_levels), len(new_feature_idxs)) - 1]
-
-        if isinstance(new_feature_bins, dict):
-            # categorical feature
-
-            old_reversed = dict()
-            for category, bin_idx in old_feature_bins.items():
-                category_list = old_reversed.get(bin_idx)
-                if category_list is None:
-                    old_reversed[bin_idx] = [category]
-                else:
-                    category_list.append(category)
-
-            new_reversed = dict()
-            for category, bin_idx in new_feature_bins.items():
-                category_list = new_reversed.get(bin_idx)
-                if category_list is None:
-                    new_reversed[bin_idx] = [category]
-                else:
-                    category_list.append(category)
-            new_reversed = sorted(new_reversed.items())
-
-            lookup = [0]
-            percentage = [1.0]
-            for _, new_categories in new_reversed:
-                # if there are two items in new_categories then they should both resolve
-                # to the same index in old_feature_bins otherwise they would have been
-                # split into two categories
-                old_bin_idx = old_feature_bins.get(new_categories[0], -1)
-                if 0 <= old_bin_idx:
-                    percentage.append(len(new_categories) / len(old_reversed[old_bin_idx]))
-                else:
-                    # map to the unknown bin for scores, but take no percentage of the weight
-                    percentage.append(0.0)
-                lookup.append(old_bin_idx)
-            percentage.append(1.0)
-            lookup.append(-1)
-        else:
-            # continuous feature
-
-            lookup = list(np.searchsorted(old_feature_bins, new_feature_bins, side='left') + 1)
-            lookup.append(len(old_feature_bins) + 1)
+        key = (feature_idx, n_dims)
+        axis_map = None if axis_cache is None else axis_cache.get(key, None)
+        if axis_map is None:
+            axis_map = _harmonize_axis(feature_idx, n_dims, new_bounds, new_bins, old_bounds, old_bins, old_mapping)
+            if axis_cache is not None:
+                axis_cache[key] = axis_map
+        axis_maps.append(axis_map)
+
+    # each new cell draws from the cross product of the old cells listed for it on each axis, so the
+    # sums over those cells are computed one axis at a time
+    new_shape = tuple(len(axis_map[2]) for axis_map in axis_maps)
+    counts = np.ones(new_shape, np.int64)
+    fracs = np.ones(new_shape, np.float64)
+    for dimension_idx, (_, _, percentages, n_old_cells) in enumerate(axis_maps):
+        shape = [1] * n_dims
+        shape[dimension_idx] = len(percentages)
+        counts = counts * n_old_cells.reshape(shape)
+        fracs = fracs * percentages.reshape(shape)
+    expand = (np.newaxis,) * n_lead + (Ellipsis,) + (np.newaxis,) * n_trail
+
+    gathered = _sum_over_axes(old_tensor, axis_maps, n_lead)
+    if bin_evidence_weight is None:
+        # we're doing a bin weight and NOT a score tensor
+        return gathered * fracs[expand]
+
+    if (counts == 1).all():
+        # if there's just one cell, which is typical, don't incur the floating point loss in precision
+        return gathered
+
+    # we're doing scores and we need to take a weighted average, but if the total weight is zero then 
+    # the result should be zero
+    weights = bin_evidence_weight[(np.newaxis,) * n_lead + (Ellipsis,) + (np.newaxis,) * n_trail]
+    weighted = _sum_over_axes(old_tensor * weights, axis_maps, n_lead)
+    total_weights = _sum_over_axes(bin_evidence_weight, axis_maps, 0)[expand]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        averaged = np.where(total_weights != 0.0, weighted / total_weights, 0.0)
+    return np.where(counts[expand] == 1, gathered, averaged)
+
+# binary files start with the magic bytes, followed by the length of the JSON header as a little endian uint64,
+# then the header itself, and then the arrays.  Each array starts on a multiple of _BINARY_ALIGNMENT bytes from the 
+# start of the file so that memory mapped arrays are aligned for vectorized reads
+_BINARY_MAGIC = b"EBMBIN\x00\x01"
+_BINARY_ALIGNMENT = 64
+
+def _align_binary(offset):
+    return (offset + _BINARY_ALIGNMENT - 1) // _BINARY_ALIGNMENT * _BINARY_ALIGNMENT
+
+def _write_binary(path, header, arrays):
+    """ Writes a JSON header and numeric arrays into a single binary file.
 
-            percentage = [1.0]
-            for new_idx_minus_one, old_idx in enumerate(lookup):
-                if new_idx_minus_one == 0:
-                    new_low = new_bounds[feature_idx, 0]
-                    # TODO: if nan OR out of bounds from the cuts, estimate it.  If -inf or +inf, change it to min/max for float
-                else:
-                    new_low = new_feature_bins[new_idx_minus_one - 1]
+    Args:
+        path: Path of the file to write.
+        header: JSONable dict.  An "arrays" entry describing the arrays is added to a copy of it.
+        arrays: List of numeric numpy arrays, which are referenced from the header by their position.
 
-                if len(new_feature_bins) <= new_idx_minus_one:
-                    new_high = new_bounds[feature_idx, 1]
-                    # TODO: if nan OR out of bounds from the cuts, estimate it.  If -inf or +inf, change it to min/max for float
-                else:
-                    new_high = new_feature_bins[new_idx_minus_one]
+    """
+    # offsets are relative to the start of the data section, which follows the header, so that the header
+    # can describe the offsets without depending on its own length
+    descriptions = []
+    data_offset = 0
+    little_endian = []
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        if arr.dtype.kind not in 'biuf':
+            msg = f"Only numeric arrays can be written, but got {arr.dtype}"
+            _log.error(msg)
+            raise ValueError(msg)
+        arr = arr.astype(arr.dtype.newbyteorder('<'), copy=False)
+        little_endian.append(arr)
+        data_offset = _align_binary(data_offset)
+        descriptions.append({'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': data_offset})
+        data_offset += arr.nbytes
+
+    header = dict(header)
+    header['arrays'] = descriptions
+    header_bytes = json.dumps(header, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+    with open(path, 'wb') as f:
+        f.write(_BINARY_MAGIC)
+        f.write(np.uint64(len(header_bytes)).astype('<u8').tobytes())
+        f.write(header_bytes)
+        data_start = _align_binary(f.tell())
+        for arr, description in zip(little_endian, descriptions):
+            f.write(bytes(data_start + description['offset'] - f.tell()))
+            f.write(arr.tobytes())
+
+def _read_binary(path, mmap=True):
+    """ Reads a file written by _write_binary.
 
+    Args:
+        path: Path of the file to read.
+        mmap: If True, the arrays are read-only views of a memory map of the file, so opening the file is
+            nearly free and the pages are shared between processes that map the same file.  If False, the 
+            whole file is read into memory.
 
-                if old_idx == 1:
-                    old_low = old_bounds[feature_idx, 0]
-                    # TODO: if nan OR out of bounds from the cuts, estimate it.  If -inf or +inf, change it to min/max for float
-                else:
-                    old_low = old_feature_bins[old_idx - 2]
+    Returns:
+        The header dict and the list of arrays.
+    """
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
 
-                if len(old_feature_bins) < old_idx:
-                    old_high = old_bounds[feature_idx, 1]
-                    # TODO: if nan OR out of bounds from the cuts, estimate it.  If -inf or +inf, change it to min/max for float
-                else:
-                    old_high = old_feature_bins[old_idx - 1]
+    n_magic = len(_BINARY_MAGIC)
+    if len(buffer) < n_magic + 8 or buffer[:n_magic].tobytes() != _BINARY_MAGIC:
+        msg = f"{path} is not an EBM binary file"
+        _log.error(msg)
+        raise ValueError(msg)
 
-                if old_high <= new_low or new_high <= old_low:
-                    # if there are bins in the area above where the old data extended, then 
-                    # we'll have zero contribution in the old data where these new bins are
-                    # located
-                    percentage.append(0.0)
-                else:
-                    if new_low < old_low:
-                        # this can't happen except at the lowest bin where the new min can be
-                        # lower than the old min.  In that case we know the old data
-                        # had zero contribution between the new min to the old min.
-                        new_low = old_low
+    header_len = int(buffer[n_magic:n_magic + 8].view('<u8')[0])
+    header_end = n_magic + 8 + header_len
+    header = json.loads(buffer[n_magic + 8:header_end].tobytes().decode('utf-8'))
+    data_start = _align_binary(header_end)
+
+    arrays = []
+    for description in header.pop('arrays'):
+        dtype = np.dtype(description['dtype'])
+        shape = tuple(description['shape'])
+        start = data_start + description['offset']
+        end = start + dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        if len(buffer) < end:
+            msg = f"{path} is truncated"
+            _log.error(msg)
+            raise ValueError(msg)
+        # view the bytes without copying.  For memory maps the resulting arrays keep the map open
+        arrays.append(buffer[start:end].view(dtype).reshape(shape))
+    return header, arrays
+
+# JSON has no NaN or infinities, but javaScript does, so these are written as the javaScript strings
+_JSON_NONFINITE = re.compile(r'-?Infinity|NaN')
+_JSON_TENSOR = re.compile(r'"\\u0000(\d+)\\u0000"')
+
+def _encode_json_tensor(tensor):
+    # json.dumps encodes lists of python numbers in C, which is much faster than visiting each element 
+    # from python.  Numbers never contain letters other than "e", so the non-finite tokens can be
+    # safely quoted afterwards
+    text = json.dumps(tensor.tolist(), separators=(',', ':'))
+    if tensor.dtype.kind == 'f' and not np.isfinite(tensor).all():
+        text = _JSON_NONFINITE.sub(r'"\g<0>"', text)
+    return text
+
+def _iterencode_json(obj, indent=None):
+    """ Encodes an object into JSON text chunks, writing numpy arrays as compact nested lists.
 
-                    if old_high < new_high:
-                        # this can't happen except at the lowest bin where the new max can be
-                        # higher than the old max.  In that case we know the old data
-                        # had zero contribution between the new max to the old max.
-                        new_high = old_high
+    Args:
+        obj: JSONable object, which can also contain numeric numpy arrays.
+        indent: Indentation of the non-tensor structure, as in json.dumps.
 
-                    percentage.append((new_high - new_low) / (old_high - old_low))
+    Yields:
+        Chunks of JSON text.
+    """
 
-            percentage.append(1.0)
-            lookup.insert(0, 0)
-            lookup.append(-1)
+    # tensors are replaced with placeholder strings, the remaining small structure is encoded normally,
+    # and then the placeholders are substituted for each tensor as the text is emitted, so only one 
+    # tensor is held as text at a time
+    tensors = []
+    def replace(val):
+        if isinstance(val, np.ndarray):
+            tensors.append(val)
+            return f"\x00{len(tensors) - 1}\x00"
+        elif isinstance(val, dict):
+            return {k: replace(v) for k, v in val.items()}
+        elif isinstance(val, (list, tuple)):
+            return [replace(v) for v in val]
+        return val
 
-        lookups.append(lookup)
-        percentages.append(percentage)
+    skeleton = json.dumps(replace(obj), allow_nan=False, indent=indent)
+    start = 0
+    for match in _JSON_TENSOR.finditer(skeleton):
+        yield skeleton[start:match.start()]
+        yield _encode_json_tensor(tensors[int(match.group(1))])
+        start = match.end()
+    yield skeleton[start:]
+
+def _decode_json_tensor(vals, dtype=np.float64):
+    """ Converts nested lists from JSON, which can include the strings "NaN", "Infinity", 
+        and "-Infinity", into a numpy array.
+    """
+    try:
+        return np.array(vals, dtype)
+    except ValueError:
+        # non-finite strings are only present in rare tensors, so only those pay for the slower conversion
+        return np.array(vals, dtype=object).astype(dtype)
 
-    new_shape = tuple(len(lookup) for lookup in lookups)
-    n_cells = np.prod(new_shape)
+def merge_ebms(models, weights=None, n_jobs=1):
+    """ Merging multiple EBM models trained on the same dataset.
 
-    lookups.reverse()
-    percentages.reverse()
-    mapping.reverse()
+    The merged bins are the union of the models' bins, and each model's tensors are remapped onto them once
+    per term, with all of a model's outer bags remapped together.
 
-    # now we need to inflate it
-    new_tensor = np.empty(n_cells, np.float64)
-    for cell_idx in range(n_cells):
-        remainder = cell_idx
-        old_reversed_bin_idxs = []
-        frac = 1.0
-        for lookup, percentage in zip(lookups, percentages):
-            n_bins = len(lookup)
-            new_bin_idx = remainder % n_bins
-            remainder //= n_bins
-            old_reversed_bin_idxs.append(lookup[new_bin_idx])
-            frac *= percentage[new_bin_idx]
-
-        cell_map = [map_bins[bin_idx] for map_bins, bin_idx in zip(mapping, old_reversed_bin_idxs)]
-        n_cells2 = np.prod([len(x) for x in cell_map])
-        val = 0.0
-        total_weight = 0.0
-        for cell2_idx in range(n_cells2):
-            remainder2 = cell2_idx
-            old_reversed_bin2_idxs = []
-            for lookup2 in cell_map:
-                n_bins2 = len(lookup2)
-                new_bin2_idx = remainder2 % n_bins2
-                remainder2 //= n_bins2
-                old_reversed_bin2_idxs.append(lookup2[new_bin2_idx])
-            update = old_tensor[tuple(reversed(old_reversed_bin2_idxs))]
-            if n_cells2 == 1:
-                # if there's just one cell, which is typical, don't 
-                # incur the floating point loss in precision
-                val = update
-            else:
-                if bin_evidence_weight is not None:
-                    evidence_weight = bin_evidence_weight[tuple(reversed(old_reversed_bin2_idxs))]
-                    update *= evidence_weight
-                    total_weight += evidence_weight
-                val += update
-        if bin_evidence_weight is None:
-            # we're doing a bin weight and NOT a score tensor
-            val *= frac
-        elif total_weight != 0.0:
-            # we're doing scores and we need to take a weighted average
-            # but if the total_weight is zero then val should be zero and
-            # our update should still be zero, which it already is
-            val = val / total_weight
-        new_tensor.itemset(cell_idx, val)
-    new_tensor = new_tensor.reshape(new_shape)
-    return new_tensor
-
-def merge_ebms(models):
-    """ Merging multiple EBM models trained on the same dataset.
     Args:
         models: List of EBM models to be merged.
+        weights: Optional per-model multipliers for the bag weights, which set how much each model's scores
+            contribute to the merged scores. None weighs models by the total weight of their samples.
+        n_jobs: Number of threads used to merge the terms in parallel.
     Returns:
         An EBM model with averaged mean and standard deviation of input models.
     """
@@ -739,7 +891,7 @@ def merge_ebms(models):
                             old_bins[model_idx][feature_idx][level_idx] = converted_bins
                             old_mapping[model_idx][feature_idx][level_idx] = mapping
                 
-                merged_bins = np.array(sorted(set(chain.from_iterable(model_bins))), np.float64)
+                merged_bins = np.unique(np.concatenate(model_bins).astype(np.float64, copy=False))
             new_leveled_bins.append(merged_bins)
         new_bins.append(new_leveled_bins)
     ebm.feature_types_in_ = new_feature_types
@@ -801,9 +953,27 @@ def merge_ebms(models):
         n_classes = -1
 
 
+    if weights is None:
+        weights = [1.0] * len(models)
+    elif len(weights) != len(models):
+        msg = f"weights has {len(weights)} items, but there are {len(models)} models"
+        _log.error(msg)
+        raise ValueError(msg)
+    else:
+        for weight in weights:
+            if isnan(weight) or isinf(weight) or weight < 0.0:
+                msg = f"weights must be finite and non-negative, but got {weight}"
+                _log.error(msg)
+                raise ValueError(msg)
+        if sum(weights) <= 0.0:
+            msg = "at least one of the weights must be positive"
+            _log.error(msg)
+            raise ValueError(msg)
+
     bag_weights = []
     model_weights = []
-    for model in models:
+    model_n_bags = []
+    for model, weight in zip(models, weights):
         avg_weight = np.average([tensor.sum() for tensor in model.bin_weights_])
         model_weights.append(avg_weight)
 
@@ -811,6 +981,7 @@ def merge_ebms(models):
         if hasattr(model, 'bagged_scores_'):
             if 0 < len(model.bagged_scores_):
                 n_outer_bags = len(model.bagged_scores_[0])
+        model_n_bags.append(max(n_outer_bags, 0))
 
         model_bag_weights = getattr(model, 'bag_weights_', None)
         if model_bag_weights is None:
@@ -821,11 +992,12 @@ def merge_ebms(models):
         elif len(model_bag_weights) != n_outer_bags:
             raise Exception("self.bagged_weights_ should have the same length as n_outer_bags.")
 
-        bag_weights.extend(model_bag_weights)
+        bag_weights.extend(weight * bag_weight for bag_weight in model_bag_weights)
     # this attribute wasn't available in the original model since we can calculate it for non-merged
     # models, but once a model is merged we need to preserve it for future merging or other uses
     # of the ebm.bagged_scores_ attribute
     ebm.bag_weights_ = bag_weights
+    bag_starts = np.cumsum([0] + model_n_bags)
 
     fg_dicts = []
     all_fg = set()
@@ -842,10 +1014,11 @@ def merge_ebms(models):
     #       feature indexes
     ebm.term_features_ = sorted_fgs
 
+    # the maps between each model's bins and the merged bins depend only on the feature and the number
+    # of dimensions, so they are built once per model and shared by all of its terms and bags
+    axis_caches = [dict() for _ in models]
 
-    ebm.bin_weights_ = []
-    ebm.bagged_scores_ = []
-    for sorted_fg in sorted_fgs:
+    def merge_term(sorted_fg):
         # since interactions are often automatically generated, we'll often always have 
         # interaction mismatches where an interaction will be in one model, but not the other.  
         # We need to estimate the bin_weight_ tensors that would have existed in this case.
@@ -878,7 +1051,8 @@ def merge_ebms(models):
         # use and then it would make something that is consistent across all of these disparate sources
         # of information.  Hopefully, the user hasn't edited the model in a way that creates no solution.
 
-        bin_weight_percentages = []
+        harmonized_bin_weights = [None] * len(models)
+        bin_weight_percentages = None
         for model_idx, model, fg_dict, model_weight in zip(count(), models, fg_dicts, model_weights):
             term_idx = fg_dict.get(sorted_fg)
             if term_idx is not None:
@@ -891,46 +1065,35 @@ def merge_ebms(models):
                     old_bins[model_idx],
                     old_mapping[model_idx],
                     model.bin_weights_[term_idx], 
-                    None
+                    None,
+                    axis_caches[model_idx]
                 )
-                bin_weight_percentages.append(fixed_tensor * model_weight)
+                harmonized_bin_weights[model_idx] = fixed_tensor
+                if bin_weight_percentages is None:
+                    bin_weight_percentages = fixed_tensor * model_weight
+                else:
+                    bin_weight_percentages += fixed_tensor * model_weight
 
         # use this when we don't have a feature group in a model as a reasonable 
         # set of guesses for the distribution of the weight of the model
-        bin_weight_percentages = np.sum(bin_weight_percentages, axis=0)
         bin_weight_percentages = bin_weight_percentages / bin_weight_percentages.sum()
 
         additive_shape = bin_weight_percentages.shape
         if 2 < n_classes:
             additive_shape = tuple(list(additive_shape) + [n_classes])
 
-        new_bin_weights = []
-        new_bagged_scores = []
+        # the output is allocated once and each model's bags are written into their slice of it
+        new_bin_weights = np.zeros(bin_weight_percentages.shape, np.float64)
+        new_bagged_scores = np.zeros((bag_starts[-1],) + additive_shape, np.float64)
         for model_idx, model, fg_dict, model_weight in zip(count(), models, fg_dicts, model_weights):
-            n_outer_bags = -1
-            if hasattr(model, 'bagged_scores_'):
-                if 0 < len(model.bagged_scores_):
-                    n_outer_bags = len(model.bagged_scores_[0])
-
             term_idx = fg_dict.get(sorted_fg)
             if term_idx is None:
-                new_bin_weights.append(model_weight * bin_weight_percentages)
-                new_bagged_scores.extend(n_outer_bags * [np.zeros(additive_shape, np.float64)])
+                new_bin_weights += model_weight * bin_weight_percentages
             else:
-                harmonized_bin_weights = _harmonize_tensor(
-                    sorted_fg,
-                    ebm.feature_bounds_,
-                    ebm.bins_, 
-                    model.term_features_[term_idx], 
-                    old_bounds[model_idx],
-                    old_bins[model_idx],
-                    old_mapping[model_idx],
-                    model.bin_weights_[term_idx], 
-                    None
-                )
-                new_bin_weights.append(harmonized_bin_weights)
-                for bag_idx in range(n_outer_bags):
-                    harmonized_bagged_scores = _harmonize_tensor(
+                new_bin_weights += harmonized_bin_weights[model_idx]
+                if 0 < model_n_bags[model_idx]:
+                    # all the bags of a model share the same bins, so they are remapped together
+                    new_bagged_scores[bag_starts[model_idx]:bag_starts[model_idx + 1]] = _harmonize_tensor(
                         sorted_fg,
                         ebm.feature_bounds_,
                         ebm.bins_, 
@@ -938,12 +1101,22 @@ def merge_ebms(models):
                         old_bounds[model_idx],
                         old_bins[model_idx],
                         old_mapping[model_idx],
-                        model.bagged_scores_[term_idx][bag_idx], 
-                        model.bin_weights_[term_idx] # we use these to weigh distribution of scores for mulple bins
+                        np.asarray(model.bagged_scores_[term_idx]), 
+                        model.bin_weights_[term_idx], # we use these to weigh distribution of scores for mulple bins
+                        axis_caches[model_idx],
+                        True
                     )
-                    new_bagged_scores.append(harmonized_bagged_scores)
-        ebm.bin_weights_.append(np.sum(new_bin_weights, axis=0))
-        ebm.bagged_scores_.append(np.array(new_bagged_scores, np.float64))
+        return new_bin_weights, new_bagged_scores
+
+    if n_jobs == 1 or len(sorted_fgs) <= 1:
+        merged_terms = [merge_term(sorted_fg) for sorted_fg in sorted_fgs]
+    else:
+        # the work is in numpy, which releases the GIL, so threads avoid copying the models to other processes
+        provider = JobLibProvider(n_jobs=n_jobs, backend='threading')
+        merged_terms = provider.parallel(merge_term, [(sorted_fg,) for sorted_fg in sorted_fgs])
+
+    ebm.bin_weights_ = [bin_weights for bin_weights, _ in merged_terms]
+    ebm.bagged_scores_ = [bagged_scores for _, bagged_scores in merged_terms]
 
     ebm.term_scores_, ebm.standard_deviations_, ebm.intercept_, ebm.bagged_scores_ = _process_terms(
         n_classes, 
@@ -1105,6 +1278,8 @@ class EBMUtils:
         max_leaves,
         early_stopping_rounds,
         early_stopping_tolerance,
+        early_stopping_window,
+        early_stopping_relative,
         max_rounds,
         noise_scale,
         bin_weights,
@@ -1127,70 +1302,90 @@ class EBMUtils:
             _log.info("Start boosting")
             native = Native.get_native_singleton()
 
-            for episode_index in range(max_rounds):
-                if episode_index % 10 == 0:
-                    _log.debug("Sweep Index {0}".format(episode_index))
-                    _log.debug("Metric: {0}".format(min_metric))
-
-                for term_idx in range(len(term_features)):
-                    avg_gain = booster.generate_term_update(
-                        term_idx=term_idx,
-                        boost_flags=boost_flags,
-                        learning_rate=learning_rate,
-                        min_samples_leaf=min_samples_leaf,
-                        max_leaves=max_leaves,
+            if not noise_scale:
+                # the rounds are boosted inside the native code, which avoids two FFI calls per term per round.
+                # When debug logging is enabled we return every 10 rounds to log the progress
+                rounds_per_call = 10 if _log.isEnabledFor(logging.DEBUG) else max_rounds
+                state = EarlyStoppingState(early_stopping_window, early_stopping_relative)
+                while state.n_rounds < max_rounds:
+                    _log.debug("Sweep Index {0}".format(state.n_rounds))
+                    _log.debug("Metric: {0}".format(state.min_metric))
+
+                    is_stopped = booster.boost_rounds(
+                        min(rounds_per_call, max_rounds - state.n_rounds),
+                        boost_flags,
+                        learning_rate,
+                        min_samples_leaf,
+                        max_leaves,
+                        early_stopping_rounds,
+                        early_stopping_tolerance,
+                        state,
                     )
+                    if is_stopped:
+                        break
 
-                    if noise_scale: # Differentially private updates
-                        splits = booster.get_term_update_splits()[0]
+                min_metric = state.min_metric
+                episode_index = max(state.n_rounds - 1, 0)
+            else:
+                for episode_index in range(max_rounds):
+                    if episode_index % 10 == 0:
+                        _log.debug("Sweep Index {0}".format(episode_index))
+                        _log.debug("Metric: {0}".format(min_metric))
 
-                        term_update_tensor = booster.get_term_update()
-                        noisy_update_tensor = term_update_tensor.copy()
+                    for term_idx in range(len(term_features)):
+                        avg_gain = booster.generate_term_update(
+                            term_idx=term_idx,
+                            boost_flags=boost_flags,
+                            learning_rate=learning_rate,
+                            min_samples_leaf=min_samples_leaf,
+                            max_leaves=max_leaves,
+                        )
 
-                        splits_iter = [0] + list(splits + 1) + [len(term_update_tensor)] # Make splits iteration friendly
+                        if noise_scale: # Differentially private updates
+                            splits = booster.get_term_update_splits()[0]
 
-                        n_sections = len(splits_iter) - 1
-                        noises = native.generate_gaussian_random(rng, noise_scale, n_sections)
+                            term_update_tensor = booster.get_term_update()
+                            noisy_update_tensor = term_update_tensor.copy()
 
-                        # Loop through all random splits and add noise before updating
-                        for f, s, noise in zip(splits_iter[:-1], splits_iter[1:], noises):
-                            if s == 1: 
-                                continue # Skip cuts that fall on 0th (missing value) bin -- missing values not supported in DP
+                            splits_iter = [0] + list(splits + 1) + [len(term_update_tensor)] # Make splits iteration friendly
 
-                            noisy_update_tensor[f:s] = term_update_tensor[f:s] + noise
+                            n_sections = len(splits_iter) - 1
+                            noises = native.generate_gaussian_random(rng, noise_scale, n_sections)
 
-                            # Native code will be returning sums of residuals in slices, not averages.
-                            # Compute noisy average by dividing noisy sum by noisy bin weights
-                            instance_weight = np.sum(bin_weights[term_idx][f:s])
-                            noisy_update_tensor[f:s] = noisy_update_tensor[f:s] / instance_weight
+                            # Loop through all random splits and add noise before updating
+                            for f, s, noise in zip(splits_iter[:-1], splits_iter[1:], noises):
+                                if s == 1: 
+                                    continue # Skip cuts that fall on 0th (missing value) bin -- missing values not supported in DP
 
-                        noisy_update_tensor = noisy_update_tensor * -1 # Invert gradients before updates
-                        booster.set_term_update(term_idx, noisy_update_tensor)
+                                noisy_update_tensor[f:s] = term_update_tensor[f:s] + noise
 
+                                # Native code will be returning sums of residuals in slices, not averages.
+                                # Compute noisy average by dividing noisy sum by noisy bin weights
+                                instance_weight = np.sum(bin_weights[term_idx][f:s])
+                                noisy_update_tensor[f:s] = noisy_update_tensor[f:s] / instance_weight
 
-                    cur_metric = booster.apply_term_update()
+                            noisy_update_tensor = noisy_update_tensor * -1 # Invert gradients before updates
+                            booster.set_term_update(term_idx, noisy_update_tensor)
 
-                    min_metric = min(cur_metric, min_metric)
 
-                # TODO PK this early_stopping_tolerance is a little inconsistent
-                #      since it triggers intermittently and only re-triggers if the
-                #      threshold is re-passed, but not based on a smooth windowed set
-                #      of checks.  We can do better by keeping a list of the last
-                #      number of measurements to have a consistent window of values.
-                #      If we only cared about the metric at the start and end of the epoch
-                #      window a circular buffer would be best choice with O(1).
-                if no_change_run_length == 0:
-                    bp_metric = min_metric
-                if min_metric + early_stopping_tolerance < bp_metric:
-                    no_change_run_length = 0
-                else:
-                    no_change_run_length += 1
+                        cur_metric = booster.apply_term_update()
+
+                        min_metric = min(cur_metric, min_metric)
+
+                    # this is the breakpoint rule from BoostRounds.  The windowed rule is only available
+                    # natively since differentially private boosting does not use early stopping
+                    if no_change_run_length == 0:
+                        bp_metric = min_metric
+                    if min_metric + early_stopping_tolerance < bp_metric:
+                        no_change_run_length = 0
+                    else:
+                        no_change_run_length += 1
 
-                if (
-                    early_stopping_rounds >= 0
-                    and no_change_run_length >= early_stopping_rounds
-                ):
-                    break
+                    if (
+                        early_stopping_rounds >= 0
+                        and no_change_run_length >= early_stopping_rounds
+                    ):
+                        break
 
             _log.info(
                 "End boosting, Best Metric: {0}, Num Rounds: {1}".format(
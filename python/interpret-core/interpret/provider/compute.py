@@ -12,11 +12,12 @@ class ComputeProvider(ABC):
 
 
 class JobLibProvider(ComputeProvider):
-    def __init__(self, n_jobs=-1):
+    def __init__(self, n_jobs=-1, backend=None):
         self.n_jobs = n_jobs
+        self.backend = backend
 
     def parallel(self, compute_fn, compute_args_iter):
-        results = Parallel(n_jobs=self.n_jobs)(
+        results = Parallel(n_jobs=self.n_jobs, backend=self.backend)(
             delayed(compute_fn)(*args) for args in compute_args_iter
         )
         return results
@@ -1,7 +1,11 @@
 # Copyright (c) 2019 Microsoft Corporation
 # Distributed under the MIT software license
 
+import atexit
 import math
+import os
+import tempfile
+import weakref
 from collections import Counter
 from itertools import count, repeat, groupby
 from warnings import warn
@@ -29,7 +33,15 @@ try:
 except ImportError:
     _scipy_installed = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _pyarrow_installed = True
+except ImportError:
+    _pyarrow_installed = False
+
 from ._native import Native
+from ..provider.compute import JobLibProvider
 from ._privacy import validate_eps_delta, calc_classic_noise_multi, calc_gdp_noise_multi, private_numeric_binning, private_categorical_binning
 
 # BIG TODO LIST:
@@ -517,13 +529,29 @@ def _encode_categorical_existing(X_col, nonmissings, categories):
     elif X_col.dtype.type is np.object_:
         X_col = _densify_object_ndarray(X_col)
 
-    uniques, indexes = np.unique(X_col, return_inverse=True)
+    if _pandas_installed:
+        # pd.factorize uses a hash table, which is O(n) instead of the sort that np.unique requires
+        indexes, uniques = pd.factorize(X_col)
+    else:
+        uniques, indexes = np.unique(X_col, return_inverse=True)
 
     if issubclass(X_col.dtype.type, np.floating):
         uniques = uniques.astype(np.float64, copy=False)
     uniques = uniques.astype(np.unicode_, copy=False)
 
-    mapping = np.fromiter((categories.get(val, -1) for val in uniques), np.int64, count=len(uniques))
+    return _encode_uniques_existing(uniques, indexes, nonmissings, categories)
+
+def _map_categories(uniques, categories):
+    # called under: predict
+
+    if isinstance(categories, _CategoryLookup):
+        return categories.map(uniques)
+    return np.fromiter((categories.get(val, -1) for val in uniques), np.int64, count=len(uniques))
+
+def _encode_uniques_existing(uniques, indexes, nonmissings, categories):
+    # called under: predict
+
+    mapping = _map_categories(uniques, categories)
     encoded = mapping[indexes]
 
     if (mapping < 0).any():
@@ -613,13 +641,12 @@ def _encode_pandas_categorical_initial(X_col, pd_categories, is_ordered, process
     X_col = X_col + 1
     return X_col, categories
 
-def _encode_pandas_categorical_existing(X_col, pd_categories, categories):
+def _encode_pandas_categorical_existing(X_col, pd_categories, mapping, categories):
     # called under: predict
 
-    # TODO: add special case handling if there is only 1 sample to make that faster
-    # if we have just 1 sample, we can avoid making the mapping below
-
-    mapping = np.fromiter((categories.get(val, -1) for val in pd_categories), np.int64, count=len(pd_categories))
+    # X_col holds the codes of a pandas.Categorical or the indices of a pyarrow DictionaryArray, with -1 for 
+    # missing values.  The mapping is made from the pd_categories, so the work here is proportional to the number 
+    # of categories and the codes are then remapped in a single vectorized pass
 
     if len(mapping) <= len(categories):
         mapping_cmp = np.arange(1, len(mapping) + 1, dtype=np.int64)
@@ -742,7 +769,7 @@ def _process_ndarray(X_col, nonmissings, categories, processing, min_unique_cont
         # called under: fit
         X_col, categories = _process_column_initial(X_col, nonmissings, processing, None)
         return 'nominal', X_col, categories, None
-    elif processing == 'quantile' or processing == 'rounded_quantile' or processing == 'uniform' or processing == 'winsorized':
+    elif processing == 'quantile' or processing == 'rounded_quantile' or processing == 'quantile_sketch' or processing == 'uniform' or processing == 'winsorized':
         # called under: fit
         X_col, bad = _process_continuous(X_col, nonmissings)
         return 'continuous', X_col, None, bad
@@ -876,12 +903,13 @@ def _process_pandas_column(X_col, categories, feature_type, min_unique_continuou
             return _process_ndarray(X_col, nonmissings, categories, feature_type, min_unique_continuous)
     elif isinstance(X_col.dtype, pd.CategoricalDtype):
         # unlike other missing value types, we get back -1's for missing here, so no need to drop them
+        pd_dtype = X_col.dtype
         X_col = X_col.values
         is_ordered = X_col.ordered
-        pd_categories = X_col.categories.values.astype(dtype=np.unicode_, copy=False)
         X_col = X_col.codes
 
         if feature_type == 'ignore':
+            pd_categories = pd_dtype.categories.values.astype(dtype=np.unicode_, copy=False)
             pd_categories = pd_categories.astype(dtype=np.object_)
             pd_categories = np.insert(pd_categories, 0, None)
             bad = pd_categories[X_col + 1]
@@ -889,11 +917,17 @@ def _process_pandas_column(X_col, categories, feature_type, min_unique_continuou
         else:
             if categories is None:
                 # called under: fit
+                pd_categories = pd_dtype.categories.values.astype(dtype=np.unicode_, copy=False)
                 X_col, categories = _encode_pandas_categorical_initial(X_col, pd_categories, is_ordered, feature_type)
                 bad = None
             else:
                 # called under: predict
-                X_col, bad = _encode_pandas_categorical_existing(X_col, pd_categories, categories)
+                if isinstance(categories, _CategoryLookup):
+                    mapping, pd_categories = categories.map_pandas(pd_dtype)
+                else:
+                    pd_categories = pd_dtype.categories.values.astype(dtype=np.unicode_, copy=False)
+                    mapping = _map_categories(pd_categories, categories)
+                X_col, bad = _encode_pandas_categorical_existing(X_col, pd_categories, mapping, categories)
 
             return 'ordinal' if is_ordered else 'nominal', X_col, categories, bad
     elif issubclass(X_col.dtype.type, np.integer) or X_col.dtype.type is np.bool_:
@@ -914,9 +948,81 @@ def _process_pandas_column(X_col, categories, feature_type, min_unique_continuou
     _log.error(msg)
     raise TypeError(msg)
 
+def _process_arrow_column(X_col, categories, feature_type, min_unique_continuous):
+    if isinstance(X_col, pa.ChunkedArray):
+        # a single chunk is used in place, otherwise the chunks are concatenated once
+        X_col = X_col.chunk(0) if X_col.num_chunks == 1 else X_col.combine_chunks()
+
+    arrow_type = X_col.type
+    if pa.types.is_floating(arrow_type):
+        if 0 < X_col.null_count:
+            # floats indicate missing values with NaN, so the nulls are filled instead of being dropped
+            X_col = pc.fill_null(X_col.cast(pa.float64()), np.nan)
+        X_col = X_col.to_numpy(zero_copy_only=False)
+        return _process_ndarray(X_col, None, categories, feature_type, min_unique_continuous)
+    elif pa.types.is_integer(arrow_type) or pa.types.is_boolean(arrow_type):
+        nonmissings = None
+        if 0 < X_col.null_count:
+            # the null bitmap is the missing value indicator, the same as the pandas nullable integer types
+            nonmissings = pc.is_valid(X_col).to_numpy(zero_copy_only=False)
+            X_col = pc.drop_null(X_col)
+        # numeric buffers without nulls are returned without copying.  Booleans are bit packed, so those are expanded
+        X_col = X_col.to_numpy(zero_copy_only=False)
+        return _process_ndarray(X_col, nonmissings, categories, feature_type, min_unique_continuous)
+    elif pa.types.is_dictionary(arrow_type):
+        # like a pandas.Categorical, we use the dictionary indices directly so that only the dictionary
+        # values get converted to strings
+        is_ordered = arrow_type.ordered
+        pd_categories = X_col.dictionary.to_numpy(zero_copy_only=False).astype(dtype=np.unicode_, copy=False)
+        indices = X_col.indices
+        if 0 < X_col.null_count:
+            indices = pc.fill_null(indices.cast(pa.int64()), -1)
+        X_col = indices.to_numpy(zero_copy_only=False)
+
+        if feature_type == 'ignore':
+            pd_categories = pd_categories.astype(dtype=np.object_)
+            pd_categories = np.insert(pd_categories, 0, None)
+            bad = pd_categories[X_col + 1]
+            return None, None, bad, 'ignore'
+        else:
+            if categories is None:
+                # called under: fit
+                X_col, categories = _encode_pandas_categorical_initial(X_col, pd_categories, is_ordered, feature_type)
+                bad = None
+            else:
+                # called under: predict
+                mapping = _map_categories(pd_categories, categories)
+                X_col, bad = _encode_pandas_categorical_existing(X_col, pd_categories, mapping, categories)
+
+            return 'ordinal' if is_ordered else 'nominal', X_col, categories, bad
+    elif pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        nonmissings = None
+        if 0 < X_col.null_count:
+            nonmissings = pc.is_valid(X_col).to_numpy(zero_copy_only=False)
+            X_col = pc.drop_null(X_col)
+
+        # hash the strings inside arrow so that only the unique values are converted, and never to np.object_
+        X_col = pc.dictionary_encode(X_col)
+        uniques = X_col.dictionary.to_numpy(zero_copy_only=False).astype(dtype=np.unicode_, copy=False)
+        indexes = X_col.indices.to_numpy(zero_copy_only=False)
+
+        if categories is not None and (feature_type == 'nominal' or feature_type == 'ordinal'):
+            # called under: predict
+            X_col, bad = _encode_uniques_existing(uniques, indexes, nonmissings, categories)
+            return feature_type, X_col, categories, bad
+
+        X_col = uniques[indexes]
+        return _process_ndarray(X_col, nonmissings, categories, feature_type, min_unique_continuous)
+
+    msg = f"{arrow_type} not supported"
+    _log.error(msg)
+    raise TypeError(msg)
+
 def _process_scipy_column(X_col, categories, feature_type, min_unique_continuous):
     X_col = X_col.toarray().reshape(-1)
+    return _process_scipy_values(X_col, categories, feature_type, min_unique_continuous)
 
+def _process_scipy_values(X_col, categories, feature_type, min_unique_continuous):
     nonmissings = None
     if X_col.dtype.type is np.object_:
         if _pandas_installed:
@@ -983,6 +1089,109 @@ def _process_dict_column(X_col, categories, feature_type, min_unique_continuous)
     X_col = _reshape_1D_if_possible(X_col)
     return _process_numpy_column(X_col, categories, feature_type, min_unique_continuous)
 
+def _is_elementwise(categories, feature_type):
+    # these types of processing convert each value independently of the other values in the column, so the
+    # implicit zeros of a sparse column can be processed once instead of once per sample.  Processing that
+    # decides on categories or counts values (which only happens during fit) needs the full column
+
+    if not isinstance(feature_type, str):
+        return False
+    if categories is None:
+        return feature_type == 'continuous' or feature_type == 'quantile' or feature_type == 'rounded_quantile' or feature_type == 'quantile_sketch' or feature_type == 'uniform' or feature_type == 'winsorized'
+    return feature_type == 'nominal' or feature_type == 'ordinal'
+
+def _to_csc(X):
+    # CSC keeps the stored values of each column contiguous, so columns can be sliced directly out of
+    # the indptr, indices and data arrays instead of calling getcol which is O(nnz) for CSR matrices
+    if X.format != 'csc':
+        X = X.tocsc()
+    if not X.has_canonical_format:
+        # duplicate entries need to be summed.  Copy first so that the caller's matrix is not modified
+        X = X.copy()
+        X.sum_duplicates()
+    return X
+
+def unify_sparse_columns(X, requests, feature_names_in, feature_types=None, min_unique_continuous=3):
+    # like unify_columns, but for scipy sparse matrices, and only the stored values are processed.  For each
+    # request this yields (feature_type_in, rows, X_col, categories, bad) where X_col[0] and bad[0] are the
+    # results for the implicit zeros and X_col[1:] and bad[1:] are the results for the stored values, which are
+    # located at rows.  If the request cannot be processed one value at a time then rows is None and X_col and 
+    # bad hold the full column
+
+    X = _to_csc(X)
+    n_samples, n_cols = X.shape
+
+    col_map = None
+    if n_cols != len(feature_names_in):
+        # during fit time unify_feature_names would only allow us to get here if this was legal, which requires 
+        # feature_types to not be None.  During predict time feature_types_in cannot be None, but we need 
+        # to check for legality on the dimensions of X
+        keep_cols = np.fromiter((val != 'ignore' for val in feature_types), np.bool_, count=len(feature_types))
+        if n_cols != keep_cols.sum():
+            msg = f"The model has {len(feature_types)} features, but X has {n_cols} columns"
+            _log.error(msg)
+            raise ValueError(msg)
+        col_map = np.empty(len(feature_types), np.int64)
+        np.place(col_map, keep_cols, np.arange(len(feature_types), dtype=np.int64))
+
+    indptr = X.indptr
+    for feature_idx, categories in requests:
+        col_idx = feature_idx if col_map is None else col_map[feature_idx]
+        start = indptr[col_idx]
+        end = indptr[col_idx + 1]
+        rows = X.indices[start:end]
+        feature_type = None if feature_types is None else feature_types[feature_idx]
+        if _is_elementwise(categories, feature_type):
+            X_col = np.empty(end - start + 1, X.dtype)
+            X_col[0] = 0
+            X_col[1:] = X.data[start:end]
+        else:
+            rows = None
+            X_col = np.zeros(n_samples, X.dtype)
+            X_col[X.indices[start:end]] = X.data[start:end]
+        feature_type_in, X_col, categories, bad = _process_scipy_values(X_col, categories, feature_type, min_unique_continuous)
+        yield feature_type_in, rows, X_col, categories, bad
+
+def _map_column_names(names_original, feature_names_in, feature_types):
+    # returns a dict from the feature names to the column indexes of X.  If X has the names of our
+    # features we index by name, otherwise by position
+    names_dict = dict(zip(map(str, names_original), count()))
+    n_cols = len(names_original)
+    if len(names_dict) != n_cols:
+        # this can happen if for instance one column is "0" and annother is int(0)
+        # Pandas also allows duplicate labels by default:
+        # https://pandas.pydata.org/docs/user_guide/duplicates.html#duplicates-disallow
+        # we can tollerate duplicate labels here, provided none of them are being used by our model
+        for name, n_count in Counter(map(str, names_original)).items():
+            if n_count != 1:
+                names_dict.remove(name)
+
+    if feature_types is None:
+        for feature_name_in in feature_names_in:
+            if feature_name_in not in names_dict:
+                names_dict = None
+                break
+    else:
+        for feature_name_in, feature_type in zip(feature_names_in, feature_types):
+            if feature_type != 'ignore' and feature_name_in not in names_dict:
+                names_dict = None
+                break
+
+    if names_dict is None:
+        if n_cols == len(feature_names_in):
+            names_dict = dict(zip(feature_names_in, count()))
+        else:
+            # during fit time unify_feature_names would only allow us to get here if this was legal, which requires 
+            # feature_types to not be None.  During predict time feature_types_in cannot be None, but we need 
+            # to check for legality on the dimensions of X
+            names_dict = dict(zip((feature_name_in for feature_name_in, feature_type in zip(feature_names_in, feature_types) if feature_type != 'ignore'), count()))
+            if n_cols != len(names_dict):
+                msg = f"The model has {len(feature_types)} features, but X has {n_cols} columns"
+                _log.error(msg)
+                raise ValueError(msg)
+
+    return names_dict
+
 def unify_columns(X, requests, feature_names_in, feature_types=None, min_unique_continuous=3, go_fast=False):
     # If the requests paramter contains a categories dictionary, then that same categories object is guaranteed to
     # be yielded back to the caller.  This guarantee can be used to rapidly identify which request is being 
@@ -1044,41 +1253,7 @@ def unify_columns(X, requests, feature_names_in, feature_types=None, min_unique_
             feature_type_in, X_col, categories, bad = _process_numpy_column(X_col, categories, feature_type, min_unique_continuous)
             yield feature_type_in, X_col, categories, bad
     elif _pandas_installed and isinstance(X, pd.DataFrame):
-        names_original = X.columns
-        names_dict = dict(zip(map(str, names_original), count()))
-        n_cols = len(names_original)
-        if len(names_dict) != n_cols:
-            # this can happen if for instance one column is "0" and annother is int(0)
-            # Pandas also allows duplicate labels by default:
-            # https://pandas.pydata.org/docs/user_guide/duplicates.html#duplicates-disallow
-            # we can tollerate duplicate labels here, provided none of them are being used by our model
-            for name, n_count in Counter(map(str, names_original)).items():
-                if n_count != 1:
-                    names_dict.remove(name)
-
-        if feature_types is None:
-            for feature_name_in in feature_names_in:
-                if feature_name_in not in names_dict:
-                    names_dict = None
-                    break
-        else:
-            for feature_name_in, feature_type in zip(feature_names_in, feature_types):
-                if feature_type != 'ignore' and feature_name_in not in names_dict:
-                    names_dict = None
-                    break
-
-        if names_dict is None:
-            if n_cols == len(feature_names_in):
-                names_dict = dict(zip(feature_names_in, count()))
-            else:
-                # during fit time unify_feature_names would only allow us to get here if this was legal, which requires 
-                # feature_types to not be None.  During predict time feature_types_in cannot be None, but we need 
-                # to check for legality on the dimensions of X
-                names_dict = dict(zip((feature_name_in for feature_name_in, feature_type in zip(feature_names_in, feature_types) if feature_type != 'ignore'), count()))
-                if n_cols != len(names_dict):
-                    msg = f"The model has {len(feature_types)} features, but X has {n_cols} columns"
-                    _log.error(msg)
-                    raise ValueError(msg)
+        names_dict = _map_column_names(X.columns, feature_names_in, feature_types)
 
         # Pandas also sometimes uses a dense 2D ndarray instead of per column 1D ndarrays, which would benefit from 
         # transposing, but accessing the BlockManager is currently unsupported behavior. They are also planning to eliminate
@@ -1091,27 +1266,33 @@ def unify_columns(X, requests, feature_names_in, feature_types=None, min_unique_
             feature_type = None if feature_types is None else feature_types[feature_idx]
             feature_type_in, X_col, categories, bad = _process_pandas_column(X_col, categories, feature_type, min_unique_continuous)
             yield feature_type_in, X_col, categories, bad
-    elif _scipy_installed and isinstance(X, sp.sparse.spmatrix):
-        n_cols = X.shape[1]
+    elif _pyarrow_installed and isinstance(X, (pa.Table, pa.RecordBatch)):
+        if isinstance(X, pa.Table):
+            # each chunk of a dictionary column can have its own dictionary.  Unifying them once here allows
+            # the chunks of a column to be concatenated and their indices used directly
+            X = X.unify_dictionaries()
 
-        col_map = None
-        if n_cols != len(feature_names_in):
-            # during fit time unify_feature_names would only allow us to get here if this was legal, which requires 
-            # feature_types to not be None.  During predict time feature_types_in cannot be None, but we need 
-            # to check for legality on the dimensions of X
-            keep_cols = np.fromiter((val != 'ignore' for val in feature_types), np.bool_, count=len(feature_types))
-            if n_cols != keep_cols.sum():
-                msg = f"The model has {len(feature_types)} features, but X has {n_cols} columns"
-                _log.error(msg)
-                raise ValueError(msg)
-            col_map = np.empty(len(feature_types), np.int64)
-            np.place(col_map, keep_cols, np.arange(len(feature_types), dtype=np.int64))
+        names_dict = _map_column_names(X.schema.names, feature_names_in, feature_types)
 
         for feature_idx, categories in requests:
-            col_idx = feature_idx if col_map is None else col_map[feature_idx]
-            X_col = X.getcol(col_idx)
+            col_idx = names_dict[feature_names_in[feature_idx]]
+            X_col = X.column(col_idx)
             feature_type = None if feature_types is None else feature_types[feature_idx]
-            feature_type_in, X_col, categories, bad = _process_scipy_column(X_col, categories, feature_type, min_unique_continuous)
+            feature_type_in, X_col, categories, bad = _process_arrow_column(X_col, categories, feature_type, min_unique_continuous)
+            yield feature_type_in, X_col, categories, bad
+    elif _scipy_installed and isinstance(X, sp.sparse.spmatrix):
+        n_samples = X.shape[0]
+        for feature_type_in, rows, X_col, categories, bad in unify_sparse_columns(X, requests, feature_names_in, feature_types, min_unique_continuous):
+            if rows is not None:
+                # expand the results for the stored values and the implicit zeros back into full columns
+                if X_col is not None:
+                    X_col_tmp = np.full(n_samples, X_col[0], X_col.dtype)
+                    X_col_tmp[rows] = X_col[1:]
+                    X_col = X_col_tmp
+                if bad is not None:
+                    bad_tmp = np.full(n_samples, bad[0], np.object_)
+                    bad_tmp[rows] = bad[1:]
+                    bad = bad_tmp
             yield feature_type_in, X_col, categories, bad
     elif _pandas_installed and isinstance(X, pd.Series):
         # TODO: handle as a single feature model
@@ -1156,6 +1337,9 @@ def unify_feature_names(X, feature_names_given=None, feature_types_given=None):
     elif _pandas_installed and isinstance(X, pd.Series):
         X_names = None
         n_cols = 1
+    elif _pyarrow_installed and isinstance(X, (pa.Table, pa.RecordBatch)):
+        X_names = list(map(str, X.schema.names))
+        n_cols = len(X_names)
     elif _scipy_installed and isinstance(X, sp.sparse.spmatrix):
         X_names = None
         n_cols = X.shape[1]
@@ -1607,7 +1791,14 @@ def clean_X(X, min_cols=None, n_samples=None, sample_source="y"):
             msg = f"{sample_source} has {n_samples} samples, but X has {X.shape[0]}"
             _log.error(msg)
             raise ValueError(msg)
-        return X, X.shape[0]
+        # convert once here since X is typically unified several times
+        return _to_csc(X), X.shape[0]
+    elif _pyarrow_installed and isinstance(X, (pa.Table, pa.RecordBatch)):
+        if n_samples is not None and n_samples != X.num_rows:
+            msg = f"{sample_source} has {n_samples} samples, but X has {X.num_rows}"
+            _log.error(msg)
+            raise ValueError(msg)
+        return X, X.num_rows
     elif isinstance(X, dict):
         for val in X.values():
             if isinstance(val, np.ndarray) and val.ndim == 0:
@@ -1742,18 +1933,101 @@ def clean_X(X, min_cols=None, n_samples=None, sample_source="y"):
         raise ValueError(msg)
     return X, X.shape[0]
 
-def _cut_continuous(native, X_col, processing, binning, max_bins, min_samples_bin):
+def _is_chunked_source(X):
+    # chunked sources are paths to Parquet or .npy files, lists of such paths or of 2 dimensional datasets, or a
+    # zero argument callable that returns a fresh iterable of datasets each time it is called.  Plain iterators 
+    # are excluded since fit needs to read the data twice, and clean_X already accepts them as rows
+    if isinstance(X, (str, os.PathLike)):
+        return True
+    if isinstance(X, (list, tuple)):
+        return 0 < len(X) and all(isinstance(item, (str, os.PathLike)) or 2 <= getattr(item, 'ndim', 0) or _pyarrow_installed and isinstance(item, (pa.Table, pa.RecordBatch)) for item in X)
+    return callable(X) and not isinstance(X, np.ndarray) and not (_pandas_installed and isinstance(X, (pd.DataFrame, pd.Series)))
+
+def _iter_chunks(X, chunk_size):
+    # yields X in pieces of at most chunk_size samples.  X can be a single dataset (numpy array, 
+    # pandas DataFrame, pyarrow Table, scipy sparse matrix), a path to a Parquet or .npy file, an iterable of datasets
+    # such as a generator of DataFrames, or a callable returning such an iterable.  Datasets larger than
+    # chunk_size are sliced further.
+
+    if isinstance(X, (str, os.PathLike)):
+        if os.fspath(X).lower().endswith('.npy'):
+            # memory mapping the file means only the sliced chunks are read from disk
+            yield from _iter_chunks(np.load(X, mmap_mode='r'), chunk_size)
+            return
+
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            msg = "pyarrow is required to read Parquet files"
+            _log.error(msg)
+            raise ImportError(msg)
+
+        # iter_batches reads one batch at a time, so the file is never fully loaded
+        yield from pq.ParquetFile(X).iter_batches(batch_size=chunk_size)
+    elif _pandas_installed and isinstance(X, pd.DataFrame):
+        for start in range(0, X.shape[0], chunk_size):
+            yield X.iloc[start:start + chunk_size]
+    elif _pyarrow_installed and isinstance(X, (pa.Table, pa.RecordBatch)):
+        for start in range(0, X.num_rows, chunk_size):
+            # arrow slices are zero-copy views
+            yield X.slice(start, chunk_size)
+    elif isinstance(X, np.ndarray) or _scipy_installed and isinstance(X, sp.sparse.spmatrix):
+        if X.ndim != 2:
+            msg = f"X must be 2 dimensional, but has {X.ndim} dimensions"
+            _log.error(msg)
+            raise ValueError(msg)
+        for start in range(0, X.shape[0], chunk_size):
+            # np.asarray reads the slice of a memory mapped file into memory
+            yield np.asarray(X[start:start + chunk_size]) if isinstance(X, np.ndarray) else X[start:start + chunk_size]
+    elif isinstance(X, (list, tuple)) and not _is_chunked_source(X):
+        # a list of rows rather than a list of chunks.  It is already in memory, so there is nothing to stream
+        yield X
+    elif callable(X):
+        yield from _iter_chunks(X(), chunk_size)
+    else:
+        for X_chunk in X:
+            yield from _iter_chunks(X_chunk, chunk_size)
+
+def _resolve_continuous_processing(processing, binning):
     # called under: fit
-      
-    if processing != 'quantile' and processing != 'rounded_quantile' and processing != 'uniform' and processing != 'winsorized' and not isinstance(processing, list) and not isinstance(processing, np.ndarray):
+
+    # a per-feature binning method in feature_types takes precedence over the binning parameter
+    if processing != 'quantile' and processing != 'rounded_quantile' and processing != 'quantile_sketch' and processing != 'uniform' and processing != 'winsorized' and not isinstance(processing, list) and not isinstance(processing, np.ndarray):
         if isinstance(binning, list) or isinstance(binning, np.ndarray):
             msg = f"illegal binning type {binning}"
             _log.error(msg)
             raise ValueError(msg)
         processing = binning
+    return processing
 
-    if processing == 'quantile':
-        # one bin for missing, one bin for unknown, and # of cuts is one less again
+def _sketch_column(X_col, min_samples_bin):
+    # called under: fit
+
+    # summarizes the column with a _QuantileSketch in blocks of k values, which is O(n log k) instead of
+    # the O(n log n) full sort required by cut_quantile.  Returns the sketched values for cut_quantile and 
+    # min_samples_bin scaled down to the fewer number of values that it will see
+    sketch = _QuantileSketch()
+    X_col = X_col[~np.isnan(X_col)]
+    for start in range(0, len(X_col), sketch.k):
+        sketch.update(X_col[start:start + sketch.k])
+    return _sketched_cut_input(sketch, min_samples_bin)
+
+def _sketched_cut_input(sketch, min_samples_bin):
+    # called under: fit
+
+    X_col = sketch.to_values()
+    if not sketch.is_exact():
+        min_samples_bin = max(1, int(round(min_samples_bin * len(X_col) / sketch.n)))
+    return X_col, min_samples_bin
+
+def _cut_continuous(native, X_col, processing, binning, max_bins, min_samples_bin):
+    # called under: fit
+
+    processing = _resolve_continuous_processing(processing, binning)
+
+    if processing == 'quantile' or processing == 'quantile_sketch':
+        # one bin for missing, one bin for unknown, and # of cuts is one less again.  For 'quantile_sketch'
+        # our caller has already replaced X_col with the values from _sketch_column
         cuts = native.cut_quantile(X_col, min_samples_bin, 0, max_bins - 3)
     elif processing == 'rounded_quantile':
         # one bin for missing, one bin for unknown, and # of cuts is one less again
@@ -1822,20 +2096,27 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
     def __init__(
         self, feature_names=None, feature_types=None, max_bins=256, binning="quantile", min_samples_bin=1, 
         min_unique_continuous=3, epsilon=None, delta=None, composition=None, privacy_schema=None, random_state=None,
+        n_jobs=1,
     ):
         """ Initializes EBM preprocessor.
 
         Args:
             feature_names: Feature names as list.
             feature_types: Feature types as list, for example "continuous" or "nominal".
-            max_bins: Max number of bins to process numeric features.
-            binning: Strategy to compute bins: "quantile", "rounded_quantile", "uniform", or "private". 
+            max_bins: Max number of bins to process numeric features. A list of values computes multiple 
+                levels of bins from a single pass over the data, in which case each item of bins_ is a list with
+                one entry per level.
+            binning: Strategy to compute bins: "quantile", "rounded_quantile", "quantile_sketch", "uniform", or "private".
+                "quantile_sketch" cuts quantiles from a bounded size mergeable sketch of each feature instead of
+                sorting the full column. It is faster on large data, at the cost of quantile rank errors of a small
+                fraction of a percent. Features with at most 4096 values are cut exactly.
             min_samples_bin: minimum number of samples to put into a quantile or rounded_quantile bin
             min_unique_continuous: number of unique numbers required before a feature is considered continuous
             epsilon: Privacy budget parameter. Only applicable when binning is "private".
             delta: Privacy budget parameter. Only applicable when binning is "private".
             privacy_schema: User specified min/max values for numeric features as dictionary. Only applicable when binning is "private".
             random_state: Random state.
+            n_jobs: Number of threads used to bin features in parallel. Private binning is always serial.
         """
         self.feature_names = feature_names
         self.feature_types = feature_types
@@ -1848,6 +2129,7 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
         self.composition = composition
         self.privacy_schema = privacy_schema
         self.random_state = random_state
+        self.n_jobs = n_jobs
 
     def fit(self, X, y=None, sample_weight=None):
         """ Fits transformer to provided samples.
@@ -1898,6 +2180,19 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
         feature_names_in = unify_feature_names(X, self.feature_names, self.feature_types)
         n_features = len(feature_names_in)
 
+        max_bins_levels = None
+        if isinstance(self.max_bins, (list, tuple, np.ndarray)):
+            max_bins_levels = list(self.max_bins)
+            if len(max_bins_levels) == 0:
+                msg = "max_bins cannot be an empty list"
+                _log.error(msg)
+                raise ValueError(msg)
+            if self.binning == 'private':
+                # each level of private bins consumes its own privacy budget and random numbers
+                msg = "private binning does not support multiple levels of max_bins"
+                _log.error(msg)
+                raise ValueError(msg)
+
         noise_scale = None # only applicable for private binning
         if self.binning == 'private':
             validate_eps_delta(self.epsilon, self.delta)
@@ -1930,15 +2225,21 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
         native = Native.get_native_singleton()
         rng = native.create_rng(normalize_initial_seed(self.random_state))
         is_privacy_warning = False
-        for feature_idx, (feature_type_in, X_col, categories, bad) in enumerate(unify_columns(X, zip(range(n_features), repeat(None)), feature_names_in, self.feature_types, self.min_unique_continuous, False)):
+
+        def fit_feature(feature_idx, feature_type_in, X_col, categories, bad):
+            # each call writes only to the feature_idx slots of the result containers, so it is safe to run
+            # concurrently for different features.  Private binning consumes the shared rng, so it cannot be.
+            nonlocal is_privacy_warning
+
             if n_samples != len(X_col):
                 msg = "The columns of X are mismatched in the number of of samples"
                 _log.error(msg)
                 raise ValueError(msg)
 
-            max_bins = self.max_bins # TODO: in the future allow this to be per-feature
-            if max_bins < 3:
-                raise ValueError(f"max_bins was {max_bins}, but must be 3 or higher. One bin for missing, one bin for unknown, and one or more bins for the non-missing values.")
+            max_bins = self.max_bins if max_bins_levels is None else max_bins_levels[0] # TODO: in the future allow this to be per-feature
+            for level_max_bins in ([max_bins] if max_bins_levels is None else max_bins_levels):
+                if level_max_bins < 3:
+                    raise ValueError(f"max_bins was {level_max_bins}, but must be 3 or higher. One bin for missing, one bin for unknown, and one or more bins for the non-missing values.")
 
             if not X_col.flags.c_contiguous:
                 # X_col could be a slice that has a stride.  We need contiguous for caling into C
@@ -1946,11 +2247,18 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
 
             feature_types_in[feature_idx] = feature_type_in
             if categories is None:
-                # continuous feature
+                # continuous feature.  Non-numeric values go into the unknown bin as they do at predict time
+                n_bad = 0
                 if bad is not None:
-                    msg = f"Feature {feature_names_in[feature_idx]} is indicated as continuous, but has non-numeric data"
-                    _log.error(msg)
-                    raise ValueError(msg)
+                    if self.binning == 'private':
+                        msg = f"Feature {feature_names_in[feature_idx]} is indicated as continuous, but has non-numeric data"
+                        _log.error(msg)
+                        raise ValueError(msg)
+
+                    bad = bad != _none_ndarray
+                    n_bad = np.count_nonzero(bad)
+                    # keep the non-numeric values out of the cuts and bounds
+                    X_col[bad] = np.nan
 
                 if self.binning == 'private':
                     if np.isnan(X_col).any():
@@ -1973,27 +2281,45 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
                     min_feature_val = np.nanmin(X_col)
                     max_feature_val = np.nanmax(X_col)
                     feature_type_given = None if self.feature_types is None else self.feature_types[feature_idx]
-                    cuts = _cut_continuous(native, X_col, feature_type_given, self.binning, max_bins, self.min_samples_bin)
+                    X_cut = X_col
+                    min_samples_bin = self.min_samples_bin
+                    is_sketched = _resolve_continuous_processing(feature_type_given, self.binning) == 'quantile_sketch'
+                    if is_sketched:
+                        # the sketched values are already sorted, so they serve every level
+                        X_cut, min_samples_bin = _sketch_column(X_col, min_samples_bin)
+                    if max_bins_levels is None:
+                        cuts = _cut_continuous(native, X_cut, feature_type_given, self.binning, max_bins, min_samples_bin)
+                        feature_bins = cuts
+                    else:
+                        # all the levels are cut from the same unified column.  The cutting functions only depend on 
+                        # the values and not their order, so sort once to make the sorting inside them cheap
+                        X_sorted = X_cut if len(max_bins_levels) == 1 or is_sketched else np.sort(X_cut)
+                        feature_bins = [_cut_continuous(native, X_sorted, feature_type_given, self.binning, level_max_bins, min_samples_bin) for level_max_bins in max_bins_levels]
+                        cuts = feature_bins[0]
                     bin_indexes = native.discretize(X_col, cuts)
+                    if bad is not None:
+                        bin_indexes[bad] = len(cuts) + 2
                     feature_bin_weights = np.bincount(bin_indexes, weights=sample_weight, minlength=len(cuts) + 3)
                     feature_bin_weights = feature_bin_weights.astype(np.float64, copy=False)
 
                     n_cuts = native.get_histogram_cut_count(X_col)
                     histogram_cuts = native.cut_uniform(X_col, n_cuts)
                     bin_indexes = native.discretize(X_col, histogram_cuts)
+                    if bad is not None:
+                        bin_indexes[bad] = len(histogram_cuts) + 2
                     feature_histogram_counts = np.bincount(bin_indexes, minlength=len(histogram_cuts) + 3)
                     feature_histogram_counts = feature_histogram_counts.astype(np.int64, copy=False)
 
                     histogram_counts[feature_idx] = feature_histogram_counts
 
-                    n_missing = len(X_col)
+                    n_missing = len(X_col) - n_bad
                     X_col = X_col[~np.isnan(X_col)]
                     n_missing = n_missing - len(X_col)
                     missing_val_counts.itemset(feature_idx, n_missing)
                     unique_val_counts.itemset(feature_idx, len(np.unique(X_col)))
                     zero_val_counts.itemset(feature_idx, len(X_col) - np.count_nonzero(X_col))
 
-                bins[feature_idx] = cuts
+                bins[feature_idx] = cuts if max_bins_levels is None else feature_bins
                 feature_bounds.itemset((feature_idx, 0), min_feature_val)
                 feature_bounds.itemset((feature_idx, 1), max_feature_val)
             else:
@@ -2064,9 +2390,21 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
                             n_zeros += np.count_nonzero(X_col == (idx + 1))
                     zero_val_counts.itemset(feature_idx, n_zeros)
 
-                bins[feature_idx] = categories
+                bins[feature_idx] = categories if max_bins_levels is None else [categories] * len(max_bins_levels)
             bin_weights[feature_idx] = feature_bin_weights
 
+        columns = unify_columns(X, zip(range(n_features), repeat(None)), feature_names_in, self.feature_types, self.min_unique_continuous, False)
+        tasks = ((feature_idx, feature_type_in, X_col, categories, bad) for feature_idx, (feature_type_in, X_col, categories, bad) in enumerate(columns))
+        if self.binning == 'private' or self.n_jobs == 1 or n_features <= 1:
+            for task in tasks:
+                fit_feature(*task)
+        else:
+            # the columns are already in memory and the heavy lifting happens in numpy and the native library 
+            # which both release the GIL, so threads avoid copying the columns into worker processes.  The columns
+            # are unified serially by the generator, and joblib dispatches them lazily to bound memory usage.
+            provider = JobLibProvider(n_jobs=self.n_jobs, backend='threading')
+            provider.parallel(fit_feature, tasks)
+
         if is_privacy_warning:
             warn("Possible privacy violation: assuming min/max values per feature are public info. "
                     "Pass a privacy schema with known public ranges per feature to avoid this warning.")
@@ -2103,10 +2441,12 @@ class EBMPreprocessor(BaseEstimator, TransformerMixin):
 
         if 0 < n_samples:
             native = Native.get_native_singleton()
-            category_iter = (category if isinstance(category, dict) else None for category in self.bins_)
+            # when fitted with multiple levels of max_bins, transform using the main (first) level
+            main_bins = [feature_bins[0] if isinstance(feature_bins, list) else feature_bins for feature_bins in self.bins_]
+            category_iter = (category if isinstance(category, dict) else None for category in main_bins)
             requests = zip(count(), category_iter)
             cols = unify_columns(X, requests, self.feature_names_in_, self.feature_types_in_, None, False)
-            for feature_idx, bins, (_, X_col, _, _) in zip(count(), self.bins_, cols):
+            for feature_idx, bins, (_, X_col, _, _) in zip(count(), main_bins, cols):
                 if n_samples != len(X_col):
                     msg = "The columns of X are mismatched in the number of of samples"
                     _log.error(msg)
@@ -2173,6 +2513,64 @@ def _deduplicate_bins(bins):
                 highest_idx = level_idx
         del bin_levels[highest_idx + 1:]
 
+class _CategoryLookup(dict):
+    # a categories dictionary that has been precompiled for predict time.  The keys are held in a hashed pd.Index
+    # so that all the unique values of a column can be mapped in a single vectorized call instead of a python level
+    # dict lookup per unique.  Since this is still a dict, it can be used anywhere the original categories were.
+
+    def __init__(self, categories):
+        super().__init__(categories)
+        self.index = pd.Index(list(self.keys()), dtype=np.object_)
+        # append -1 so that the -1 returned by get_indexer for unknown values maps to -1
+        self.codes = np.append(np.fromiter(self.values(), np.int64, count=len(self)), np.int64(-1))
+        self._pandas_mapping = None
+
+    def map(self, uniques):
+        return self.codes[self.index.get_indexer(uniques)]
+
+    def map_pandas(self, pd_dtype):
+        # pandas shares the CategoricalDtype object between a Series and any slices taken from it, so remember
+        # the last mapping to avoid re-converting the pandas categories to strings on every call.  The dtype
+        # belongs to the caller, so only hold a weak reference to it.
+        cached = self._pandas_mapping
+        if cached is not None and cached[0]() is pd_dtype:
+            return cached[1], cached[2]
+
+        pd_categories = pd_dtype.categories.values.astype(dtype=np.unicode_, copy=False)
+        mapping = self.map(pd_categories)
+        self._pandas_mapping = (weakref.ref(pd_dtype), mapping, pd_categories)
+        return mapping, pd_categories
+
+    def __getstate__(self):
+        # the pandas mapping only applies to the dtype seen in this process, so it is not pickled
+        state = self.__dict__.copy()
+        state["_pandas_mapping"] = None
+        return state
+
+def _compile_bins(bins):
+    # called under: predict
+
+    # returns a copy of bins where each categorical dictionary is replaced with a _CategoryLookup.  Levels that
+    # share a dictionary continue to share the compiled copy, so the id based deduplication in eval_terms still works
+
+    if not _pandas_installed:
+        return bins
+
+    compiled = dict()
+    result = []
+    for bin_levels in bins:
+        levels = []
+        for feature_bins in bin_levels:
+            if isinstance(feature_bins, dict) and not isinstance(feature_bins, _CategoryLookup):
+                lookup = compiled.get(id(feature_bins), None)
+                if lookup is None:
+                    lookup = _CategoryLookup(feature_bins)
+                    compiled[id(feature_bins)] = lookup
+                feature_bins = lookup
+            levels.append(feature_bins)
+        result.append(levels)
+    return result
+
 def construct_bins(
     X,
     y,
@@ -2188,9 +2586,42 @@ def construct_bins(
     composition=None, 
     privacy_schema=None,
     random_state=None,
+    n_jobs=1,
 ):
+    if binning != 'private' and 1 < len(max_bins_leveled):
+        # non-private binning is deterministic, so all the levels can be computed together in a single pass 
+        # over X instead of re-reading and re-unifying the data once per level
+        preprocessor = EBMPreprocessor(
+            feature_names_given, 
+            feature_types_given, 
+            list(max_bins_leveled), 
+            binning, 
+            min_samples_bin, 
+            min_unique_continuous, 
+            epsilon, 
+            delta, 
+            composition, 
+            privacy_schema,
+            random_state,
+            n_jobs,
+        )
+        preprocessor.fit(X, y, sample_weight)
+
+        bins = preprocessor.bins_
+        _deduplicate_bins(bins)
+        return (
+            preprocessor.feature_names_in_, 
+            preprocessor.feature_types_in_, 
+            bins, 
+            preprocessor.bin_weights_, 
+            preprocessor.feature_bounds_, 
+            preprocessor.histogram_counts_, 
+            preprocessor.missing_val_counts_, 
+            preprocessor.unique_val_counts_, 
+            preprocessor.zero_val_counts_,
+        )
+
     is_mains = True
-    native = Native.get_native_singleton()
     for max_bins in max_bins_leveled:
         preprocessor = EBMPreprocessor(
             feature_names_given, 
@@ -2204,6 +2635,7 @@ def construct_bins(
             composition, 
             privacy_schema,
             random_state,
+            n_jobs,
         )
 
         random_state = increment_seed(random_state)
@@ -2238,6 +2670,506 @@ def construct_bins(
     return feature_names_in, feature_types_in, bins, bin_weights, feature_bounds, histogram_counts, missing_val_counts, unique_val_counts, zero_val_counts
 
 
+class _QuantileSketch:
+    """ Mergeable summary of a stream of floats from which approximate quantiles can be extracted.
+
+    This is a simplified KLL sketch.  Values are buffered in levels of compactors, where an item at level h 
+    stands in for 2**h of the original values.  When a level overflows it is sorted and every other item is 
+    promoted to the next level, alternating the starting offset each time so that the rank error does not drift 
+    in one direction.  Lower levels get geometrically smaller capacities, which keeps the total size near 3 * k 
+    items while the rank error stays O(n / k).  Until the first compaction the sketch holds every value and is exact.
+    """
+
+    def __init__(self, k=4096):
+        """ Initializes an empty sketch.
+
+        Args:
+            k: Capacity of the highest level. Larger values are more accurate and use more memory.
+        """
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0, np.float64)]
+        self.offsets = [0]
+
+    def is_exact(self):
+        return len(self.levels) == 1
+
+    def _capacity(self, level_idx):
+        return max(8, int(self.k * (2.0 / 3.0) ** (len(self.levels) - 1 - level_idx)))
+
+    def _compress(self):
+        level_idx = 0
+        while level_idx < len(self.levels):
+            items = self.levels[level_idx]
+            if len(items) <= self._capacity(level_idx):
+                level_idx += 1
+                continue
+
+            if level_idx + 1 == len(self.levels):
+                # adding a level shrinks the capacities of all the lower levels, so start over from the bottom
+                self.levels.append(np.empty(0, np.float64))
+                self.offsets.append(0)
+
+            items = np.sort(items)
+            # an odd item out stays behind so that the promoted items represent exactly twice as many values
+            n_kept = len(items) % 2
+            offset = self.offsets[level_idx]
+            self.offsets[level_idx] = 1 - offset
+            promoted = items[n_kept + offset::2]
+            self.levels[level_idx] = items[:n_kept]
+            self.levels[level_idx + 1] = np.concatenate([self.levels[level_idx + 1], promoted])
+            level_idx = 0
+
+    def update(self, values):
+        """ Adds values to the sketch.
+
+        Args:
+            values: float64 array of values, none of which can be NaN.
+        """
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(np.float64, copy=False)])
+        self._compress()
+
+    def merge(self, other):
+        """ Adds all the values summarized by another sketch into this one.
+
+        Args:
+            other: _QuantileSketch built with the same k.
+        """
+        if self.k != other.k:
+            msg = f"cannot merge a sketch with k={other.k} into a sketch with k={self.k}"
+            _log.error(msg)
+            raise ValueError(msg)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for level_idx, items in enumerate(other.levels):
+            if level_idx == len(self.levels):
+                self.levels.append(np.empty(0, np.float64))
+                self.offsets.append(0)
+            self.levels[level_idx] = np.concatenate([self.levels[level_idx], items])
+        self._compress()
+
+    def to_values(self):
+        """ Expands the sketch into sorted values with the same distribution as the summarized values.
+
+        Returns:
+            All the values if the sketch is exact, otherwise a sample of 2 * k values placed at evenly spaced 
+            ranks.  The minimum and maximum are always included exactly.
+        """
+        if self.is_exact():
+            return np.sort(self.levels[0])
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level_idx) for level_idx, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+
+        n_values = 2 * self.k
+        ranks = (np.arange(n_values, dtype=np.float64) + 0.5) * (cumulative[-1] / n_values)
+        values = items[np.minimum(np.searchsorted(cumulative, ranks, side='right'), len(items) - 1)]
+        values[0] = self.min
+        values[-1] = self.max
+        return values
+
+def _merge_categories(first_categories, is_identical, category_counts, processing):
+    # called under: fit
+
+    # chunks that all produced the same categories dictionary (as happens with explicit ordinals, pandas 
+    # categoricals, and most nominals) keep its ordering.  Otherwise the union is re-ordered with the same 
+    # rules that _process_column_initial applies to a full column
+    if is_identical:
+        return first_categories
+
+    names = list(category_counts.keys())
+    try:
+        floats = np.array(names, np.unicode_).astype(np.float64)
+    except ValueError:
+        floats = None
+
+    if processing == 'nominal_prevalence':
+        if floats is None:
+            ordered = sorted((-category_counts[name], name) for name in names)
+        else:
+            ordered = sorted((-category_counts[name], val, name) for val, name in zip(floats.tolist(), names))
+    elif processing != 'nominal_alphabetical' and floats is not None:
+        ordered = sorted(zip(floats.tolist(), names))
+    else:
+        ordered = sorted((name,) for name in names)
+
+    return dict(zip((item[-1] for item in ordered), count(1)))
+
+def construct_bins_chunked(
+    X,
+    n_samples,
+    sample_weight,
+    feature_names_given, 
+    feature_types_given, 
+    max_bins_leveled, 
+    binning='quantile', 
+    min_samples_bin=1, 
+    min_unique_continuous=3, 
+    chunk_size=65536,
+):
+    # called under: fit
+
+    # The equivalent of construct_bins for data that does not fit into memory.  X is a chunked source that is
+    # read twice, one chunk at a time.  The first pass summarizes each continuous feature into a _QuantileSketch
+    # and counts the categories of each categorical feature, after which the bins are cut.  The second pass 
+    # discretizes the chunks into a _BinnedData, which is everything fit needs from X afterwards.  Feature types
+    # are decided on the first chunk and then imposed on the rest.  If every continuous feature has at most 
+    # _QuantileSketch.k values the bins are identical to construct_bins.
+
+    _log.info("Constructing bins from chunks")
+
+    if binning == 'private':
+        msg = "private binning is not supported for chunked data"
+        _log.error(msg)
+        raise ValueError(msg)
+
+    for max_bins in max_bins_leveled:
+        if max_bins < 3:
+            raise ValueError(f"max_bins was {max_bins}, but must be 3 or higher. One bin for missing, one bin for unknown, and one or more bins for the non-missing values.")
+
+    min_cols = determine_min_cols(feature_names_given, feature_types_given)
+    native = Native.get_native_singleton()
+
+    feature_names_in = None
+    n_samples_seen = 0
+    for X_chunk in _iter_chunks(X, chunk_size):
+        X_chunk, n_chunk = clean_X(X_chunk, min_cols)
+        if n_chunk == 0:
+            continue
+
+        chunk_names = unify_feature_names(X_chunk, feature_names_given, feature_types_given)
+        if feature_names_in is None:
+            feature_names_in = chunk_names
+            n_features = len(feature_names_in)
+            chunk_types = feature_types_given
+            feature_types_in = _none_list * n_features
+            sketches = [None] * n_features
+            first_categories = [None] * n_features
+            is_identical = [True] * n_features
+            category_counts = [None] * n_features
+            missing_val_counts = np.zeros(n_features, dtype=np.int64)
+            zero_val_counts = np.zeros(n_features, dtype=np.int64)
+        elif chunk_names != feature_names_in:
+            msg = "The chunks of X have mismatched features"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        columns = unify_columns(X_chunk, zip(range(n_features), repeat(None)), feature_names_in, chunk_types, min_unique_continuous, False)
+        for feature_idx, (feature_type_in, X_col, categories, bad) in enumerate(columns):
+            if n_chunk != len(X_col):
+                msg = "The columns of X are mismatched in the number of of samples"
+                _log.error(msg)
+                raise ValueError(msg)
+
+            if n_samples_seen == 0:
+                feature_types_in[feature_idx] = feature_type_in
+            elif feature_type_in != feature_types_in[feature_idx]:
+                msg = f"Feature {feature_names_in[feature_idx]} is {feature_types_in[feature_idx]} in the first chunk of X, but {feature_type_in} in a later one"
+                _log.error(msg)
+                raise ValueError(msg)
+
+            if categories is None:
+                # continuous feature.  Non-numeric values go into the unknown bin, so they are not sketched
+                keep = ~np.isnan(X_col)
+                n_missing = n_chunk
+                if bad is not None:
+                    bad = bad != _none_ndarray
+                    keep &= ~bad
+                    n_missing -= np.count_nonzero(bad)
+
+                X_col = X_col[keep]
+                missing_val_counts[feature_idx] += n_missing - len(X_col)
+                zero_val_counts[feature_idx] += len(X_col) - np.count_nonzero(X_col)
+                if sketches[feature_idx] is None:
+                    sketches[feature_idx] = _QuantileSketch()
+                sketches[feature_idx].update(X_col)
+            else:
+                # categorical feature
+                if bad is not None:
+                    msg = f"Feature {feature_names_in[feature_idx]} has unrecognized ordinal values"
+                    _log.error(msg)
+                    raise ValueError(msg)
+
+                n_unique_indexes = 0 if len(categories) == 0 else max(categories.values())
+                counts = np.bincount(X_col, minlength=n_unique_indexes + 1)
+                missing_val_counts[feature_idx] += counts[0]
+                if category_counts[feature_idx] is None:
+                    first_categories[feature_idx] = categories
+                    category_counts[feature_idx] = Counter()
+                elif categories != first_categories[feature_idx]:
+                    is_identical[feature_idx] = False
+                feature_counts = category_counts[feature_idx]
+                for category, idx in categories.items():
+                    feature_counts[category] += int(counts[idx])
+
+        if n_samples_seen == 0:
+            # impose the types decided on the first chunk so that every chunk is processed the same way
+            chunk_types = [
+                feature_type_given if feature_type_given is not None and feature_type_given != 'auto' else 
+                feature_type_in if feature_type_in == 'continuous' or feature_type_in == 'nominal' else None 
+                for feature_type_given, feature_type_in in zip(_none_list * n_features if feature_types_given is None else feature_types_given, feature_types_in)
+            ]
+        n_samples_seen += n_chunk
+
+    if n_samples_seen == 0:
+        msg = "X has 0 samples"
+        _log.error(msg)
+        raise ValueError(msg)
+
+    if n_samples is not None and n_samples != n_samples_seen:
+        msg = f"y has {n_samples} samples, but X has {n_samples_seen}"
+        _log.error(msg)
+        raise ValueError(msg)
+
+    bins = _none_list * n_features
+    histogram_cuts = _none_list * n_features
+    feature_bounds = np.full((n_features, 2), np.nan, dtype=np.float64)
+    unique_val_counts = np.zeros(n_features, dtype=np.int64)
+    for feature_idx in range(n_features):
+        feature_type_given = None if feature_types_given is None else feature_types_given[feature_idx]
+        if category_counts[feature_idx] is None:
+            # continuous feature
+            sketch = sketches[feature_idx]
+            X_col, sketch_min_samples_bin = _sketched_cut_input(sketch, min_samples_bin)
+            bins[feature_idx] = [_cut_continuous(native, X_col, feature_type_given, binning, max_bins, sketch_min_samples_bin) for max_bins in max_bins_leveled]
+            histogram_cuts[feature_idx] = native.cut_uniform(X_col, native.get_histogram_cut_count(X_col))
+            if 0 < sketch.n:
+                feature_bounds[feature_idx] = (sketch.min, sketch.max)
+            # once the sketch has compacted, this is a lower bound on the number of unique values
+            unique_val_counts[feature_idx] = len(np.unique(X_col))
+        else:
+            # categorical feature
+            categories = _merge_categories(first_categories[feature_idx], is_identical[feature_idx], category_counts[feature_idx], feature_type_given)
+            bins[feature_idx] = [categories] * len(max_bins_leveled)
+            unique_val_counts[feature_idx] = len(categories)
+            n_zeros = 0
+            for category, n_category in category_counts[feature_idx].items():
+                try:
+                    if float(category) == 0.0:
+                        n_zeros += n_category
+                except ValueError:
+                    pass
+            zero_val_counts[feature_idx] = n_zeros
+
+    _deduplicate_bins(bins)
+
+    binned = _BinnedData(n_samples_seen, bins)
+    bin_weights = []
+    histogram_counts = []
+    requests = []
+    for feature_idx, bin_levels in enumerate(bins):
+        feature_bins = bin_levels[0]
+        if isinstance(feature_bins, dict):
+            # categorical feature
+            n_bins = 2 if len(feature_bins) == 0 else max(feature_bins.values()) + 2
+            histogram_counts.append(np.zeros(n_bins, np.int64))
+            requests.append((feature_idx, feature_bins))
+        else:
+            # continuous feature
+            n_bins = len(feature_bins) + 3
+            histogram_counts.append(np.zeros(len(histogram_cuts[feature_idx]) + 3, np.int64))
+            requests.append((feature_idx, None))
+        bin_weights.append(np.zeros(n_bins, np.float64))
+
+    start = 0
+    for X_chunk in _iter_chunks(X, chunk_size):
+        X_chunk, n_chunk = clean_X(X_chunk, min_cols)
+        if n_chunk == 0:
+            continue
+
+        end = start + n_chunk
+        if n_samples_seen < end:
+            msg = "X returned more samples on the second pass than on the first"
+            _log.error(msg)
+            raise ValueError(msg)
+
+        chunk_weight = None if sample_weight is None else sample_weight[start:end]
+        for (feature_idx, categories), (_, X_col, _, bad) in zip(requests, unify_columns(X_chunk, requests, feature_names_in, feature_types_in, None, False)):
+            if n_chunk != len(X_col):
+                msg = "The columns of X are mismatched in the number of of samples"
+                _log.error(msg)
+                raise ValueError(msg)
+
+            if categories is None:
+                # continuous feature.  Non-numeric values go into the unknown bin, which is the last one
+                if bad is not None:
+                    bad = bad != _none_ndarray
+                    binned.unknowns[feature_idx] = True
+
+                if not X_col.flags.c_contiguous:
+                    X_col = X_col.copy()
+
+                bin_levels = bins[feature_idx]
+                for level_idx, cuts in enumerate(bin_levels):
+                    if 0 < level_idx and cuts is bin_levels[level_idx - 1]:
+                        continue
+                    bin_indexes = native.discretize(X_col, cuts)
+                    if bad is not None:
+                        bin_indexes[bad] = len(cuts) + 2
+                    binned.store(feature_idx, level_idx, start, bin_indexes)
+                    if level_idx == 0:
+                        bin_weights[feature_idx] += np.bincount(bin_indexes, weights=chunk_weight, minlength=len(cuts) + 3)
+
+                bin_indexes = native.discretize(X_col, histogram_cuts[feature_idx])
+                if bad is not None:
+                    bin_indexes[bad] = len(histogram_cuts[feature_idx]) + 2
+                histogram_counts[feature_idx] += np.bincount(bin_indexes, minlength=len(histogram_cuts[feature_idx]) + 3)
+            else:
+                # categorical feature.  All the categories were seen on the first pass, so there are no unknowns
+                if bad is not None or (X_col < 0).any():
+                    msg = f"Feature {feature_names_in[feature_idx]} has categories that were not in the first pass over X"
+                    _log.error(msg)
+                    raise ValueError(msg)
+
+                binned.store(feature_idx, 0, start, X_col)
+                bin_weights[feature_idx] += np.bincount(X_col, weights=chunk_weight, minlength=len(bin_weights[feature_idx]))
+                histogram_counts[feature_idx] += np.bincount(X_col, minlength=len(histogram_counts[feature_idx]))
+
+        start = end
+
+    if start != n_samples_seen:
+        msg = "X returned fewer samples on the second pass than on the first"
+        _log.error(msg)
+        raise ValueError(msg)
+
+    return feature_names_in, feature_types_in, bins, bin_weights, feature_bounds, histogram_counts, missing_val_counts, unique_val_counts, zero_val_counts, binned
+
+
+# datasets at least this large are placed in a file backed memory map instead of process memory.  joblib pickles
+# np.memmap objects by reference, so the worker processes that boost the outer bags all attach to the same
+# pages instead of each receiving their own copy of the dataset
+_SHARED_DATASET_MIN_BYTES = 1024 * 1024
+
+# files that could not be removed when their dataset was reclaimed.  These are retried at interpreter exit
+_pending_removals = set()
+_is_exiting = False
+
+def _remove_file(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:  # pragma: no cover
+        pass
+    except OSError:
+        # Windows does not allow removing a file while any process still has it mapped
+        if _is_exiting:
+            _log.warning(f"Unable to remove the temporary dataset file {path}")
+        else:
+            _pending_removals.add(path)
+        return
+    _pending_removals.discard(path)
+
+@atexit.register
+def _remove_pending_files():
+    # weakref.finalize can still remove datasets that are alive at exit after this point, so any failure from
+    # here on is final and is reported
+    global _is_exiting
+    _is_exiting = True
+    for path in list(_pending_removals):
+        _remove_file(path)
+
+def _allocate_dataset(n_bytes):
+    if n_bytes < _SHARED_DATASET_MIN_BYTES:
+        return np.empty(n_bytes, np.ubyte)
+
+    # prefer RAM backed shared memory if it has room, otherwise fall back to the default temp folder
+    folder = None
+    if os.path.isdir('/dev/shm'):
+        try:
+            stats = os.statvfs('/dev/shm')
+            if n_bytes * 2 < stats.f_bavail * stats.f_frsize:
+                folder = '/dev/shm'
+        except (OSError, AttributeError):  # pragma: no cover
+            pass
+
+    fd, path = tempfile.mkstemp(prefix='interpret_dataset_', suffix='.bin', dir=folder)
+    os.close(fd)
+    try:
+        dataset = np.memmap(path, dtype=np.ubyte, mode='w+', shape=(n_bytes,))
+    except:  # pragma: no cover
+        _remove_file(path)
+        raise
+
+    # the file is removed once python reclaims the dataset, which happens after boosting finishes
+    weakref.finalize(dataset, _remove_file, path)
+    return dataset
+
+class _BinnedData:
+    """ Bin indexes of every feature at each of its distinct levels of bins.
+
+    Once the bins are decided this is everything fit needs from X, so chunked data can be discretized
+    into it once instead of being re-read.  The indexes are stored in the narrowest unsigned type that
+    holds them, which is typically a small fraction of the size of X.  bin_native, EBMScorer, and
+    make_bin_weights accept it in place of X.
+    """
+
+    def __init__(self, n_samples, bins):
+        """ Allocates storage for the bin indexes.
+
+        Args:
+            n_samples: Number of samples
+            bins: Per-feature list of bin levels, as stored in bins_
+        """
+        self.n_samples = n_samples
+        # keep our own copy of the lists since fit later removes unused levels from bins in-place
+        self.bins = [list(bin_levels) for bin_levels in bins]
+        # features that have non-numeric values in the unknown bin
+        self.unknowns = [False] * len(bins)
+        self.columns = []
+        for bin_levels in self.bins:
+            feature_columns = []
+            for level_idx, feature_bins in enumerate(bin_levels):
+                if 0 < level_idx and feature_bins is bin_levels[level_idx - 1]:
+                    feature_columns.append(feature_columns[-1])
+                    continue
+                if isinstance(feature_bins, dict):
+                    # categorical feature
+                    max_index = 0 if len(feature_bins) == 0 else max(feature_bins.values())
+                else:
+                    # continuous feature, including the unknown bin for non-numeric values
+                    max_index = len(feature_bins) + 2
+                feature_columns.append(np.empty(n_samples, np.min_scalar_type(max_index)))
+            self.columns.append(feature_columns)
+
+    def store(self, feature_idx, level_idx, start, bin_indexes):
+        self.columns[feature_idx][level_idx][start:start + len(bin_indexes)] = bin_indexes
+
+    def get(self, feature_idx, feature_bins, start=0, end=None):
+        """ Retrieves the bin indexes of a feature.
+
+        Args:
+            feature_idx: Index of the feature
+            feature_bins: One of the bin levels of the feature.  Equal bins from a later call to
+                _deduplicate_bins are also accepted.
+            start: Index of the first sample to retrieve
+            end: Index after the last sample to retrieve, or None for all the remaining samples
+
+        Returns:
+            int64 array of bin indexes, as discretize or unify_columns would return them.
+        """
+        bin_levels = self.bins[feature_idx]
+        for level_idx, level_bins in enumerate(bin_levels):
+            if level_bins is feature_bins:
+                return self.columns[feature_idx][level_idx][start:end].astype(np.int64)
+        for level_idx, level_bins in enumerate(bin_levels):
+            if isinstance(level_bins, dict) == isinstance(feature_bins, dict):
+                if isinstance(level_bins, dict) and level_bins == feature_bins or not isinstance(level_bins, dict) and np.array_equal(level_bins, feature_bins):
+                    return self.columns[feature_idx][level_idx][start:end].astype(np.int64)
+
+        msg = f"feature {feature_idx} was not binned with the requested bins"
+        _log.error(msg)
+        raise ValueError(msg)
+
 def bin_native(
     n_classes,
     feature_idxs, 
@@ -2265,31 +3197,53 @@ def bin_native(
             request = (request[0], None)
         requests.append(request)
 
-    n_weights = 0 if sample_weight is None else 1
+    def binned_columns():
+        # yields the bin indexes for each feature.  This is called once to measure the dataset and again to fill it
+        if isinstance(X, _BinnedData):
+            for feature_idx, feature_bins in responses:
+                if isinstance(feature_bins, dict):
+                    # categorical feature
+                    n_bins = 1 if len(feature_bins) == 0 else (max(feature_bins.values()) + 1)
+                else:
+                    # continuous feature
+                    n_bins = len(feature_bins) + 2
+                X_col = X.get(feature_idx, feature_bins)
+                bad = None
+                if X.unknowns[feature_idx]:
+                    # the non-numeric values were stored in the unknown bin
+                    n_bins += 1
+                    bad = X_col == n_bins - 1
+                yield feature_idx, n_bins, X_col, bad
+            return
+
+        for (feature_idx, feature_bins), (_, X_col, _, bad) in zip(responses, unify_columns(X, requests, feature_names_in, feature_types_in, None, False)):
+            if n_samples != len(X_col):
+                msg = "The columns of X are mismatched in the number of of samples"
+                _log.error(msg)
+                raise ValueError(msg)
 
-    n_bytes = native.measure_dataset_header(len(requests), n_weights, 1)
-    for (feature_idx, feature_bins), (_, X_col, _, bad) in zip(responses, unify_columns(X, requests, feature_names_in, feature_types_in, None, False)):
-        if n_samples != len(X_col):
-            msg = "The columns of X are mismatched in the number of of samples"
-            _log.error(msg)
-            raise ValueError(msg)
+            if not X_col.flags.c_contiguous:
+                # X_col could be a slice that has a stride.  We need contiguous for caling into C
+                X_col = X_col.copy()
 
-        if not X_col.flags.c_contiguous:
-            # X_col could be a slice that has a stride.  We need contiguous for caling into C
-            X_col = X_col.copy()
+            if isinstance(feature_bins, dict):
+                # categorical feature
+                n_bins = 1 if len(feature_bins) == 0 else (max(feature_bins.values()) + 1)
+            else:
+                # continuous feature
+                X_col = native.discretize(X_col, feature_bins)
+                n_bins = len(feature_bins) + 2
 
-        if isinstance(feature_bins, dict):
-            # categorical feature
-            n_bins = 1 if len(feature_bins) == 0 else (max(feature_bins.values()) + 1)
-        else:
-            # continuous feature
-            X_col = native.discretize(X_col, feature_bins)
-            n_bins = len(feature_bins) + 2
+            if bad is not None:
+                n_bins += 1
+                X_col[bad != _none_ndarray] = n_bins - 1
 
-        if bad is not None:
-            n_bins += 1
-            X_col[bad != _none_ndarray] = n_bins - 1
+            yield feature_idx, n_bins, X_col, bad
 
+    n_weights = 0 if sample_weight is None else 1
+
+    n_bytes = native.measure_dataset_header(len(requests), n_weights, 1)
+    for feature_idx, n_bins, X_col, bad in binned_columns():
         n_bytes += native.measure_feature(
             n_bins, 
             np.count_nonzero(X_col) != len(X_col), 
@@ -2306,32 +3260,11 @@ def bin_native(
     else:
         n_bytes += native.measure_regression_target(y)
 
-    dataset = np.empty(n_bytes, np.ubyte) # joblib loky doesn't support RawArray
+    dataset = _allocate_dataset(n_bytes) # joblib loky doesn't support RawArray, but it shares np.memmap
 
     native.fill_dataset_header(len(requests), n_weights, 1, dataset)
 
-    for (feature_idx, feature_bins), (_, X_col, _, bad) in zip(responses, unify_columns(X, requests, feature_names_in, feature_types_in, None, False)):
-        if n_samples != len(X_col):
-            msg = "The columns of X are mismatched in the number of of samples"
-            _log.error(msg)
-            raise ValueError(msg)
-
-        if not X_col.flags.c_contiguous:
-            # X_col could be a slice that has a stride.  We need contiguous for caling into C
-            X_col = X_col.copy()
-
-        if isinstance(feature_bins, dict):
-            # categorical feature
-            n_bins = 1 if len(feature_bins) == 0 else (max(feature_bins.values()) + 1)
-        else:
-            # continuous feature
-            X_col = native.discretize(X_col, feature_bins)
-            n_bins = len(feature_bins) + 2
-
-        if bad is not None:
-            n_bins += 1
-            X_col[bad != _none_ndarray] = n_bins - 1
-
+    for feature_idx, n_bins, X_col, bad in binned_columns():
         native.fill_feature(
             n_bins, 
             np.count_nonzero(X_col) != len(X_col), 
@@ -11,14 +11,113 @@ of the interaction of all pairs of features in a dataset.
 
 import numpy as np
 import heapq
-from itertools import combinations
+from itertools import combinations, islice
 
 from sklearn.utils.multiclass import type_of_target
+from sklearn.utils.extmath import softmax
 from sklearn.base import is_classifier, is_regressor
 
-from ._binning import determine_min_cols, clean_X, clean_dimensions, typify_classification, clean_init_score, construct_bins, bin_native_by_dimension
+from ._binning import determine_min_cols, clean_X, clean_dimensions, typify_classification, clean_init_score, construct_bins, bin_native_by_dimension, unify_columns, _none_ndarray, _BinnedData
 from ._native import Native, InteractionDetector
 
+import logging
+_log = logging.getLogger(__name__)
+
+_INTERACTION_BATCH_SIZE = 4096
+
+def _rank_features_by_gain(
+        X,
+        n_samples,
+        feature_names_in,
+        feature_types_in,
+        bins,
+        y,
+        n_classes,
+        scores,
+        sample_weight,
+    ):
+    # Ranks the features by the gain of splitting the gradients of the current scores at every bin boundary of 
+    # the feature.  This bounds the gain of any main effect tree on the feature, and needs only a single pass 
+    # over each feature, so it is a cheap way to screen the candidate features for pair detection.
+
+    if n_classes == 1 or n_classes == 0:
+        # mono-classification has nothing to gain
+        return list(range(len(bins)))
+
+    if 3 <= n_classes:
+        if scores is None:
+            scores = np.zeros((n_samples, n_classes), np.float64)
+        probabilities = softmax(scores.astype(np.float64))
+        hessians = probabilities * (1.0 - probabilities)
+        gradients = probabilities
+        gradients[np.arange(n_samples), y] -= 1.0
+    elif n_classes == 2:
+        probabilities = 1.0 / (1.0 + np.exp(-scores)) if scores is not None else np.full(n_samples, 0.5)
+        gradients = probabilities - y
+        hessians = probabilities * (1.0 - probabilities)
+    else:
+        gradients = y - (0.0 if scores is None else scores)
+        hessians = np.ones(n_samples, np.float64)
+
+    if sample_weight is not None:
+        if gradients.ndim == 2:
+            gradients = gradients * sample_weight[:, np.newaxis]
+            hessians = hessians * sample_weight[:, np.newaxis]
+        else:
+            gradients = gradients * sample_weight
+            hessians = hessians * sample_weight
+
+    if gradients.ndim == 1:
+        gradients = gradients[:, np.newaxis]
+        hessians = hessians[:, np.newaxis]
+
+    native = Native.get_native_singleton()
+
+    requests = []
+    for feature_idx, bin_levels in enumerate(bins):
+        feature_bins = bin_levels[min(len(bin_levels), 2) - 1]
+        requests.append((feature_idx, feature_bins if isinstance(feature_bins, dict) else None))
+
+    if isinstance(X, _BinnedData):
+        columns = ((None, X.get(feature_idx, bin_levels[min(len(bin_levels), 2) - 1]), None, None) for feature_idx, bin_levels in enumerate(bins))
+    else:
+        columns = unify_columns(X, requests, feature_names_in, feature_types_in, None, False)
+
+    gains = np.zeros(len(bins), np.float64)
+    for (feature_idx, feature_bins), (_, X_col, _, bad) in zip(requests, columns):
+        if feature_bins is not None:
+            X_col = X_col.copy()
+        elif not isinstance(X, _BinnedData):
+            # continuous feature that still needs to be discretized
+            if not X_col.flags.c_contiguous:
+                X_col = X_col.copy()
+            bin_levels = bins[feature_idx]
+            X_col = native.discretize(X_col, bin_levels[min(len(bin_levels), 2) - 1])
+
+        # unknown and non-numeric values get a bin of their own past the last legal bin
+        n_bins = int(X_col.max()) + 2 if 0 < len(X_col) else 1
+        X_col[X_col < 0] = n_bins - 1
+        if bad is not None:
+            X_col[bad != _none_ndarray] = n_bins - 1
+
+        gain = 0.0
+        for score_idx in range(gradients.shape[1]):
+            bin_gradients = np.bincount(X_col, weights=gradients[:, score_idx], minlength=n_bins)
+            bin_hessians = np.bincount(X_col, weights=hessians[:, score_idx], minlength=n_bins)
+            total_hessian = bin_hessians.sum()
+            if total_hessian <= 0.0:
+                continue
+            valid = 0.0 < bin_hessians
+            gain += np.sum(np.square(bin_gradients[valid]) / bin_hessians[valid]) - np.square(bin_gradients.sum()) / total_hessian
+        gains[feature_idx] = gain
+
+    # stable so that ties keep the original feature order
+    return list(np.argsort(-gains, kind='stable'))
+
+def _screen_pairs(ranked_features, max_interaction_features):
+    # the pairs among the top ranked features, in the same ascending feature order that combinations produces
+    return combinations(sorted(int(feature_idx) for feature_idx in ranked_features[:max_interaction_features]), 2)
+
 def _get_ranked_interactions(
         dataset,
         bag,
@@ -31,18 +130,41 @@ def _get_ranked_interactions(
     ):
     interaction_strengths = []
     with InteractionDetector(dataset, bag, scores, experimental_params) as interaction_detector:
-        for feature_idxs in iter_term_features:
-            strength = interaction_detector.calc_interaction_strength(
-                feature_idxs, interaction_flags, min_samples_leaf,
-            )
-            item = (strength, feature_idxs)
-            if(n_output_interactions <= 0):
-                interaction_strengths.append(item)
+        iter_term_features = iter(iter_term_features)
+        while True:
+            # the terms are evaluated in batches so that each native call amortizes the FFI overhead over many 
+            # terms, while the memory used stays bounded if iter_term_features is a lazy generator of all pairs
+            batch = list(islice(iter_term_features, _INTERACTION_BATCH_SIZE))
+            if len(batch) == 0:
+                break
+
+            # the native call requires all the terms to have the same number of features
+            strengths = np.empty(len(batch), np.float64)
+            dimensions = np.fromiter((len(feature_idxs) for feature_idxs in batch), np.int64, len(batch))
+            for n_dimensions in np.unique(dimensions):
+                term_idxs = np.flatnonzero(dimensions == n_dimensions)
+                term_features = np.array([batch[term_idx] for term_idx in term_idxs], np.int64).reshape(len(term_idxs), n_dimensions)
+                if 0 < n_dimensions:
+                    # the native code sums the bins of consecutive pairs that share their first feature in a 
+                    # single pass over the data, so group the terms by their first feature
+                    order = np.argsort(term_features[:, 0], kind='stable')
+                    term_idxs = term_idxs[order]
+                    term_features = term_features[order]
+                strengths[term_idxs] = interaction_detector.calc_interaction_strengths(
+                    term_features, interaction_flags, min_samples_leaf,
+                )
+
+            if 0 < n_output_interactions < len(batch):
+                # only the strongest terms of the batch can be kept. Ties with the weakest of these are also kept 
+                # since the final order breaks ties by the feature indexes
+                threshold = np.partition(strengths, len(batch) - n_output_interactions)[len(batch) - n_output_interactions]
+                term_idxs = np.flatnonzero(threshold <= strengths)
             else:
-                if len(interaction_strengths) == n_output_interactions:
-                    heapq.heappushpop(interaction_strengths, item)
-                else:
-                    heapq.heappush(interaction_strengths, item)
+                term_idxs = range(len(batch))
+
+            interaction_strengths.extend((float(strengths[term_idx]), batch[term_idx]) for term_idx in term_idxs)
+            if 0 < n_output_interactions < len(interaction_strengths):
+                interaction_strengths = heapq.nlargest(n_output_interactions, interaction_strengths)
 
     interaction_strengths.sort(reverse=True)
     return interaction_strengths
@@ -59,6 +181,8 @@ def measure_interactions(
         binning='quantile',
         min_samples_leaf=2,
         objective=None,
+        max_interaction_features=None,
+        halving_rounds=0,
     ):
     """Run the FAST algorithm and return the ranked interactions and their strengths as a dictionary.
 
@@ -77,6 +201,12 @@ def measure_interactions(
         binning: Method to bin values for pre-processing - "uniform", "quantile", or "rounded_quantile".
         min_samples_leaf: Minimum number of samples for tree splits used when calculating gain
         objective: 'regression' (RMSE) or 'classification' (log loss) or None for auto. More objectives to come
+        max_interaction_features: If not None, the features are first ranked by the gain of their bins on the 
+            residuals of init_score, and only the pairs among this many top ranked features are evaluated.
+            Only used when interactions is None or an integer
+        halving_rounds: Number of successive halving rounds used when interactions is an integer.  Each round 
+            evaluates the remaining pairs on a subsample of the data and keeps the stronger half, starting from 
+            1/2**halving_rounds of the samples, before the survivors are evaluated on all the data
     Returns:
         List containing a tuple of feature indices for the terms and interaction strengths, 
             e.g. [((1, 2), 0.134), ((3, 7), 0.0842)].  Ordered by decreasing interaction strengths.
@@ -198,16 +328,54 @@ def measure_interactions(
         feature_types_in=feature_types_in
     )
 
-    if isinstance(interactions, int):
-        n_output_interactions = interactions
-        iter_term_features=combinations(range(n_features_in), 2)
-    elif interactions is None:
-        n_output_interactions = 0
-        iter_term_features=combinations(range(n_features_in), 2)
+    if isinstance(interactions, int) or interactions is None:
+        n_output_interactions = 0 if interactions is None else interactions
+        if max_interaction_features is not None and max_interaction_features < n_features_in:
+            if max_interaction_features < 2:
+                msg = f"max_interaction_features was {max_interaction_features}, but must be 2 or more to form pairs"
+                _log.error(msg)
+                raise ValueError(msg)
+            ranked_features = _rank_features_by_gain(
+                X, 
+                n_samples, 
+                feature_names_in, 
+                feature_types_in, 
+                bins, 
+                y, 
+                n_classes, 
+                init_score, 
+                sample_weight,
+            )
+            iter_term_features = _screen_pairs(ranked_features, max_interaction_features)
+        else:
+            iter_term_features = combinations(range(n_features_in), 2)
     else:
         n_output_interactions = 0
         iter_term_features = interactions
 
+    if 0 < halving_rounds and 0 < n_output_interactions:
+        # a fixed seed keeps measure_interactions deterministic
+        permutation = np.random.RandomState(0).permutation(n_samples)
+        term_features = list(iter_term_features)
+        for round_idx in range(halving_rounds, 0, -1):
+            if len(term_features) <= n_output_interactions:
+                break
+            subsample = np.sort(permutation[:max(n_samples >> round_idx, 1)])
+            bag = np.zeros(n_samples, np.int8)
+            bag[subsample] = 1
+            survivors = _get_ranked_interactions(
+                dataset=dataset,
+                bag=bag,
+                scores=None if init_score is None else init_score[subsample],
+                iter_term_features=term_features,
+                interaction_flags=Native.InteractionFlags_Pure,
+                min_samples_leaf=min_samples_leaf,
+                experimental_params=None,
+                n_output_interactions=max(n_output_interactions, (len(term_features) + 1) // 2)
+            )
+            term_features = [feature_idxs for _, feature_idxs in survivors]
+        iter_term_features = term_features
+
     ranked_interactions = _get_ranked_interactions(
         dataset=dataset,
         bag=None,
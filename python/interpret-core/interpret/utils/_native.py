@@ -333,6 +333,45 @@ class Native:
 
         return bin_indexes
 
+    def score_terms(
+        self,
+        bin_counts,
+        bin_indexes,
+        dimension_counts,
+        column_indexes,
+        strides,
+        term_offsets,
+        cell_scores,
+        sample_scores,
+        term_scores=None,
+        n_threads=0,
+    ):
+        # bin_indexes is a (n_columns, n_samples) matrix of binned columns with unknowns already mapped 
+        # into the last bin, and bin_counts is the number of bins in each of those columns.  cell_scores 
+        # holds all the flattened term tensors concatenated together and sample_scores is accumulated 
+        # into.  If term_scores is given it receives the per-term contributions.
+
+        n_scores = 1 if cell_scores.ndim == 1 else cell_scores.shape[1]
+        return_code = self._unsafe.ScoreTerms(
+            bin_indexes.shape[1],
+            n_scores,
+            bin_indexes.shape[0],
+            Native._make_pointer(bin_counts, np.int64),
+            Native._make_pointer(bin_indexes, np.int64, 2),
+            len(dimension_counts),
+            Native._make_pointer(dimension_counts, np.int64),
+            Native._make_pointer(column_indexes, np.int64),
+            Native._make_pointer(strides, np.int64),
+            Native._make_pointer(term_offsets, np.int64),
+            cell_scores.shape[0],
+            Native._make_pointer(cell_scores, np.float64, cell_scores.ndim),
+            n_threads,
+            Native._make_pointer(sample_scores, np.float64, sample_scores.ndim),
+            Native._make_pointer(term_scores, np.float64, None if term_scores is None else term_scores.ndim, True),
+        )
+        if return_code:  # pragma: no cover
+            raise Native._get_native_exception(return_code, "ScoreTerms")
+
     def measure_dataset_header(self, n_features, n_weights, n_targets):
         n_bytes = self._unsafe.MeasureDataSetHeader(n_features, n_weights, n_targets)
         if n_bytes < 0:  # pragma: no cover
@@ -736,6 +775,40 @@ class Native:
         ]
         self._unsafe.Discretize.restype = ct.c_int32
 
+        self._unsafe.ScoreTerms.argtypes = [
+            # int64_t countSamples
+            ct.c_int64,
+            # int64_t countScores
+            ct.c_int64,
+            # int64_t countColumns
+            ct.c_int64,
+            # int64_t * binCounts
+            ct.c_void_p,
+            # int64_t * binIndexes
+            ct.c_void_p,
+            # int64_t countTerms
+            ct.c_int64,
+            # int64_t * dimensionCounts
+            ct.c_void_p,
+            # int64_t * columnIndexes
+            ct.c_void_p,
+            # int64_t * strides
+            ct.c_void_p,
+            # int64_t * termOffsets
+            ct.c_void_p,
+            # int64_t countCells
+            ct.c_int64,
+            # double * cellScores
+            ct.c_void_p,
+            # int64_t countThreads
+            ct.c_int64,
+            # double * sampleScoresInOut
+            ct.c_void_p,
+            # double * termScoresOut
+            ct.c_void_p,
+        ]
+        self._unsafe.ScoreTerms.restype = ct.c_int32
+
 
         self._unsafe.MeasureDataSetHeader.argtypes = [
             # int64_t countFeatures
@@ -1022,6 +1095,44 @@ class Native:
         ]
         self._unsafe.ApplyTermUpdate.restype = ct.c_int32
 
+        self._unsafe.BoostRounds.argtypes = [
+            # void * rng
+            ct.c_void_p,
+            # void * boosterHandle
+            ct.c_void_p,
+            # int64_t countRounds
+            ct.c_int64,
+            # BoostFlags flags 
+            ct.c_int32,
+            # double learningRate
+            ct.c_double,
+            # int64_t minSamplesLeaf
+            ct.c_int64,
+            # int64_t leavesMax
+            ct.c_int64,
+            # int64_t earlyStoppingRounds
+            ct.c_int64,
+            # double earlyStoppingTolerance
+            ct.c_double,
+            # int32_t isRelativeTolerance
+            ct.c_int32,
+            # int64_t earlyStoppingWindow
+            ct.c_int64,
+            # double * windowMetricsInOut
+            ct.c_void_p,
+            # int64_t * roundIndexInOut
+            ct.POINTER(ct.c_int64),
+            # double * minMetricInOut
+            ct.POINTER(ct.c_double),
+            # double * breakpointMetricInOut
+            ct.POINTER(ct.c_double),
+            # int64_t * noChangeRunLengthInOut
+            ct.POINTER(ct.c_int64),
+            # int32_t * isStoppedOut
+            ct.POINTER(ct.c_int32),
+        ]
+        self._unsafe.BoostRounds.restype = ct.c_int32
+
         self._unsafe.GetBestTermScores.argtypes = [
             # void * boosterHandle
             ct.c_void_p,
@@ -1079,6 +1190,48 @@ class Native:
         ]
         self._unsafe.CalcInteractionStrength.restype = ct.c_int32
 
+        self._unsafe.CalcInteractionStrengths.argtypes = [
+            # void * interactionHandle
+            ct.c_void_p,
+            # int64_t countTerms
+            ct.c_int64,
+            # int64_t countDimensions
+            ct.c_int64,
+            # int64_t * featureIndexes
+            ct.c_void_p,
+            # InteractionFlags flags 
+            ct.c_int32,
+            # int64_t minSamplesLeaf
+            ct.c_int64,
+            # double * avgInteractionStrengthsOut
+            ct.c_void_p,
+        ]
+        self._unsafe.CalcInteractionStrengths.restype = ct.c_int32
+
+class EarlyStoppingState:
+    """ Early stopping state that Booster.boost_rounds carries between calls.
+
+    With a window of 0 a round improves if the best validation metric beats the metric captured at 
+    the start of the current run of rounds without improvement by more than the tolerance.  With a 
+    positive window a round improves if the best validation metric improved by more than the tolerance
+    over the last window rounds, which is tracked in a circular buffer. The tolerance is an absolute 
+    difference, or if relative is a fraction of the magnitude of the metric being compared against.
+    """
+
+    def __init__(self, window=0, is_relative=False):
+        if window is None:
+            window = 0
+        if window < 0:  # pragma: no cover
+            raise ValueError("window must be non-negative")
+
+        self.n_rounds = 0
+        self.min_metric = np.inf
+        self.breakpoint_metric = np.inf
+        self.no_change_run_length = 0
+        self.is_relative = is_relative
+        self.window_metrics = np.full(window, np.inf, np.float64)
+
+
 class Booster(AbstractContextManager):
     """Lightweight wrapper for EBM C boosting code.
     """
@@ -1286,6 +1439,72 @@ class Booster(AbstractContextManager):
         # log.debug("Boosting step end")
         return avg_validation_metric.value
 
+    def boost_rounds(
+        self,
+        n_rounds,
+        boost_flags,
+        learning_rate,
+        min_samples_leaf,
+        max_leaves,
+        early_stopping_rounds,
+        early_stopping_tolerance,
+        state,
+    ):
+
+        """ Boosts complete cyclic rounds over all the terms inside the native code.
+
+        Args:
+            n_rounds: Maximum number of rounds to boost in this call
+            boost_flags: C interface options
+            learning_rate: Learning rate as a float.
+            min_samples_leaf: Min observations required to split.
+            max_leaves: Max leaf nodes on feature step.
+            early_stopping_rounds: Number of rounds of no improvement that trigger early stopping. Negative disables it.
+            early_stopping_tolerance: Tolerance that dictates the smallest delta required to be considered an improvement.
+            state: EarlyStoppingState that is updated in place, which allows the rounds to be boosted over multiple calls.
+
+        Returns:
+            True if early stopping was triggered.
+        """
+
+        self._term_idx = -1
+
+        native = Native.get_native_singleton()
+
+        round_idx = ct.c_int64(state.n_rounds)
+        min_metric = ct.c_double(state.min_metric)
+        breakpoint_metric = ct.c_double(state.breakpoint_metric)
+        no_change_run_length = ct.c_int64(state.no_change_run_length)
+        is_stopped = ct.c_int32(0)
+
+        return_code = native._unsafe.BoostRounds(
+            Native._make_pointer(self.rng, np.ubyte, is_null_allowed=True),
+            self._booster_handle, 
+            n_rounds,
+            boost_flags,
+            learning_rate,
+            min_samples_leaf,
+            max_leaves,
+            early_stopping_rounds,
+            early_stopping_tolerance,
+            1 if state.is_relative else 0,
+            len(state.window_metrics),
+            Native._make_pointer(state.window_metrics, np.float64),
+            ct.byref(round_idx),
+            ct.byref(min_metric),
+            ct.byref(breakpoint_metric),
+            ct.byref(no_change_run_length),
+            ct.byref(is_stopped),
+        )
+        if return_code:  # pragma: no cover
+            raise Native._get_native_exception(return_code, "BoostRounds")
+
+        state.n_rounds = round_idx.value
+        state.min_metric = min_metric.value
+        state.breakpoint_metric = breakpoint_metric.value
+        state.no_change_run_length = no_change_run_length.value
+        return is_stopped.value != 0
+
     def get_best_model(self):
         model = []
         for term_idx in range(len(self.term_features)):
@@ -1592,3 +1811,39 @@ class InteractionDetector(AbstractContextManager):
 
         log.info("Fast interaction strength end")
         return strength.value
+
+    def calc_interaction_strengths(self, term_features, interaction_flags, min_samples_leaf):
+        """ Provides strengths for many feature interactions in a single native call. Higher is better.
+
+        Args:
+            term_features: (n_terms, n_dimensions) array of feature indexes
+            interaction_flags: interaction flags applied to every term
+            min_samples_leaf: min samples per leaf
+
+        Returns:
+            Array of n_terms interaction strengths
+        """
+        log.info("Fast interaction strengths start")
+
+        native = Native.get_native_singleton()
+
+        term_features = np.ascontiguousarray(term_features, np.int64)
+        if term_features.ndim != 2:  # pragma: no cover
+            raise ValueError("term_features must be a 2 dimensional array")
+
+        n_terms, n_dimensions = term_features.shape
+        strengths = np.empty(n_terms, np.float64)
+        return_code = native._unsafe.CalcInteractionStrengths(
+            self._interaction_handle,
+            n_terms,
+            n_dimensions,
+            Native._make_pointer(term_features, np.int64, 2),
+            interaction_flags, 
+            min_samples_leaf,
+            Native._make_pointer(strengths, np.float64),
+        )
+        if return_code:  # pragma: no cover
+            raise Native._get_native_exception(return_code, "CalcInteractionStrengths")
+
+        log.info("Fast interaction strengths end")
+        return strengths
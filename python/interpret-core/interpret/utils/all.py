@@ -4,6 +4,7 @@
 import itertools
 import warnings
 from collections import OrderedDict
+from collections.abc import Sequence
 
 import numpy as np
 import pandas as pd
@@ -53,6 +54,67 @@ def gen_perf_dicts(scores, y=None, is_classification=True):
     return records
 
 
+class LocalPerfDicts(Sequence):
+    """ Columnar equivalent of gen_perf_dicts.
+
+    The performance of each sample is held in arrays, and the dictionary that gen_perf_dicts would
+    return for a sample is only built when it is accessed.
+    """
+
+    def __init__(self, scores, y=None, is_classification=True):
+        n_samples = len(scores)
+        self.y = y
+        self.is_classification = is_classification
+        self.actual = np.full(n_samples, np.nan) if y is None else y
+        if not is_classification:
+            self.predicted = scores
+            self.predicted_score = scores
+            self.actual_score = self.actual
+        else:
+            if scores.ndim == 1:
+                scores = np.vstack([1 - scores, scores]).T
+            sample_idxs = np.arange(n_samples)
+            self.predicted = np.argmax(scores, axis=1)
+            self.predicted_score = scores[sample_idxs, self.predicted]
+            self.actual_score = np.full(n_samples, np.nan) if y is None else scores[sample_idxs, y]
+
+    def __len__(self):
+        return len(self.predicted)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        return {
+            "is_classification": self.is_classification,
+            "actual": np.nan if self.y is None else self.actual[key],
+            "predicted": self.predicted[key],
+            "actual_score": np.nan if self.y is None else self.actual_score[key],
+            "predicted_score": self.predicted_score[key],
+        }
+
+    def to_selector(self, round=3):
+        """ Vectorized equivalent of gen_local_selector for the samples. """
+        resid = self.actual_score - self.predicted_score
+        records = {
+            "Actual": self.actual,
+            "Predicted": self.predicted,
+            "PrScore": self.predicted_score,
+            "AcScore": self.actual_score,
+            "Resid": resid,
+            "AbsResid": np.abs(resid),
+        }
+        if self.is_classification:
+            columns = ["Actual", "Predicted", "PrScore", "AcScore", "Resid", "AbsResid"]
+        else:
+            columns = ["Actual", "Predicted", "Resid", "AbsResid"]
+
+        df = pd.DataFrame({column: records[column] for column in columns}, columns=columns)
+        if round is not None:
+            return df.round(round)
+        else:  # pragma: no cover
+            return df
+
+
 def hist_per_column(arr, feature_types=None):
     counts = []
     bin_edges = []
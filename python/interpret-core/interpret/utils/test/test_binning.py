@@ -1,6 +1,10 @@
 # Copyright (c) 2019 Microsoft Corporation
 # Distributed under the MIT software license
 
+import os
+import gc
+import pickle
+import tempfile
 import pytest
 import numpy as np
 import numpy.ma as ma
@@ -10,7 +14,7 @@ import scipy as sp
 from itertools import repeat, chain
 
 from .._binning import *
-from .._binning import _process_column_initial, _encode_categorical_existing, _process_continuous, _deduplicate_bins
+from .._binning import _process_column_initial, _encode_categorical_existing, _process_continuous, _deduplicate_bins, _QuantileSketch, _CategoryLookup, _compile_bins
 
 def test_clean_dimensions_2d():
     init_score = [[[[((x,) for x in [1, 2])]]], [3, 4], (np.array([5, 6]),), np.array([[[(7,), (8,)]]])]
@@ -836,6 +840,35 @@ def test_unify_columns_scipy():
     assert(X_cols[2][1].dtype == np.int64)
     assert(np.array_equal(X_cols[2][1], np.array([X_cols[2][2]["3"], X_cols[2][2]["6"]], dtype=np.int64)))
 
+def test_unify_sparse_columns():
+    X = sp.sparse.csr_matrix([[0, 2.5, 0], [4, 0, 0], [0, np.nan, 7], [0, 2.5, 0]])
+    feature_names_in = unify_feature_names(X)
+    feature_types = ['continuous', 'nominal', 'continuous']
+    requests = [(0, None), (1, {"2.5": 1, "0.0": 2}), (2, None)]
+    dense = list(unify_columns(X.toarray(), requests, feature_names_in, feature_types))
+    sparse = list(unify_sparse_columns(X, requests, feature_names_in, feature_types))
+
+    # the implicit zero is processed once at index 0, followed by the stored values
+    assert(np.array_equal(sparse[0][1], np.array([1], dtype=np.int32)))
+    assert(np.array_equal(sparse[0][2], np.array([0.0, 4.0], dtype=np.float64)))
+    assert(np.array_equal(sparse[1][2], np.array([2, 1, 0, 1], dtype=np.int64)))
+
+    X_cols = list(unify_columns(X, requests, feature_names_in, feature_types))
+    for (_, X_col, _, bad), (_, X_col_dense, _, bad_dense) in zip(X_cols, dense):
+        assert(np.array_equal(X_col, X_col_dense, equal_nan=True))
+        assert(bad is None and bad_dense is None)
+
+    # unknown categories are reported in bad, including for the implicit zeros
+    requests[1] = (1, {"2.5": 1})
+    _, X_col, _, bad = list(unify_columns(X, requests, feature_names_in, feature_types))[1]
+    assert(np.array_equal(X_col, np.array([1, -1, 0, 1], dtype=np.int64)))
+    assert(np.array_equal(bad, np.array([None, "0.0", None, None], dtype=np.object_)))
+
+    # fit time processing that depends on all the values gets the full column
+    _, rows, X_col, categories, _ = next(unify_sparse_columns(X, [(0, None)], feature_names_in, None))
+    assert(rows is None)
+    assert(np.array_equal(X_col, np.array([categories["0.0"], categories["4.0"], categories["0.0"], categories["0.0"]], dtype=np.int64)))
+
 def test_unify_columns_dict1():
     X = {"feature1" : [1], "feature2" : "hi", "feature3" : None}
     X, n_samples = clean_X(X)
@@ -2241,6 +2274,125 @@ def test_bin_native():
     assert(shared_dataset is not None)
 
 
+def test_remove_file_retried_at_exit(monkeypatch):
+    fd, path = tempfile.mkstemp(prefix='interpret_dataset_', suffix='.bin')
+    os.close(fd)
+
+    def locked_unlink(path):
+        raise PermissionError(path)
+
+    from .. import _binning
+    monkeypatch.setattr(_binning, "_pending_removals", set())
+    monkeypatch.setattr(_binning, "_is_exiting", False)
+    with monkeypatch.context() as m:
+        m.setattr(os, "unlink", locked_unlink)
+        _binning._remove_file(path)
+    assert(path in _binning._pending_removals)
+    assert(os.path.exists(path))
+
+    _binning._remove_pending_files()
+    assert(len(_binning._pending_removals) == 0)
+    assert(not os.path.exists(path))
+
+def test_bin_native_shared_dataset(monkeypatch):
+    from .. import _binning
+
+    X = np.array([["a", 1.5, 3], ["b", 2.5, 2], ["c", np.nan, 1], ["a", 4.5, 0]] * 5, dtype=np.object_)
+    y = np.array([0.5, 1.5, 2.5, 3.5] * 5)
+    feature_types_given = ['nominal', 'continuous', 'continuous']
+
+    X, n_samples = clean_X(X)
+    feature_names_in, feature_types_in, bins, _, _, _, _, _, _ = construct_bins(X, y, None, None, feature_types_given, [256])
+
+    private_dataset = bin_native_by_dimension(-1, 1, bins, X, y, None, feature_names_in, feature_types_in)
+    assert not isinstance(private_dataset, np.memmap)
+
+    monkeypatch.setattr(_binning, "_SHARED_DATASET_MIN_BYTES", 0)
+    shared_dataset = bin_native_by_dimension(-1, 1, bins, X, y, None, feature_names_in, feature_types_in)
+    assert isinstance(shared_dataset, np.memmap)
+    assert np.array_equal(private_dataset, shared_dataset)
+
+    path = shared_dataset.filename
+    assert os.path.exists(path)
+    del shared_dataset
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_construct_bins_parallel():
+    np.random.seed(0)
+    X = np.random.randn(500, 6)
+    X[::7, 1] = np.nan
+    X = X.astype(np.object_)
+    X[:, 2] = np.random.choice(["x", "y", "z"], 500)
+    X[:, 4] = np.random.randint(0, 4, 500)
+    y = np.random.randint(0, 2, 500)
+    feature_types_given = ['continuous', 'continuous', 'nominal', 'continuous', 'nominal', 'continuous']
+
+    X, n_samples = clean_X(X)
+
+    serial = construct_bins(X, y, None, None, feature_types_given, [256, 32], n_jobs=1)
+    parallel = construct_bins(X, y, None, None, feature_types_given, [256, 32], n_jobs=3)
+
+    assert serial[0] == parallel[0]
+    assert serial[1] == parallel[1]
+    for serial_levels, parallel_levels in zip(serial[2], parallel[2]):
+        assert len(serial_levels) == len(parallel_levels)
+        for serial_bins, parallel_bins in zip(serial_levels, parallel_levels):
+            if isinstance(serial_bins, dict):
+                assert serial_bins == parallel_bins
+            else:
+                assert np.array_equal(serial_bins, parallel_bins)
+    for serial_weights, parallel_weights in zip(serial[3], parallel[3]):
+        assert np.array_equal(serial_weights, parallel_weights)
+    assert np.array_equal(serial[4], parallel[4], equal_nan=True)
+    for serial_counts, parallel_counts in zip(serial[5], parallel[5]):
+        assert np.array_equal(serial_counts, parallel_counts)
+    for idx in range(6, 9):
+        assert np.array_equal(serial[idx], parallel[idx])
+
+
+def test_construct_bins_single_pass_levels():
+    np.random.seed(0)
+    X = np.random.randn(500, 4)
+    X[::5, 1] = np.nan
+    X = X.astype(np.object_)
+    X[:, 2] = np.random.choice(["x", "y", "z"], 500)
+    y = np.random.randint(0, 2, 500)
+    feature_types_given = ['continuous', 'continuous', 'nominal', 'continuous']
+    max_bins_leveled = [256, 16, 4]
+
+    X, n_samples = clean_X(X)
+
+    feature_names_in, feature_types_in, bins, bin_weights, feature_bounds, histogram_counts, _, _, _ = construct_bins(X, y, None, None, feature_types_given, max_bins_leveled)
+
+    for level_idx, max_bins in enumerate(max_bins_leveled):
+        preprocessor = EBMPreprocessor(None, feature_types_given, max_bins)
+        preprocessor.fit(X, y)
+        assert feature_names_in == preprocessor.feature_names_in_
+        assert feature_types_in == preprocessor.feature_types_in_
+        for bin_levels, expected_bins in zip(bins, preprocessor.bins_):
+            if isinstance(expected_bins, dict):
+                assert bin_levels[min(level_idx, len(bin_levels) - 1)] == expected_bins
+            else:
+                assert np.array_equal(bin_levels[min(level_idx, len(bin_levels) - 1)], expected_bins)
+        if level_idx == 0:
+            for weights, expected_weights in zip(bin_weights, preprocessor.bin_weights_):
+                assert np.array_equal(weights, expected_weights)
+            assert np.array_equal(feature_bounds, preprocessor.feature_bounds_, equal_nan=True)
+            for counts, expected_counts in zip(histogram_counts, preprocessor.histogram_counts_):
+                assert np.array_equal(counts, expected_counts)
+
+    preprocessor = EBMPreprocessor(None, feature_types_given, max_bins_leveled)
+    preprocessor.fit(X, y)
+    main_preprocessor = EBMPreprocessor(None, feature_types_given, max_bins_leveled[0])
+    main_preprocessor.fit(X, y)
+    assert np.array_equal(preprocessor.transform(X), main_preprocessor.transform(X))
+
+    with pytest.raises(ValueError):
+        EBMPreprocessor(None, feature_types_given, [256, 2]).fit(X, y)
+
+
 def test_deduplicate_bins():
     bins = [
         [{"a": 1, "b": 2}, {"a": 2, "b": 1}, {"b": 2, "a": 1}, {"b": 2, "a": 1}],
@@ -2258,3 +2410,232 @@ def test_deduplicate_bins():
     assert(id(bins[1][0]) != id(bins[1][1]))
     assert(id(bins[1][0]) == id(bins[1][2]))
     assert(id(bins[1][1]) != id(bins[1][2]))
+
+
+def test_compile_bins():
+    shared = {"a": 1, "b": 2}
+    cuts = np.array([1, 2, 3], dtype=np.float64)
+    bins = [[shared, {"a": 2, "b": 1}, shared], [cuts]]
+
+    compiled = _compile_bins(bins)
+
+    assert(isinstance(compiled[0][0], _CategoryLookup))
+    assert(compiled[0][0] == shared)
+    assert(compiled[0][0] is compiled[0][2])
+    assert(compiled[0][0] is not compiled[0][1])
+    assert(compiled[1][0] is cuts)
+    assert(bins[0][0] is shared)
+
+def test_encode_categorical_existing_lookup():
+    c = {"abc": 1, "def": 2, "11.11": 3, "5": 4}
+    lookup = _CategoryLookup(c)
+    nonmissings = np.array([True, True, False, True, True, True, True], dtype=np.bool_)
+    for X_col in [
+        np.array(["abc", "ghi", "def", "something", "abc", "def"], dtype=np.unicode_),
+        np.array(["def", 11.11, 5, "xyz", "abc", 11.11], dtype=np.object_),
+        np.array([5, -9, 0, 5, 5, -9], dtype=np.int8),
+        np.array([11.11, 2.2, np.nan, 11.11, 5.0, 5.0], dtype=np.float64),
+    ]:
+        for mask in [None, nonmissings]:
+            encoded_dict, bad_dict = _encode_categorical_existing(X_col, mask, c)
+            encoded, bad = _encode_categorical_existing(X_col, mask, lookup)
+            assert(np.array_equal(encoded, encoded_dict))
+            assert(np.array_equal(bad, bad_dict))
+
+    encoded, bad = _encode_categorical_existing(np.array(["abc", "def"], dtype=np.unicode_), None, _CategoryLookup({}))
+    assert(np.array_equal(encoded, np.array([-1, -1], dtype=np.int64)))
+    assert(np.array_equal(bad, np.array(["abc", "def"], dtype=np.object_)))
+
+def test_encode_pandas_categorical_lookup():
+    c = {"b": 1, "a": 2}
+    lookup = _CategoryLookup(c)
+    X_col = pd.Series(pd.Categorical(["a", "c", None, "b", "a"], categories=["a", "b", "c"]))
+
+    _, encoded_dict, _, bad_dict = unify_columns(pd.DataFrame({"f": X_col}), [(0, c)], ["f"], None, 3, True).__next__()
+    for _ in range(2):
+        # the second call reuses the mapping cached for the CategoricalDtype
+        _, encoded, categories, bad = unify_columns(pd.DataFrame({"f": X_col}), [(0, lookup)], ["f"], None, 3, True).__next__()
+        assert(categories is lookup)
+        assert(np.array_equal(encoded, np.array([2, -1, 0, 1, 2], dtype=np.int64)))
+        assert(np.array_equal(encoded, encoded_dict))
+        assert(np.array_equal(bad, np.array([None, "c", None, None, None], dtype=np.object_)))
+        assert(np.array_equal(bad, bad_dict))
+    assert(lookup._pandas_mapping[0]() is X_col.dtype)
+
+    # the cached mapping does not keep the caller's dtype alive and is not pickled
+    restored = pickle.loads(pickle.dumps(lookup))
+    assert(restored == lookup)
+    assert(restored._pandas_mapping is None)
+    del X_col
+    gc.collect()
+    assert(lookup._pandas_mapping[0]() is None)
+
+
+def test_quantile_sketch():
+    np.random.seed(0)
+    values = np.random.standard_exponential(200000)
+
+    sketch = _QuantileSketch(k=256)
+    sketch.update(values[:100])
+    assert sketch.is_exact()
+    assert np.array_equal(sketch.to_values(), np.sort(values[:100]))
+
+    sketch = _QuantileSketch(k=256)
+    other = _QuantileSketch(k=256)
+    for start in range(0, len(values), 10000):
+        (sketch if start < 100000 else other).update(values[start:start + 10000])
+    sketch.merge(other)
+    assert not sketch.is_exact()
+    assert sketch.n == len(values)
+    assert sum(len(items) for items in sketch.levels) < 3 * 256 + 8 * len(sketch.levels)
+
+    sketched = sketch.to_values()
+    assert sketched[0] == values.min()
+    assert sketched[-1] == values.max()
+    quantiles = np.linspace(0.01, 0.99, 99)
+    ranks = np.searchsorted(np.sort(values), np.quantile(sketched, quantiles)) / len(values)
+    assert np.abs(ranks - quantiles).max() < 0.02
+
+
+def test_preprocessor_quantile_sketch():
+    np.random.seed(0)
+    X = np.random.randn(20000, 2)
+    X[:3000, 1] = np.random.randn(3000)
+    X[3000:, 1] = np.nan # leaves fewer values than the sketch capacity, so it is cut exactly
+    feature_types = ['continuous', 'continuous']
+
+    exact = EBMPreprocessor(feature_types=feature_types, max_bins=[256, 32], binning='quantile').fit(X)
+    sketched = EBMPreprocessor(feature_types=feature_types, max_bins=[256, 32], binning='quantile_sketch').fit(X)
+
+    for exact_bins, sketched_bins in zip(exact.bins_[1], sketched.bins_[1]):
+        assert np.array_equal(exact_bins, sketched_bins)
+    for exact_bins, sketched_bins in zip(exact.bins_[0], sketched.bins_[0]):
+        assert len(exact_bins) == len(sketched_bins)
+        ranks = np.searchsorted(np.sort(X[:, 0]), [exact_bins, sketched_bins]) / len(X)
+        assert np.abs(ranks[0] - ranks[1]).max() < 0.01
+
+    # the per-feature binning in feature_types also selects the sketch
+    per_feature = EBMPreprocessor(feature_types=['quantile_sketch', 'continuous'], max_bins=256).fit(X)
+    assert np.array_equal(per_feature.bins_[0], sketched.bins_[0][0])
+
+
+def test_construct_bins_chunked():
+    np.random.seed(0)
+    X = pd.DataFrame({
+        "a": np.random.randn(500),
+        "b": np.random.choice(["x", "y", "z"], 500),
+        "c": np.random.randint(0, 4, 500).astype(np.float64),
+        "d": np.random.randn(500),
+    })
+    X.loc[::7, "a"] = np.nan
+    X.loc[:99, "b"] = "x" # the first chunk only has some of the categories
+    y = np.random.randint(0, 2, 500)
+    sample_weight = np.random.rand(500) + 0.5
+
+    expected = construct_bins(X, y, sample_weight, None, None, [256, 32])
+    chunks = [X.iloc[start:start + 100] for start in range(0, 500, 100)]
+    chunked = construct_bins_chunked(chunks, 500, sample_weight, None, None, [256, 32])
+
+    assert expected[0] == chunked[0]
+    assert expected[1] == chunked[1]
+    for expected_levels, chunked_levels in zip(expected[2], chunked[2]):
+        assert len(expected_levels) == len(chunked_levels)
+        for expected_bins, chunked_bins in zip(expected_levels, chunked_levels):
+            if isinstance(expected_bins, dict):
+                assert expected_bins == chunked_bins
+            else:
+                assert np.array_equal(expected_bins, chunked_bins)
+    for expected_weights, chunked_weights in zip(expected[3], chunked[3]):
+        assert np.allclose(expected_weights, chunked_weights)
+    assert np.array_equal(expected[4], chunked[4], equal_nan=True)
+    for expected_counts, chunked_counts in zip(expected[5], chunked[5]):
+        assert np.array_equal(expected_counts, chunked_counts)
+    for idx in range(6, 9):
+        assert np.array_equal(expected[idx], chunked[idx])
+
+    # the binned chunks produce the same native dataset as X
+    binned = chunked[9]
+    for n_dimensions in (1, 2):
+        dataset = bin_native_by_dimension(2, n_dimensions, chunked[2], X, y, sample_weight, chunked[0], chunked[1])
+        binned_dataset = bin_native_by_dimension(2, n_dimensions, chunked[2], binned, y, sample_weight, chunked[0], chunked[1])
+        assert np.array_equal(dataset, binned_dataset)
+
+    with pytest.raises(ValueError):
+        construct_bins_chunked(chunks, 499, None, None, None, [256])
+
+def test_construct_bins_chunked_non_numeric_continuous():
+    np.random.seed(0)
+    a = np.random.randn(300).astype(np.object_)
+    a[::11] = np.nan
+    a[5] = "bad"
+    a[150] = "?"
+    a[299] = "bad"
+    X = pd.DataFrame({"a": a, "b": np.random.randn(300)})
+    y = np.random.randint(0, 2, 300)
+    feature_types = ["continuous", "continuous"]
+
+    # both paths put the non-numeric values into the unknown bin
+    expected = construct_bins(X, y, None, None, feature_types, [256, 32])
+    chunks = [X.iloc[start:start + 100] for start in range(0, 300, 100)]
+    chunked = construct_bins_chunked(chunks, 300, None, None, feature_types, [256, 32])
+
+    assert expected[1] == chunked[1] == feature_types
+    for expected_levels, chunked_levels in zip(expected[2], chunked[2]):
+        for expected_bins, chunked_bins in zip(expected_levels, chunked_levels):
+            assert np.array_equal(expected_bins, chunked_bins)
+    assert expected[3][0][-1] == 3
+    for expected_weights, chunked_weights in zip(expected[3], chunked[3]):
+        assert np.array_equal(expected_weights, chunked_weights)
+    assert np.array_equal(expected[4], chunked[4])
+    assert expected[5][0][-1] == 3
+    for expected_counts, chunked_counts in zip(expected[5], chunked[5]):
+        assert np.array_equal(expected_counts, chunked_counts)
+    assert expected[6][0] == 28
+    for idx in range(6, 9):
+        assert np.array_equal(expected[idx], chunked[idx])
+
+    binned = chunked[9]
+    for n_dimensions in (1, 2):
+        dataset = bin_native_by_dimension(2, n_dimensions, chunked[2], X, y, None, chunked[0], chunked[1])
+        binned_dataset = bin_native_by_dimension(2, n_dimensions, chunked[2], binned, y, None, chunked[0], chunked[1])
+        assert np.array_equal(dataset, binned_dataset)
+
+def test_unify_columns_pyarrow():
+    pa = pytest.importorskip("pyarrow")
+
+    df = pd.DataFrame({
+        "floats": [1.5, np.nan, 2.5, 1.5, 3.5, 2.5],
+        "ints": pd.array([1, 2, None, 2, 1, 7], dtype="Int64"),
+        "bools": [True, False, True, True, False, False],
+        "strs": ["a", None, "b", "a", "c", "1"],
+        "cats": pd.Categorical(["x", "y", None, "x", "z", "y"]),
+    })
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    assert(pa.types.is_dictionary(table.schema.field("cats").type))
+
+    X, n_samples = clean_X(table)
+    assert(n_samples == 6)
+    feature_names_in = unify_feature_names(X)
+    assert(feature_names_in == list(df.columns))
+
+    requests = list(zip(range(len(feature_names_in)), repeat(None)))
+    expected = list(unify_columns(df, requests, feature_names_in))
+    results = list(unify_columns(X, requests, feature_names_in))
+    for (expected_type, expected_col, expected_categories, _), (feature_type, X_col, categories, bad) in zip(expected, results):
+        assert(feature_type == expected_type)
+        assert(np.array_equal(X_col, expected_col, equal_nan=issubclass(X_col.dtype.type, np.floating)))
+        assert(categories == expected_categories)
+        assert(bad is None)
+
+    # predict with categories that are missing some of the values, spread over several record batches
+    feature_types = [feature_type for feature_type, _, _, _ in results]
+    requests = [(feature_idx, categories) for feature_idx, (_, _, categories, _) in enumerate(results)]
+    requests[3] = (3, {"a": 1, "b": 2})
+    requests[4] = (4, {"y": 1, "x": 2})
+    table = pa.Table.from_batches(table.to_batches(max_chunksize=4))
+    assert(1 < table.column(0).num_chunks)
+    expected = list(unify_columns(df, requests, feature_names_in, feature_types))
+    results = list(unify_columns(table, requests, feature_names_in, feature_types))
+    for (_, expected_col, _, expected_bad), (_, X_col, _, bad) in zip(expected, results):
+        assert(np.array_equal(X_col, expected_col, equal_nan=issubclass(X_col.dtype.type, np.floating)))
+        assert(np.array_equal(bad, expected_bad))
@@ -305,3 +305,34 @@ def test_added_impure_contribution_is_zero():
 
     ranked_strengths_impure = dict(measure_interactions(X, y, min_samples_leaf=1, sample_weight=sample_weight))
     assert ranked_strengths_pure_int[(0, 1)] == ranked_strengths_impure[(0, 1)]
+
+def test_max_interaction_features(regression_data):
+    X, y = regression_data
+
+    ranked_pairs = measure_interactions(X, y, max_interaction_features=3)
+    # only the pairs among the top 3 of the 4 features are evaluated
+    assert 3 == len(ranked_pairs)
+    assert 3 == len(set(i for pair, _ in ranked_pairs for i in pair))
+
+    all_pairs = dict(measure_interactions(X, y))
+    for pair, strength in ranked_pairs:
+        assert isclose(all_pairs[pair], strength)
+
+    ranked_pairs = measure_interactions(X, y, max_interaction_features=4)
+    assert 6 == len(ranked_pairs)
+
+    with pytest.raises(ValueError):
+        measure_interactions(X, y, max_interaction_features=1)
+
+def test_halving_rounds():
+    data = synthetic_classification()
+    X = data["full"]["X"]
+    y = np.array(data["full"]["y"]).reshape(-1)
+
+    ranked_pairs = measure_interactions(X, y, interactions=2, halving_rounds=2)
+    assert 2 == len(ranked_pairs)
+
+    # the survivors are scored on the full data, so their strengths match the exhaustive search
+    all_pairs = dict(measure_interactions(X, y))
+    for pair, strength in ranked_pairs:
+        assert isclose(all_pairs[pair], strength)
@@ -1,7 +1,7 @@
 # Copyright (c) 2019 Microsoft Corporation
 # Distributed under the MIT software license
 
-from .._native import Native, Booster
+from .._native import Native, Booster, EarlyStoppingState
 
 import numpy as np
 import ctypes as ct
@@ -49,6 +49,118 @@ def test_cut_winsorized():
     assert(np.sum(bin_counts) == 106)
     assert bin_counts[0] == 1
 
+def test_score_terms():
+    native = Native.get_native_singleton()
+
+    # two binned columns: the first with 3 bins and the second with 2 bins
+    bin_indexes = np.array([[0, 1, 2, 2], [1, 0, 1, 0]], np.int64)
+    main0 = np.array([1.0, 2.0, 3.0])
+    pair = np.array([[10.0, 20.0], [30.0, 40.0], [50.0, 60.0]])
+    cell_scores = np.concatenate((main0, pair.ravel()))
+
+    dimension_counts = np.array([1, 2], np.int64)
+    column_indexes = np.array([0, 0, 1], np.int64)
+    strides = np.array([1, 2, 1], np.int64)
+    term_offsets = np.array([0, 3], np.int64)
+
+    bin_counts = np.array([3, 2], np.int64)
+    sample_scores = np.full(4, 0.5)
+    term_scores = np.empty((4, 2))
+    native.score_terms(bin_counts, bin_indexes, dimension_counts, column_indexes, strides, term_offsets, cell_scores, sample_scores, term_scores)
+
+    expected_main = main0[bin_indexes[0]]
+    expected_pair = pair[bin_indexes[0], bin_indexes[1]]
+    assert np.array_equal(term_scores[:, 0], expected_main)
+    assert np.array_equal(term_scores[:, 1], expected_pair)
+    assert np.array_equal(sample_scores, 0.5 + expected_main + expected_pair)
+
+    bin_indexes[1, 0] = 2
+    with pytest.raises(Exception):
+        native.score_terms(bin_counts, bin_indexes, dimension_counts, column_indexes, strides, term_offsets, cell_scores, sample_scores)
+
+def test_boost_rounds():
+    from .._binning import clean_X, construct_bins, bin_native_by_dimension
+
+    np.random.seed(0)
+    X = np.random.randn(200, 2)
+    y = X[:, 0] * 3 + X[:, 1] * X[:, 0]
+    X, n_samples = clean_X(X)
+    feature_names_in, feature_types_in, bins, _, _, _, _, _, _ = construct_bins(X, y, None, None, None, [256, 32])
+    dataset = bin_native_by_dimension(-1, 2, bins, X, y, None, feature_names_in, feature_types_in)
+    bag = np.where(np.arange(n_samples) % 4 == 0, -1, 1).astype(np.int8)
+    term_features = [(0,), (1,), (0, 1)]
+
+    with Booster(dataset, bag, None, term_features, 0, None, None) as booster:
+        min_metric = np.inf
+        for _ in range(30):
+            for term_idx in range(len(term_features)):
+                booster.generate_term_update(term_idx, Native.BoostFlags_Default, 0.1, 2, 3)
+                min_metric = min(booster.apply_term_update(), min_metric)
+        expected = booster.get_current_model()
+
+    with Booster(dataset, bag, None, term_features, 0, None, None) as booster:
+        # boosting in chunks carries the early stopping state between calls
+        state = EarlyStoppingState()
+        assert not booster.boost_rounds(10, Native.BoostFlags_Default, 0.1, 2, 3, -1, 0.0, state)
+        assert not booster.boost_rounds(20, Native.BoostFlags_Default, 0.1, 2, 3, -1, 0.0, state)
+        assert state.n_rounds == 30
+        assert state.min_metric == min_metric
+        for term_scores, expected_scores in zip(booster.get_current_model(), expected):
+            assert np.array_equal(term_scores, expected_scores)
+
+    with Booster(dataset, bag, None, term_features, 0, None, None) as booster:
+        state = EarlyStoppingState()
+        assert booster.boost_rounds(1000, Native.BoostFlags_Default, -0.1, 2, 3, 5, 0.0, state)
+        assert state.n_rounds == 5
+
+    with Booster(dataset, bag, None, term_features, 0, None, None) as booster:
+        # the metric never improves, so the window fills in 4 rounds and then 5 rounds without improvement stop it
+        state = EarlyStoppingState(4, True)
+        while not booster.boost_rounds(3, Native.BoostFlags_Default, -0.1, 2, 3, 5, 1e-3, state):
+            assert state.n_rounds < 1000
+        assert state.n_rounds == 9
+
+    with Booster(dataset, bag, None, term_features, 0, None, None) as booster:
+        # converging boosting keeps improving over a large window for longer than over a small one
+        small_window = EarlyStoppingState(2)
+        booster.boost_rounds(1000, Native.BoostFlags_Default, 0.1, 2, 3, 3, 1e-4, small_window)
+    with Booster(dataset, bag, None, term_features, 0, None, None) as booster:
+        large_window = EarlyStoppingState(50)
+        booster.boost_rounds(1000, Native.BoostFlags_Default, 0.1, 2, 3, 3, 1e-4, large_window)
+    assert small_window.n_rounds < large_window.n_rounds
+
+
+def test_calc_interaction_strengths():
+    from .._binning import clean_X, construct_bins, bin_native_by_dimension
+    from .._native import InteractionDetector
+    from .._interaction import _get_ranked_interactions
+    from itertools import combinations
+
+    np.random.seed(0)
+    X = np.random.randn(200, 5)
+    y = X[:, 0] * X[:, 1] + X[:, 2] * X[:, 3] * 0.5 + X[:, 4]
+    X, n_samples = clean_X(X)
+    feature_names_in, feature_types_in, bins, _, _, _, _, _, _ = construct_bins(X, y, None, None, None, [256, 32])
+    dataset = bin_native_by_dimension(-1, 2, bins, X, y, None, feature_names_in, feature_types_in)
+    pairs = list(combinations(range(5), 2))
+
+    with InteractionDetector(dataset, None, None, None) as interaction_detector:
+        strengths = interaction_detector.calc_interaction_strengths(np.array(pairs), Native.InteractionFlags_Default, 2)
+        expected = [interaction_detector.calc_interaction_strength(pair, Native.InteractionFlags_Default, 2) for pair in pairs]
+        assert strengths.tolist() == expected
+
+        # pairs sharing their first feature are summed in one pass, which must not depend on their order
+        shuffled = np.random.permutation(len(pairs))
+        strengths = interaction_detector.calc_interaction_strengths(np.array(pairs)[shuffled], Native.InteractionFlags_Default, 2)
+        assert strengths.tolist() == [expected[idx] for idx in shuffled]
+
+    ranked = _get_ranked_interactions(dataset, None, None, iter(pairs), Native.InteractionFlags_Default, 2, None, 3)
+    assert ranked == sorted(zip(expected, pairs), reverse=True)[:3]
+
+    # terms with different numbers of features are batched separately
+    ranked = _get_ranked_interactions(dataset, None, None, [(0, 1), (4,), (2, 3)], Native.InteractionFlags_Default, 2)
+    assert len(ranked) == 3
+
 def test_suggest_graph_bound():
     native = Native.get_native_singleton()
     cuts=[25, 50, 75]
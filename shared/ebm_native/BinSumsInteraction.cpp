@@ -5,6 +5,7 @@
 #include "precompiled_header_cpp.hpp"
 
 #include <stddef.h> // size_t, ptrdiff_t
+#include <stdlib.h> // malloc, free
 
 #include "logging.h" // EBM_ASSERT
 #include "zones.h"
@@ -308,4 +309,237 @@ extern ErrorEbm BinSumsInteraction(BinSumsInteractionBridge * const pParams) {
    return error;
 }
 
+
+static constexpr size_t k_cFusedBlockSamples = 256;
+
+struct FusedUnpackData final {
+   ptrdiff_t m_cShift;
+   size_t m_cBitsPerItemMax;
+   StorageDataType m_iTensorBinCombined;
+   size_t m_maskBits;
+   const StorageDataType * m_pData;
+   ptrdiff_t m_cShiftReset;
+   size_t m_cBins;
+   size_t m_cBytesStride; // bytes between adjacent bins of this feature within its tensor
+   unsigned char * m_pRawBins;
+};
+
+INLINE_ALWAYS static void InitFusedUnpackData(
+   FusedUnpackData * const pUnpackData,
+   const size_t cSamples,
+   const size_t cItemsPerBitPack,
+   const StorageDataType * const pData,
+   const size_t cBins,
+   const size_t cBytesStride,
+   BinBase * const aFastBins
+) {
+   EBM_ASSERT(1 <= cItemsPerBitPack);
+   EBM_ASSERT(cItemsPerBitPack <= k_cBitsForStorageType);
+
+   const size_t cBitsPerItemMax = GetCountBits<StorageDataType>(cItemsPerBitPack);
+   EBM_ASSERT(1 <= cBitsPerItemMax);
+   EBM_ASSERT(cBitsPerItemMax <= k_cBitsForStorageType);
+
+   pUnpackData->m_iTensorBinCombined = *pData;
+   pUnpackData->m_pData = pData + 1;
+   pUnpackData->m_cBitsPerItemMax = cBitsPerItemMax;
+   // the first sample has not been unpacked yet, so start one item above the first item's shift
+   pUnpackData->m_cShift = static_cast<ptrdiff_t>(((cSamples - 1) % cItemsPerBitPack + 1) * cBitsPerItemMax);
+   pUnpackData->m_cShiftReset = static_cast<ptrdiff_t>((cItemsPerBitPack - 1) * cBitsPerItemMax);
+   pUnpackData->m_maskBits = static_cast<size_t>(MakeLowMask<StorageDataType>(cBitsPerItemMax));
+   pUnpackData->m_cBins = cBins;
+   pUnpackData->m_cBytesStride = cBytesStride;
+   pUnpackData->m_pRawBins = reinterpret_cast<unsigned char *>(aFastBins);
+}
+
+INLINE_ALWAYS static size_t UnpackNextBin(FusedUnpackData * const pUnpackData) {
+   pUnpackData->m_cShift -= pUnpackData->m_cBitsPerItemMax;
+   if(pUnpackData->m_cShift < ptrdiff_t { 0 }) {
+      pUnpackData->m_iTensorBinCombined = *pUnpackData->m_pData;
+      pUnpackData->m_pData = pUnpackData->m_pData + 1;
+      pUnpackData->m_cShift = pUnpackData->m_cShiftReset;
+   }
+   const size_t iBin = static_cast<size_t>(
+      pUnpackData->m_iTensorBinCombined >> pUnpackData->m_cShift) & pUnpackData->m_maskBits;
+   EBM_ASSERT(iBin < pUnpackData->m_cBins);
+   return iBin;
+}
+
+// BinSumsInteractionFusedInternal sums the gradients of all the pairs that share an anchor feature in a single
+// pass over the data.  Each block of gradients, hessians, and weights is loaded from memory once and added into 
+// the tensor of every pair instead of being re-read from memory for each pair.  The samples are added to each bin
+// in the same order as BinSumsInteractionInternal, so the sums are identical.
+template<ptrdiff_t cCompilerClasses, bool bWeight>
+INLINE_RELEASE_TEMPLATED static ErrorEbm BinSumsInteractionFusedInternal(BinSumsInteractionFusedBridge * const pParams) {
+   static constexpr bool bClassification = IsClassification(cCompilerClasses);
+   static constexpr size_t cCompilerScores = GetCountScores(cCompilerClasses);
+
+   const ptrdiff_t cClasses = GET_COUNT_CLASSES(cCompilerClasses, pParams->m_cClasses);
+   const size_t cScores = GetCountScores(cClasses);
+
+   const size_t cSamples = pParams->m_cSamples;
+   EBM_ASSERT(1 <= cSamples);
+
+   const size_t cPartners = pParams->m_cPartners;
+   EBM_ASSERT(1 <= cPartners);
+
+   EBM_ASSERT(!IsOverflowBinSize<FloatFast>(bClassification, cScores)); // we're accessing allocated memory
+   const size_t cBytesPerBin = GetBinSize<FloatFast>(bClassification, cScores);
+
+   const size_t cAnchorBins = pParams->m_cAnchorBins;
+   EBM_ASSERT(size_t { 2 } <= cAnchorBins);
+   EBM_ASSERT(!IsMultiplyError(cBytesPerBin, cAnchorBins)); // the tensors were allocated with at least this size
+
+   if(IsAddError(cPartners, size_t { 1 }) || IsMultiplyError(sizeof(FusedUnpackData), cPartners + size_t { 1 })) {
+      LOG_0(Trace_Warning, "WARNING BinSumsInteractionFusedInternal IsMultiplyError(sizeof(FusedUnpackData), cPartners + 1)");
+      return Error_OutOfMemory;
+   }
+   FusedUnpackData * const aUnpackData = static_cast<FusedUnpackData *>(malloc(sizeof(FusedUnpackData) * (cPartners + size_t { 1 })));
+   if(nullptr == aUnpackData) {
+      LOG_0(Trace_Warning, "WARNING BinSumsInteractionFusedInternal nullptr == aUnpackData");
+      return Error_OutOfMemory;
+   }
+
+   // the anchor is the first dimension, so its stride is a single bin, and it does not own a tensor
+   InitFusedUnpackData(
+      &aUnpackData[0], 
+      cSamples, 
+      pParams->m_cAnchorItemsPerBitPack, 
+      pParams->m_aAnchorPacked, 
+      cAnchorBins, 
+      cBytesPerBin, 
+      nullptr
+   );
+   FusedUnpackData * const aPartnerUnpackData = &aUnpackData[1];
+   for(size_t iPartner = 0; iPartner < cPartners; ++iPartner) {
+      EBM_ASSERT(size_t { 2 } <= pParams->m_acPartnerBins[iPartner]);
+      InitFusedUnpackData(
+         &aPartnerUnpackData[iPartner],
+         cSamples,
+         pParams->m_acPartnerItemsPerBitPack[iPartner],
+         pParams->m_aaPartnerPacked[iPartner],
+         pParams->m_acPartnerBins[iPartner],
+         cBytesPerBin * cAnchorBins,
+         pParams->m_aaPartnerFastBins[iPartner]
+      );
+   }
+
+   const size_t cFloatsPerSample = bClassification ? cScores << 1 : cScores;
+
+   const FloatFast * pBlockGradientAndHessian = pParams->m_aGradientsAndHessians;
+   const FloatFast * pBlockWeight = pParams->m_aWeights;
+   size_t cSamplesRemaining = cSamples;
+   do {
+      // the samples are processed in blocks so that the block's gradients stay in the cache while they are added
+      // into each pair, and the anchor bins are unpacked once per block instead of once per pair
+      const size_t cBlockSamples = EbmMin(cSamplesRemaining, k_cFusedBlockSamples);
+      size_t aAnchorBytes[k_cFusedBlockSamples];
+      for(size_t iSample = 0; iSample < cBlockSamples; ++iSample) {
+         aAnchorBytes[iSample] = UnpackNextBin(&aUnpackData[0]) * cBytesPerBin;
+      }
+
+      FusedUnpackData * pPartnerUnpackData = aPartnerUnpackData;
+      const FusedUnpackData * const pPartnerUnpackDataEnd = aPartnerUnpackData + cPartners;
+      do {
+         // copy the unpacking state into locals so that the compiler can keep it in registers for the block
+         FusedUnpackData unpackData = *pPartnerUnpackData;
+
+         const FloatFast * pGradientAndHessian = pBlockGradientAndHessian;
+         const FloatFast * pWeight = pBlockWeight;
+         for(size_t iSample = 0; iSample < cBlockSamples; ++iSample) {
+            const size_t iPartnerBin = UnpackNextBin(&unpackData);
+
+            unsigned char * const pRawBin = unpackData.m_pRawBins + aAnchorBytes[iSample] + iPartnerBin * unpackData.m_cBytesStride;
+            auto * const pBin = reinterpret_cast<Bin<FloatFast, bClassification, cCompilerScores> *>(pRawBin);
+
+            pBin->SetCountSamples(pBin->GetCountSamples() + size_t { 1 });
+            if(bWeight) {
+               pBin->SetWeight(pBin->GetWeight() + *pWeight);
+               ++pWeight;
+            } else {
+               // TODO: In the future we'd like to eliminate this but we need the ability to change the Bin class
+               //       such that we can remove that field optionally
+               pBin->SetWeight(pBin->GetWeight() + FloatFast { 1 });
+            }
+
+            auto * const aGradientPair = pBin->GetGradientPairs();
+            size_t iScore = 0;
+            do {
+               auto * const pGradientPair = &aGradientPair[iScore];
+               const FloatFast gradient = bClassification ? pGradientAndHessian[iScore << 1] : pGradientAndHessian[iScore];
+               // DO NOT MULTIPLY gradient BY WEIGHT. WE PRE-MULTIPLIED WHEN WE ALLOCATED pGradientAndHessian
+               pGradientPair->m_sumGradients += gradient;
+               if(bClassification) {
+                  const FloatFast hessian = pGradientAndHessian[(iScore << 1) + 1];
+                  // DO NOT MULTIPLY hessian BY WEIGHT. WE PRE-MULTIPLIED WHEN WE ALLOCATED pGradientAndHessian
+                  pGradientPair->SetHess(pGradientPair->GetHess() + hessian);
+               }
+               ++iScore;
+            } while(cScores != iScore);
+            pGradientAndHessian += cFloatsPerSample;
+         }
+
+         *pPartnerUnpackData = unpackData;
+         ++pPartnerUnpackData;
+      } while(pPartnerUnpackDataEnd != pPartnerUnpackData);
+
+      pBlockGradientAndHessian += cFloatsPerSample * cBlockSamples;
+      if(bWeight) {
+         pBlockWeight += cBlockSamples;
+      }
+      cSamplesRemaining -= cBlockSamples;
+   } while(size_t { 0 } != cSamplesRemaining);
+
+   free(aUnpackData);
+   return Error_None;
+}
+
+
+template<ptrdiff_t cCompilerClasses>
+INLINE_RELEASE_TEMPLATED static ErrorEbm FusedFinalOptions(BinSumsInteractionFusedBridge * const pParams) {
+   if(nullptr != pParams->m_aWeights) {
+      static constexpr bool bWeight = true;
+      return BinSumsInteractionFusedInternal<cCompilerClasses, bWeight>(pParams);
+   } else {
+      static constexpr bool bWeight = false;
+      return BinSumsInteractionFusedInternal<cCompilerClasses, bWeight>(pParams);
+   }
+}
+
+
+template<ptrdiff_t cPossibleClasses>
+struct FusedCountClasses final {
+   INLINE_RELEASE_UNTEMPLATED static ErrorEbm Func(BinSumsInteractionFusedBridge * const pParams) {
+      if(cPossibleClasses == pParams->m_cClasses) {
+         return FusedFinalOptions<cPossibleClasses>(pParams);
+      } else {
+         return FusedCountClasses<cPossibleClasses + 1>::Func(pParams);
+      }
+   }
+};
+template<>
+struct FusedCountClasses<k_cCompilerClassesMax + 1> final {
+   INLINE_RELEASE_UNTEMPLATED static ErrorEbm Func(BinSumsInteractionFusedBridge * const pParams) {
+      return FusedFinalOptions<k_dynamicClassification>(pParams);
+   }
+};
+
+
+extern ErrorEbm BinSumsInteractionFused(BinSumsInteractionFusedBridge * const pParams) {
+   LOG_0(Trace_Verbose, "Entered BinSumsInteractionFused");
+
+   ErrorEbm error;
+
+   if(IsClassification(pParams->m_cClasses)) {
+      error = FusedCountClasses<2>::Func(pParams);
+   } else {
+      EBM_ASSERT(IsRegression(pParams->m_cClasses));
+      error = FusedFinalOptions<k_regression>(pParams);
+   }
+
+   LOG_0(Trace_Verbose, "Exited BinSumsInteractionFused");
+
+   return error;
+}
+
 } // DEFINED_ZONE_NAME
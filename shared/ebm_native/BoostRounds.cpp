@@ -0,0 +1,250 @@
+// Copyright (c) 2018 Microsoft Corporation
+// Licensed under the MIT license.
+// Author: Paul Koch <code@koch.ninja>
+
+#include "precompiled_header_cpp.hpp"
+
+#include <stddef.h> // size_t, ptrdiff_t
+#include <limits> // std::numeric_limits
+#include <cmath> // std::fabs, std::isinf
+
+#include "ebm_native.h"
+#include "logging.h"
+#include "common_c.h" // LIKELY
+#include "zones.h"
+
+#include "common_cpp.hpp" // k_cDimensionsMax, IsConvertError
+
+#include "Feature.hpp"
+#include "Term.hpp"
+#include "Tensor.hpp"
+#include "BoosterCore.hpp"
+#include "BoosterShell.hpp"
+
+namespace DEFINED_ZONE_NAME {
+#ifndef DEFINED_ZONE_NAME
+#error DEFINED_ZONE_NAME must be defined
+#endif // DEFINED_ZONE_NAME
+
+static int g_cLogBoostRounds = 10;
+
+// BoostRounds runs complete cyclic rounds over all the terms of the booster, where each step is a call to
+// GenerateTermUpdate followed by ApplyTermUpdate.  The early stopping state is passed in and out so that our
+// caller can boost in chunks of rounds (for logging or interruption) and get identical results to boosting
+// all the rounds in a single call.  minMetric is the lowest validation metric seen so far, and each round either
+// improves or not. Boosting stops once earlyStoppingRounds consecutive rounds have not improved. Negative 
+// earlyStoppingRounds disables early stopping.  The tolerance is either absolute, or relative to the magnitude of
+// the metric being compared against.
+//
+// If earlyStoppingWindow is zero we use the original breakpoint rule:
+//   - breakpointMetric is captured from minMetric at the start of each run of rounds without improvement
+//   - a round improves if minMetric + tolerance < breakpointMetric
+// This rule compares against a baseline that is only reset when a run of rounds without improvement ends, so 
+// slow steady progress can keep resetting it long after the model has effectively converged.
+//
+// If earlyStoppingWindow is positive we use a windowed rule instead:
+//   - a round improves if minMetric improved by more than the tolerance over the last earlyStoppingWindow rounds
+//   - windowMetrics is a circular buffer holding the minMetric of the last earlyStoppingWindow rounds, which
+//     makes each check O(1).  Our caller initializes it to +infinity, so the first earlyStoppingWindow rounds
+//     always improve
+EBM_API_BODY ErrorEbm EBM_CALLING_CONVENTION BoostRounds(
+   void * rng,
+   BoosterHandle boosterHandle,
+   IntEbm countRounds,
+   BoostFlags flags,
+   double learningRate,
+   IntEbm minSamplesLeaf,
+   IntEbm leavesMax,
+   IntEbm earlyStoppingRounds,
+   double earlyStoppingTolerance,
+   BoolEbm isRelativeTolerance,
+   IntEbm earlyStoppingWindow,
+   double * windowMetricsInOut,
+   IntEbm * roundIndexInOut,
+   double * minMetricInOut,
+   double * breakpointMetricInOut,
+   IntEbm * noChangeRunLengthInOut,
+   BoolEbm * isStoppedOut
+) {
+   LOG_COUNTED_N(
+      &g_cLogBoostRounds,
+      Trace_Info,
+      Trace_Verbose,
+      "BoostRounds: "
+      "rng=%p, "
+      "boosterHandle=%p, "
+      "countRounds=%" IntEbmPrintf ", "
+      "flags=0x%" UBoostFlagsPrintf ", "
+      "learningRate=%le, "
+      "minSamplesLeaf=%" IntEbmPrintf ", "
+      "leavesMax=%" IntEbmPrintf ", "
+      "earlyStoppingRounds=%" IntEbmPrintf ", "
+      "earlyStoppingTolerance=%le, "
+      "isRelativeTolerance=%" BoolEbmPrintf ", "
+      "earlyStoppingWindow=%" IntEbmPrintf ", "
+      "windowMetricsInOut=%p, "
+      "roundIndexInOut=%p, "
+      "minMetricInOut=%p, "
+      "breakpointMetricInOut=%p, "
+      "noChangeRunLengthInOut=%p, "
+      "isStoppedOut=%p"
+      ,
+      rng,
+      static_cast<void *>(boosterHandle),
+      countRounds,
+      static_cast<UBoostFlags>(flags), // signed to unsigned conversion is defined behavior in C++
+      learningRate,
+      minSamplesLeaf,
+      leavesMax,
+      earlyStoppingRounds,
+      earlyStoppingTolerance,
+      isRelativeTolerance,
+      earlyStoppingWindow,
+      static_cast<void *>(windowMetricsInOut),
+      static_cast<void *>(roundIndexInOut),
+      static_cast<void *>(minMetricInOut),
+      static_cast<void *>(breakpointMetricInOut),
+      static_cast<void *>(noChangeRunLengthInOut),
+      static_cast<void *>(isStoppedOut)
+   );
+
+   if(LIKELY(nullptr != isStoppedOut)) {
+      *isStoppedOut = EBM_FALSE;
+   }
+
+   BoosterShell * const pBoosterShell = BoosterShell::GetBoosterShellFromHandle(boosterHandle);
+   if(nullptr == pBoosterShell) {
+      // already logged
+      return Error_IllegalParamVal;
+   }
+
+   if(countRounds < IntEbm { 0 }) {
+      LOG_0(Trace_Error, "ERROR BoostRounds countRounds must be non-negative");
+      return Error_IllegalParamVal;
+   }
+
+   if(earlyStoppingWindow < IntEbm { 0 }) {
+      LOG_0(Trace_Error, "ERROR BoostRounds earlyStoppingWindow must be non-negative");
+      return Error_IllegalParamVal;
+   }
+
+   if(IsConvertError<size_t>(earlyStoppingWindow)) {
+      LOG_0(Trace_Error, "ERROR BoostRounds IsConvertError<size_t>(earlyStoppingWindow)");
+      return Error_IllegalParamVal;
+   }
+   const size_t cWindow = static_cast<size_t>(earlyStoppingWindow);
+
+   if(size_t { 0 } != cWindow && nullptr == windowMetricsInOut) {
+      LOG_0(Trace_Error, "ERROR BoostRounds windowMetricsInOut cannot be nullptr when earlyStoppingWindow is positive");
+      return Error_IllegalParamVal;
+   }
+
+   if(nullptr == roundIndexInOut || nullptr == minMetricInOut || nullptr == breakpointMetricInOut || nullptr == noChangeRunLengthInOut) {
+      LOG_0(Trace_Error, "ERROR BoostRounds roundIndexInOut, minMetricInOut, breakpointMetricInOut, and noChangeRunLengthInOut cannot be nullptr");
+      return Error_IllegalParamVal;
+   }
+
+   if(*roundIndexInOut < IntEbm { 0 } || IsConvertError<size_t>(*roundIndexInOut)) {
+      LOG_0(Trace_Error, "ERROR BoostRounds *roundIndexInOut must be non-negative");
+      return Error_IllegalParamVal;
+   }
+
+   BoosterCore * const pBoosterCore = pBoosterShell->GetBoosterCore();
+   EBM_ASSERT(nullptr != pBoosterCore);
+   const size_t cTerms = pBoosterCore->GetCountTerms();
+
+   // GenerateTermUpdate takes the maximum leaves per dimension.  We apply the same maximum to all of them
+   IntEbm aLeavesMax[k_cDimensionsMax];
+   for(size_t iDimension = 0; iDimension < k_cDimensionsMax; ++iDimension) {
+      aLeavesMax[iDimension] = leavesMax;
+   }
+
+   size_t iRound = static_cast<size_t>(*roundIndexInOut);
+   // keep the circular buffer position separately to avoid a division per round
+   size_t iWindow = size_t { 0 } == cWindow ? size_t { 0 } : iRound % cWindow;
+   double minMetric = *minMetricInOut;
+   double breakpointMetric = *breakpointMetricInOut;
+   IntEbm noChangeRunLength = *noChangeRunLengthInOut;
+
+   ErrorEbm error = Error_None;
+   BoolEbm isStopped = EBM_FALSE;
+   for(IntEbm cRoundsRemaining = countRounds; IntEbm { 0 } != cRoundsRemaining; --cRoundsRemaining) {
+      for(size_t iTerm = 0; iTerm < cTerms; ++iTerm) {
+         double avgGain;
+         error = GenerateTermUpdate(
+            rng,
+            boosterHandle,
+            static_cast<IntEbm>(iTerm),
+            flags,
+            learningRate,
+            minSamplesLeaf,
+            aLeavesMax,
+            &avgGain
+         );
+         if(Error_None != error) {
+            // already logged
+            goto exit_boosting;
+         }
+
+         double validationMetric;
+         error = ApplyTermUpdate(boosterHandle, &validationMetric);
+         if(Error_None != error) {
+            // already logged
+            goto exit_boosting;
+         }
+
+         // written this way to match python's min(validationMetric, minMetric), including its handling of NaN
+         if(!(minMetric < validationMetric)) {
+            minMetric = validationMetric;
+         }
+      }
+      ++iRound;
+
+      bool bImproved;
+      if(size_t { 0 } == cWindow) {
+         if(IntEbm { 0 } == noChangeRunLength) {
+            breakpointMetric = minMetric;
+         }
+         const double tolerance = EBM_FALSE != isRelativeTolerance ? 
+            earlyStoppingTolerance * std::fabs(breakpointMetric) : earlyStoppingTolerance;
+         bImproved = minMetric + tolerance < breakpointMetric;
+      } else {
+         const double windowStartMetric = windowMetricsInOut[iWindow];
+         windowMetricsInOut[iWindow] = minMetric;
+         ++iWindow;
+         if(cWindow == iWindow) {
+            iWindow = 0;
+         }
+         // breakpointMetric holds the start of the window purely for our caller's logging
+         breakpointMetric = windowStartMetric;
+         const double tolerance = EBM_FALSE != isRelativeTolerance ? 
+            earlyStoppingTolerance * std::fabs(windowStartMetric) : earlyStoppingTolerance;
+         // until the window is full the start metric is +infinity, which always counts as an improvement
+         bImproved = std::isinf(windowStartMetric) || minMetric + tolerance < windowStartMetric;
+      }
+
+      if(bImproved) {
+         noChangeRunLength = 0;
+      } else {
+         ++noChangeRunLength;
+      }
+
+      if(IntEbm { 0 } <= earlyStoppingRounds && earlyStoppingRounds <= noChangeRunLength) {
+         isStopped = EBM_TRUE;
+         break;
+      }
+   }
+
+exit_boosting:;
+
+   *roundIndexInOut = static_cast<IntEbm>(iRound);
+   *minMetricInOut = minMetric;
+   *breakpointMetricInOut = breakpointMetric;
+   *noChangeRunLengthInOut = noChangeRunLength;
+   if(LIKELY(nullptr != isStoppedOut)) {
+      *isStoppedOut = isStopped;
+   }
+   return error;
+}
+
+} // DEFINED_ZONE_NAME
@@ -58,6 +58,171 @@ extern double PartitionTwoDimensionalInteraction(
 // race then it just doesn't get decremented as quickly, which we can live with
 static int g_cLogCalcInteractionStrength = 10;
 
+// CalcInteractionStrengthFromFastBins takes the fast bins of a term after the gradients have been summed into them 
+// and calculates the interaction strength.  It is shared with CalcInteractionStrengths, which sums the fast bins
+// of many pairs in a single pass over the data
+extern ErrorEbm CalcInteractionStrengthFromFastBins(
+   InteractionShell * const pInteractionShell,
+   const size_t cDimensions,
+   const size_t * const acBins,
+   const size_t cTensorBins,
+   const size_t cAuxillaryBinsForBuildFastTotals,
+   const InteractionFlags flags,
+   const size_t cSamplesLeafMin,
+   const BinBase * const aFastBins,
+   double * const avgInteractionStrengthOut
+) {
+   InteractionCore * const pInteractionCore = pInteractionShell->GetInteractionCore();
+   const DataSetInteraction * const pDataSet = pInteractionCore->GetDataSetInteraction();
+   EBM_ASSERT(nullptr != pDataSet);
+
+   const ptrdiff_t cClasses = pInteractionCore->GetCountClasses();
+   const bool bClassification = IsClassification(cClasses);
+   const size_t cScores = GetCountScores(cClasses);
+
+   EBM_ASSERT(!IsOverflowBinSize<FloatFast>(bClassification, cScores)); // checked in CreateInteractionDetector
+   const size_t cBytesPerFastBin = GetBinSize<FloatFast>(bClassification, cScores);
+
+   static constexpr size_t cAuxillaryBinsForSplitting = 4;
+   const size_t cAuxillaryBins = EbmMax(cAuxillaryBinsForBuildFastTotals, cAuxillaryBinsForSplitting);
+   
+   if(IsAddError(cTensorBins, cAuxillaryBins)) {
+      LOG_0(Trace_Warning, "WARNING CalcInteractionStrength IsAddError(cTensorBins, cAuxillaryBins)");
+      return Error_OutOfMemory;
+   }
+   const size_t cTotalBigBins = cTensorBins + cAuxillaryBins;
+
+   EBM_ASSERT(!IsOverflowBinSize<FloatBig>(bClassification, cScores)); // checked in CreateInteractionDetector
+   const size_t cBytesPerBigBin = GetBinSize<FloatBig>(bClassification, cScores);
+   if(IsMultiplyError(cBytesPerBigBin, cTotalBigBins)) {
+      LOG_0(Trace_Warning, "WARNING CalcInteractionStrength IsMultiplyError(cBytesPerBin, cTotalBigBins)");
+      return Error_OutOfMemory;
+   }
+
+   BinBase * const aBigBins = pInteractionShell->GetInteractionBigBins(cBytesPerBigBin, cTotalBigBins);
+   if(UNLIKELY(nullptr == aBigBins)) {
+      // already logged
+      return Error_OutOfMemory;
+   }
+
+#ifndef NDEBUG
+   const auto * const pDebugBigBinsEnd = IndexBin(aBigBins, cBytesPerBigBin * cTotalBigBins);
+#endif // NDEBUG
+
+   // TODO: put this into it's own function that converts our fast floats to big floats
+   EBM_ASSERT(cBytesPerBigBin == cBytesPerFastBin);
+   memcpy(aBigBins, aFastBins, cBytesPerFastBin * cTensorBins);
+
+
+
+   // TODO: we can exit here back to python to allow caller modification to our bins
+
+
+
+#ifndef NDEBUG
+   // make a copy of the original bins for debugging purposes
+
+   BinBase * aDebugCopyBins = nullptr;
+   if(!IsMultiplyError(cBytesPerBigBin, cTensorBins)) {
+      ANALYSIS_ASSERT(0 != cBytesPerBigBin);
+      aDebugCopyBins = static_cast<BinBase *>(malloc(cBytesPerBigBin * cTensorBins));
+      if(nullptr != aDebugCopyBins) {
+         // if we can't allocate, don't fail.. just stop checking
+         memcpy(aDebugCopyBins, aBigBins, cTensorBins * cBytesPerBigBin);
+      }
+   }
+#endif // NDEBUG
+
+   BinBase * aAuxiliaryBins = IndexBin(aBigBins, cBytesPerBigBin * cTensorBins);
+   aAuxiliaryBins->ZeroMem(cBytesPerBigBin, cAuxillaryBins);
+
+   TensorTotalsBuild(
+      cClasses,
+      cDimensions,
+      acBins,
+      aAuxiliaryBins,
+      aBigBins
+#ifndef NDEBUG
+      , aDebugCopyBins
+      , pDebugBigBinsEnd
+#endif // NDEBUG
+   );
+
+   if(2 == cDimensions) {
+      LOG_0(Trace_Verbose, "CalcInteractionStrength Starting bin sweep loop");
+
+      double bestGain = PartitionTwoDimensionalInteraction(
+         pInteractionCore,
+         cDimensions,
+         acBins,
+         flags,
+         cSamplesLeafMin,
+         aAuxiliaryBins,
+         aBigBins
+#ifndef NDEBUG
+         , aDebugCopyBins
+         , pDebugBigBinsEnd
+#endif // NDEBUG
+      );
+
+      // if totalWeight < 1 then bestGain could overflow to +inf, so do the division first
+      const double totalWeight = static_cast<double>(pDataSet->GetWeightTotal());
+      EBM_ASSERT(0 < totalWeight); // if all are zeros we assume there are no weights and use the count
+      bestGain /= totalWeight;
+
+      if(UNLIKELY(/* NaN */ !LIKELY(bestGain <= std::numeric_limits<double>::max()))) {
+         // We simplify our caller's handling by returning -lowest as our error indicator. -lowest will sort to being the
+         // least important item, which is good, but it also signals an overflow without the weirness of NaNs.
+         EBM_ASSERT(std::isnan(bestGain) || std::numeric_limits<double>::infinity() == bestGain);
+         bestGain = k_illegalGainDouble;
+      } else if(UNLIKELY(bestGain < 0)) {
+         // gain can't mathematically be legally negative, but it can be here in the following situations:
+         //   1) for impure interaction gain we subtract the parent partial gain, and there can be floating point
+         //      noise that makes this slightly negative
+         //   2) for impure interaction gain we subtract the parent partial gain, but if there were no legal cuts
+         //      then the partial gain before subtracting the parent partial gain was zero and we then get a 
+         //      substantially negative value.  In this case we should not have subtracted the parent partial gain
+         //      since we had never even calculated the 4 quadrant partial gain, but we handle this scenario 
+         //      here instead of inside the templated function.
+
+         EBM_ASSERT(!std::isnan(bestGain));
+         EBM_ASSERT(std::numeric_limits<double>::infinity() != bestGain);
+         bestGain = std::numeric_limits<double>::lowest() <= bestGain ? 0.0 : k_illegalGainDouble;
+      } else {
+         EBM_ASSERT(!std::isnan(bestGain));
+         EBM_ASSERT(!std::isinf(bestGain));
+      }
+
+      if(nullptr != avgInteractionStrengthOut) {
+         *avgInteractionStrengthOut = bestGain;
+      }
+
+      EBM_ASSERT(k_illegalGainDouble == bestGain || double { 0 } <= bestGain);
+      LOG_COUNTED_N(
+         pInteractionShell->GetPointerCountLogExitMessages(),
+         Trace_Info,
+         Trace_Verbose,
+         "Exited CalcInteractionStrength: "
+         "bestGain=%le"
+         ,
+         bestGain
+      );
+   } else {
+      LOG_0(Trace_Warning, "WARNING CalcInteractionStrength We only support pairs for interaction detection currently");
+
+      // TODO: handle interaction detection for higher dimensions
+
+      // for now, just return any interactions that have other than 2 dimensions as k_illegalGainDouble, 
+      // which means they won't be considered but indicates they were not handled
+   }
+
+#ifndef NDEBUG
+   free(aDebugCopyBins);
+#endif // NDEBUG
+
+   return Error_None;
+}
+
 EBM_API_BODY ErrorEbm EBM_CALLING_CONVENTION CalcInteractionStrength(
    InteractionHandle interactionHandle,
    IntEbm countDimensions,
@@ -273,144 +438,17 @@ EBM_API_BODY ErrorEbm EBM_CALLING_CONVENTION CalcInteractionStrength(
       return error;
    }
 
-   static constexpr size_t cAuxillaryBinsForSplitting = 4;
-   const size_t cAuxillaryBins = EbmMax(cAuxillaryBinsForBuildFastTotals, cAuxillaryBinsForSplitting);
-   
-   if(IsAddError(cTensorBins, cAuxillaryBins)) {
-      LOG_0(Trace_Warning, "WARNING CalcInteractionStrength IsAddError(cTensorBins, cAuxillaryBins)");
-      return Error_OutOfMemory;
-   }
-   const size_t cTotalBigBins = cTensorBins + cAuxillaryBins;
-
-   EBM_ASSERT(!IsOverflowBinSize<FloatBig>(bClassification, cScores)); // checked in CreateInteractionDetector
-   const size_t cBytesPerBigBin = GetBinSize<FloatBig>(bClassification, cScores);
-   if(IsMultiplyError(cBytesPerBigBin, cTotalBigBins)) {
-      LOG_0(Trace_Warning, "WARNING CalcInteractionStrength IsMultiplyError(cBytesPerBin, cTotalBigBins)");
-      return Error_OutOfMemory;
-   }
-
-   BinBase * const aBigBins = pInteractionShell->GetInteractionBigBins(cBytesPerBigBin, cTotalBigBins);
-   if(UNLIKELY(nullptr == aBigBins)) {
-      // already logged
-      return Error_OutOfMemory;
-   }
-
-#ifndef NDEBUG
-   const auto * const pDebugBigBinsEnd = IndexBin(aBigBins, cBytesPerBigBin * cTotalBigBins);
-#endif // NDEBUG
-
-   // TODO: put this into it's own function that converts our fast floats to big floats
-   EBM_ASSERT(cBytesPerBigBin == cBytesPerFastBin);
-   memcpy(aBigBins, aFastBins, cBytesPerFastBin * cTensorBins);
-
-
-
-   // TODO: we can exit here back to python to allow caller modification to our bins
-
-
-
-#ifndef NDEBUG
-   // make a copy of the original bins for debugging purposes
-
-   BinBase * aDebugCopyBins = nullptr;
-   if(!IsMultiplyError(cBytesPerBigBin, cTensorBins)) {
-      ANALYSIS_ASSERT(0 != cBytesPerBigBin);
-      aDebugCopyBins = static_cast<BinBase *>(malloc(cBytesPerBigBin * cTensorBins));
-      if(nullptr != aDebugCopyBins) {
-         // if we can't allocate, don't fail.. just stop checking
-         memcpy(aDebugCopyBins, aBigBins, cTensorBins * cBytesPerBigBin);
-      }
-   }
-#endif // NDEBUG
-
-   BinBase * aAuxiliaryBins = IndexBin(aBigBins, cBytesPerBigBin * cTensorBins);
-   aAuxiliaryBins->ZeroMem(cBytesPerBigBin, cAuxillaryBins);
-
-   TensorTotalsBuild(
-      cClasses,
+   return CalcInteractionStrengthFromFastBins(
+      pInteractionShell,
       cDimensions,
       binSums.m_acBins,
-      aAuxiliaryBins,
-      aBigBins
-#ifndef NDEBUG
-      , aDebugCopyBins
-      , pDebugBigBinsEnd
-#endif // NDEBUG
+      cTensorBins,
+      cAuxillaryBinsForBuildFastTotals,
+      flags,
+      cSamplesLeafMin,
+      aFastBins,
+      avgInteractionStrengthOut
    );
-
-   if(2 == cDimensions) {
-      LOG_0(Trace_Verbose, "CalcInteractionStrength Starting bin sweep loop");
-
-      double bestGain = PartitionTwoDimensionalInteraction(
-         pInteractionCore,
-         cDimensions,
-         binSums.m_acBins,
-         flags,
-         cSamplesLeafMin,
-         aAuxiliaryBins,
-         aBigBins
-#ifndef NDEBUG
-         , aDebugCopyBins
-         , pDebugBigBinsEnd
-#endif // NDEBUG
-      );
-
-      // if totalWeight < 1 then bestGain could overflow to +inf, so do the division first
-      const double totalWeight = static_cast<double>(pDataSet->GetWeightTotal());
-      EBM_ASSERT(0 < totalWeight); // if all are zeros we assume there are no weights and use the count
-      bestGain /= totalWeight;
-
-      if(UNLIKELY(/* NaN */ !LIKELY(bestGain <= std::numeric_limits<double>::max()))) {
-         // We simplify our caller's handling by returning -lowest as our error indicator. -lowest will sort to being the
-         // least important item, which is good, but it also signals an overflow without the weirness of NaNs.
-         EBM_ASSERT(std::isnan(bestGain) || std::numeric_limits<double>::infinity() == bestGain);
-         bestGain = k_illegalGainDouble;
-      } else if(UNLIKELY(bestGain < 0)) {
-         // gain can't mathematically be legally negative, but it can be here in the following situations:
-         //   1) for impure interaction gain we subtract the parent partial gain, and there can be floating point
-         //      noise that makes this slightly negative
-         //   2) for impure interaction gain we subtract the parent partial gain, but if there were no legal cuts
-         //      then the partial gain before subtracting the parent partial gain was zero and we then get a 
-         //      substantially negative value.  In this case we should not have subtracted the parent partial gain
-         //      since we had never even calculated the 4 quadrant partial gain, but we handle this scenario 
-         //      here instead of inside the templated function.
-
-         EBM_ASSERT(!std::isnan(bestGain));
-         EBM_ASSERT(std::numeric_limits<double>::infinity() != bestGain);
-         bestGain = std::numeric_limits<double>::lowest() <= bestGain ? 0.0 : k_illegalGainDouble;
-      } else {
-         EBM_ASSERT(!std::isnan(bestGain));
-         EBM_ASSERT(!std::isinf(bestGain));
-      }
-
-      if(nullptr != avgInteractionStrengthOut) {
-         *avgInteractionStrengthOut = bestGain;
-      }
-
-      EBM_ASSERT(k_illegalGainDouble == bestGain || double { 0 } <= bestGain);
-      LOG_COUNTED_N(
-         pInteractionShell->GetPointerCountLogExitMessages(),
-         Trace_Info,
-         Trace_Verbose,
-         "Exited CalcInteractionStrength: "
-         "bestGain=%le"
-         ,
-         bestGain
-      );
-   } else {
-      LOG_0(Trace_Warning, "WARNING CalcInteractionStrength We only support pairs for interaction detection currently");
-
-      // TODO: handle interaction detection for higher dimensions
-
-      // for now, just return any interactions that have other than 2 dimensions as k_illegalGainDouble, 
-      // which means they won't be considered but indicates they were not handled
-   }
-
-#ifndef NDEBUG
-   free(aDebugCopyBins);
-#endif // NDEBUG
-
-   return Error_None;
 }
 
 } // DEFINED_ZONE_NAME
@@ -0,0 +1,353 @@
+// Copyright (c) 2018 Microsoft Corporation
+// Licensed under the MIT license.
+// Author: Paul Koch <code@koch.ninja>
+
+#include "precompiled_header_cpp.hpp"
+
+#include <stddef.h> // size_t, ptrdiff_t
+#include <stdlib.h> // malloc, free
+#include <limits> // numeric_limits
+
+#include "ebm_native.h"
+#include "logging.h"
+#include "common_c.h" // LIKELY
+#include "zones.h"
+
+#include "common_cpp.hpp" // IsConvertError, IsMultiplyError
+#include "bridge_cpp.hpp" // BinSumsInteractionFusedBridge
+
+#include "ebm_internal.hpp" // GetCountScores
+
+#include "Feature.hpp"
+#include "DataSetInteraction.hpp"
+#include "Bin.hpp" // GetBinSize
+#include "InteractionCore.hpp"
+#include "InteractionShell.hpp"
+
+namespace DEFINED_ZONE_NAME {
+#ifndef DEFINED_ZONE_NAME
+#error DEFINED_ZONE_NAME must be defined
+#endif // DEFINED_ZONE_NAME
+
+extern ErrorEbm BinSumsInteractionFused(BinSumsInteractionFusedBridge * const pParams);
+
+extern ErrorEbm CalcInteractionStrengthFromFastBins(
+   InteractionShell * const pInteractionShell,
+   const size_t cDimensions,
+   const size_t * const acBins,
+   const size_t cTensorBins,
+   const size_t cAuxillaryBinsForBuildFastTotals,
+   const InteractionFlags flags,
+   const size_t cSamplesLeafMin,
+   const BinBase * const aFastBins,
+   double * const avgInteractionStrengthOut
+);
+
+static int g_cLogCalcInteractionStrengths = 10;
+
+// the pair tensors summed in a single pass over the data are limited to this many bytes in total.  The tensors
+// are written in a scattered order, so keeping them small enough to stay in the cache matters more than fusing
+// every partner of an anchor feature into the same pass
+static constexpr size_t k_cBytesFusedFastBinsMax = size_t { 1 } << 20;
+
+// returns the number of bins of the feature if it can be used in a fused pass, or zero otherwise.  Features
+// that cannot be fused are handled by CalcInteractionStrength, which handles and logs the unusual cases
+static size_t GetFusableCountBins(const InteractionCore * const pInteractionCore, const IntEbm indexFeature) {
+   if(indexFeature < IntEbm { 0 }) {
+      return 0;
+   }
+   if(static_cast<IntEbm>(pInteractionCore->GetCountFeatures()) <= indexFeature) {
+      return 0;
+   }
+   const size_t cBins = pInteractionCore->GetFeatures()[static_cast<size_t>(indexFeature)].GetCountBins();
+   return cBins <= size_t { 1 } ? size_t { 0 } : cBins;
+}
+
+// CalcFusedPairStrengths calculates the strengths of cTerms pairs that all share the same first feature (the anchor)
+// by summing the fast bins of all the pairs in a single pass over the data.  The gradients and hessians are then 
+// read from memory once for all the pairs instead of once for each pair.  Our caller has checked that the features
+// are legal and that the tensors do not overflow
+static ErrorEbm CalcFusedPairStrengths(
+   InteractionShell * const pInteractionShell,
+   const size_t cTerms,
+   const IntEbm * const featureIndexes,
+   const size_t cBytesFusedFastBins,
+   const InteractionFlags flags,
+   const size_t cSamplesLeafMin,
+   double * const avgInteractionStrengthsOut
+) {
+   EBM_ASSERT(size_t { 2 } <= cTerms);
+
+   InteractionCore * const pInteractionCore = pInteractionShell->GetInteractionCore();
+   const DataSetInteraction * const pDataSet = pInteractionCore->GetDataSetInteraction();
+   EBM_ASSERT(nullptr != pDataSet);
+   const FeatureInteraction * const aFeatures = pInteractionCore->GetFeatures();
+
+   const ptrdiff_t cClasses = pInteractionCore->GetCountClasses();
+   const bool bClassification = IsClassification(cClasses);
+   const size_t cScores = GetCountScores(cClasses);
+   EBM_ASSERT(!IsOverflowBinSize<FloatFast>(bClassification, cScores)); // checked in CreateInteractionDetector
+   const size_t cBytesPerFastBin = GetBinSize<FloatFast>(bClassification, cScores);
+
+   const size_t iAnchorFeature = static_cast<size_t>(featureIndexes[0]);
+   const FeatureInteraction * const pAnchorFeature = &aFeatures[iAnchorFeature];
+   const size_t cAnchorBins = pAnchorFeature->GetCountBins();
+
+   // our caller checked that cTerms pairs fit within k_cBytesFusedFastBinsMax, so these cannot overflow
+   const size_t cBytesPartnerArrays = sizeof(size_t) * 2 + sizeof(const StorageDataType *) + sizeof(BinBase *);
+   EBM_ASSERT(!IsMultiplyError(cBytesPartnerArrays, cTerms));
+   unsigned char * const aPartnerArrays = static_cast<unsigned char *>(malloc(cBytesPartnerArrays * cTerms));
+   if(nullptr == aPartnerArrays) {
+      LOG_0(Trace_Warning, "WARNING CalcFusedPairStrengths nullptr == aPartnerArrays");
+      return Error_OutOfMemory;
+   }
+   // put the pointers first so that they are aligned
+   const StorageDataType ** const aaPartnerPacked = reinterpret_cast<const StorageDataType **>(aPartnerArrays);
+   BinBase ** const aaPartnerFastBins = reinterpret_cast<BinBase **>(aPartnerArrays + sizeof(const StorageDataType *) * cTerms);
+   size_t * const acPartnerBins = reinterpret_cast<size_t *>(aPartnerArrays + (sizeof(const StorageDataType *) + sizeof(BinBase *)) * cTerms);
+   size_t * const acPartnerItemsPerBitPack = acPartnerBins + cTerms;
+
+   EBM_ASSERT(0 == cBytesFusedFastBins % cBytesPerFastBin);
+   BinBase * const aFastBins = static_cast<BinBase *>(malloc(cBytesFusedFastBins));
+   if(nullptr == aFastBins) {
+      LOG_0(Trace_Warning, "WARNING CalcFusedPairStrengths nullptr == aFastBins");
+      free(aPartnerArrays);
+      return Error_OutOfMemory;
+   }
+   aFastBins->ZeroMem(cBytesPerFastBin, cBytesFusedFastBins / cBytesPerFastBin);
+
+   unsigned char * pRawFastBins = reinterpret_cast<unsigned char *>(aFastBins);
+   for(size_t iTerm = 0; iTerm < cTerms; ++iTerm) {
+      EBM_ASSERT(featureIndexes[iTerm << 1] == featureIndexes[0]);
+      const size_t iPartnerFeature = static_cast<size_t>(featureIndexes[(iTerm << 1) + 1]);
+      const FeatureInteraction * const pPartnerFeature = &aFeatures[iPartnerFeature];
+      const size_t cPartnerBins = pPartnerFeature->GetCountBins();
+
+      EBM_ASSERT(1 <= pPartnerFeature->GetFeatureBitPack());
+      acPartnerBins[iTerm] = cPartnerBins;
+      acPartnerItemsPerBitPack[iTerm] = static_cast<size_t>(pPartnerFeature->GetFeatureBitPack());
+      aaPartnerPacked[iTerm] = pDataSet->GetInputDataPointer(iPartnerFeature);
+      aaPartnerFastBins[iTerm] = reinterpret_cast<BinBase *>(pRawFastBins);
+
+      pRawFastBins += cBytesPerFastBin * cAnchorBins * cPartnerBins;
+   }
+   EBM_ASSERT(reinterpret_cast<unsigned char *>(aFastBins) + cBytesFusedFastBins == pRawFastBins);
+
+   EBM_ASSERT(1 <= pAnchorFeature->GetFeatureBitPack());
+
+   BinSumsInteractionFusedBridge binSums;
+   binSums.m_cClasses = cClasses;
+   binSums.m_cSamples = pDataSet->GetCountSamples();
+   binSums.m_aGradientsAndHessians = pDataSet->GetGradientsAndHessiansPointer();
+   binSums.m_aWeights = pDataSet->GetWeights();
+   binSums.m_cAnchorBins = cAnchorBins;
+   binSums.m_cAnchorItemsPerBitPack = static_cast<size_t>(pAnchorFeature->GetFeatureBitPack());
+   binSums.m_aAnchorPacked = pDataSet->GetInputDataPointer(iAnchorFeature);
+   binSums.m_cPartners = cTerms;
+   binSums.m_acPartnerBins = acPartnerBins;
+   binSums.m_acPartnerItemsPerBitPack = acPartnerItemsPerBitPack;
+   binSums.m_aaPartnerPacked = aaPartnerPacked;
+   binSums.m_aaPartnerFastBins = aaPartnerFastBins;
+
+   ErrorEbm error = BinSumsInteractionFused(&binSums);
+   if(Error_None == error) {
+      for(size_t iTerm = 0; iTerm < cTerms; ++iTerm) {
+         const size_t acBins[] { cAnchorBins, acPartnerBins[iTerm] };
+         // TensorTotalsBuild needs one auxillary bin for the first dimension and cAnchorBins for the second
+         error = CalcInteractionStrengthFromFastBins(
+            pInteractionShell,
+            2,
+            acBins,
+            cAnchorBins * acPartnerBins[iTerm],
+            size_t { 1 } + cAnchorBins,
+            flags,
+            cSamplesLeafMin,
+            aaPartnerFastBins[iTerm],
+            &avgInteractionStrengthsOut[iTerm]
+         );
+         if(Error_None != error) {
+            // already logged
+            break;
+         }
+      }
+   }
+
+   free(aFastBins);
+   free(aPartnerArrays);
+   return error;
+}
+
+// CalcInteractionStrengths calculates the strengths of countTerms terms that each have countDimensions features.
+// featureIndexes holds the features of each term consecutively.  Calculating all the terms in one call avoids
+// re-entering from our caller for each term, which dominates the time of FAST when there are many features with
+// few bins.  Consecutive pairs that share their first feature have their bins summed in a single pass over the
+// data, so ordering the pairs by their first feature (as itertools.combinations does) reduces the memory traffic
+// by roughly the number of partners of each feature.  The strengths are identical to CalcInteractionStrength.
+EBM_API_BODY ErrorEbm EBM_CALLING_CONVENTION CalcInteractionStrengths(
+   InteractionHandle interactionHandle,
+   IntEbm countTerms,
+   IntEbm countDimensions,
+   const IntEbm * featureIndexes,
+   InteractionFlags flags,
+   IntEbm minSamplesLeaf,
+   double * avgInteractionStrengthsOut
+) {
+   LOG_COUNTED_N(
+      &g_cLogCalcInteractionStrengths,
+      Trace_Info,
+      Trace_Verbose,
+      "CalcInteractionStrengths: "
+      "interactionHandle=%p, "
+      "countTerms=%" IntEbmPrintf ", "
+      "countDimensions=%" IntEbmPrintf ", "
+      "featureIndexes=%p, "
+      "flags=0x%" UInteractionFlagsPrintf ", "
+      "minSamplesLeaf=%" IntEbmPrintf ", "
+      "avgInteractionStrengthsOut=%p"
+      ,
+      static_cast<void *>(interactionHandle),
+      countTerms,
+      countDimensions,
+      static_cast<const void *>(featureIndexes),
+      static_cast<UInteractionFlags>(flags), // signed to unsigned conversion is defined behavior in C++
+      minSamplesLeaf,
+      static_cast<void *>(avgInteractionStrengthsOut)
+   );
+
+   if(countTerms < IntEbm { 0 }) {
+      LOG_0(Trace_Error, "ERROR CalcInteractionStrengths countTerms must be non-negative");
+      return Error_IllegalParamVal;
+   }
+   if(IsConvertError<size_t>(countTerms)) {
+      LOG_0(Trace_Error, "ERROR CalcInteractionStrengths IsConvertError<size_t>(countTerms)");
+      return Error_IllegalParamVal;
+   }
+   const size_t cTerms = static_cast<size_t>(countTerms);
+
+   if(countDimensions < IntEbm { 0 }) {
+      LOG_0(Trace_Error, "ERROR CalcInteractionStrengths countDimensions must be non-negative");
+      return Error_IllegalParamVal;
+   }
+   if(IsConvertError<size_t>(countDimensions)) {
+      LOG_0(Trace_Error, "ERROR CalcInteractionStrengths IsConvertError<size_t>(countDimensions)");
+      return Error_IllegalParamVal;
+   }
+   const size_t cDimensions = static_cast<size_t>(countDimensions);
+
+   if(IsMultiplyError(cTerms, cDimensions)) {
+      LOG_0(Trace_Error, "ERROR CalcInteractionStrengths IsMultiplyError(cTerms, cDimensions)");
+      return Error_IllegalParamVal;
+   }
+
+   if(size_t { 0 } != cTerms) {
+      if(nullptr == avgInteractionStrengthsOut) {
+         LOG_0(Trace_Error, "ERROR CalcInteractionStrengths avgInteractionStrengthsOut cannot be nullptr if 0 < countTerms");
+         return Error_IllegalParamVal;
+      }
+      if(size_t { 0 } != cDimensions && nullptr == featureIndexes) {
+         LOG_0(Trace_Error, "ERROR CalcInteractionStrengths featureIndexes cannot be nullptr if 0 < countTerms and 0 < countDimensions");
+         return Error_IllegalParamVal;
+      }
+   }
+
+   if(size_t { 0 } == cTerms) {
+      return Error_None;
+   }
+
+   InteractionShell * const pInteractionShell = InteractionShell::GetInteractionShellFromHandle(interactionHandle);
+   if(nullptr == pInteractionShell) {
+      // already logged
+      return Error_IllegalParamVal;
+   }
+
+   InteractionCore * const pInteractionCore = pInteractionShell->GetInteractionCore();
+   const DataSetInteraction * const pDataSet = pInteractionCore->GetDataSetInteraction();
+   EBM_ASSERT(nullptr != pDataSet);
+
+   const ptrdiff_t cClasses = pInteractionCore->GetCountClasses();
+
+   // CalcInteractionStrength handles zero samples, mono-classification, and anything other than pairs
+   const bool bFusable = size_t { 2 } == cDimensions && size_t { 0 } != pDataSet->GetCountSamples() && 
+      ptrdiff_t { 1 } != cClasses;
+
+   size_t cBytesPerFastBin = 0;
+   if(bFusable) {
+      const bool bClassification = IsClassification(cClasses);
+      const size_t cScores = GetCountScores(cClasses);
+      EBM_ASSERT(!IsOverflowBinSize<FloatFast>(bClassification, cScores)); // checked in CreateInteractionDetector
+      cBytesPerFastBin = GetBinSize<FloatFast>(bClassification, cScores);
+   }
+
+   size_t cSamplesLeafMin = size_t { 1 }; // this is the min value
+   if(IntEbm { 1 } <= minSamplesLeaf) {
+      cSamplesLeafMin = static_cast<size_t>(minSamplesLeaf);
+      if(IsConvertError<size_t>(minSamplesLeaf)) {
+         cSamplesLeafMin = std::numeric_limits<size_t>::max();
+      }
+   }
+
+   ErrorEbm error;
+   size_t iTerm = 0;
+   do {
+      const IntEbm * const pTermFeatures = &featureIndexes[iTerm * cDimensions];
+
+      size_t cGroupTerms = 0;
+      size_t cBytesGroup = 0;
+      if(bFusable) {
+         const size_t cAnchorBins = GetFusableCountBins(pInteractionCore, pTermFeatures[0]);
+         if(size_t { 0 } != cAnchorBins) {
+            while(cTerms != iTerm + cGroupTerms) {
+               const IntEbm * const pGroupTermFeatures = &pTermFeatures[cGroupTerms << 1];
+               if(pTermFeatures[0] != pGroupTermFeatures[0]) {
+                  break;
+               }
+               const size_t cPartnerBins = GetFusableCountBins(pInteractionCore, pGroupTermFeatures[1]);
+               if(size_t { 0 } == cPartnerBins) {
+                  break;
+               }
+               if(IsMultiplyError(cAnchorBins, cPartnerBins) || IsMultiplyError(cBytesPerFastBin, cAnchorBins * cPartnerBins)) {
+                  break;
+               }
+               const size_t cBytesTensor = cBytesPerFastBin * cAnchorBins * cPartnerBins;
+               if(k_cBytesFusedFastBinsMax < cBytesTensor || k_cBytesFusedFastBinsMax - cBytesTensor < cBytesGroup) {
+                  break;
+               }
+               cBytesGroup += cBytesTensor;
+               ++cGroupTerms;
+            }
+         }
+      }
+
+      if(cGroupTerms < size_t { 2 }) {
+         // there is nothing to share with a single pair, and unusual pairs are handled by CalcInteractionStrength
+         error = CalcInteractionStrength(
+            interactionHandle,
+            countDimensions,
+            pTermFeatures,
+            flags,
+            minSamplesLeaf,
+            &avgInteractionStrengthsOut[iTerm]
+         );
+         ++iTerm;
+      } else {
+         error = CalcFusedPairStrengths(
+            pInteractionShell,
+            cGroupTerms,
+            pTermFeatures,
+            cBytesGroup,
+            flags,
+            cSamplesLeafMin,
+            &avgInteractionStrengthsOut[iTerm]
+         );
+         iTerm += cGroupTerms;
+      }
+      if(Error_None != error) {
+         // already logged
+         return error;
+      }
+   } while(cTerms != iTerm);
+
+   return Error_None;
+}
+
+} // DEFINED_ZONE_NAME
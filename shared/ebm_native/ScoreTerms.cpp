@@ -0,0 +1,383 @@
+// Copyright (c) 2018 Microsoft Corporation
+// Licensed under the MIT license.
+// Author: Paul Koch <code@koch.ninja>
+
+#include "precompiled_header_cpp.hpp"
+
+#include <stddef.h> // size_t, ptrdiff_t
+#include <limits> // std::numeric_limits
+#include <algorithm> // std::min
+#include <thread> // std::thread
+#include <vector> // std::vector
+
+#include "ebm_native.h"
+#include "logging.h"
+#include "common_c.h" // LIKELY
+#include "zones.h"
+
+#include "common_cpp.hpp" // IsConvertError
+
+namespace DEFINED_ZONE_NAME {
+#ifndef DEFINED_ZONE_NAME
+#error DEFINED_ZONE_NAME must be defined
+#endif // DEFINED_ZONE_NAME
+
+// we process the samples in blocks so that the sample scores being accumulated into stay in the L1 cache
+// while we iterate through all the terms.  Each term's tensor is then walked once per block.
+static constexpr size_t k_cSamplesPerBlock = 512;
+
+// below this many samples per thread the cost of starting a thread exceeds the work done in it
+static constexpr size_t k_cMinSamplesPerThread = 4096;
+
+struct ScoreTermsParams final {
+   size_t m_cSamples;
+   size_t m_cScores;
+   size_t m_cTerms;
+   const IntEbm * m_aBinCounts;
+   const IntEbm * m_aBinIndexes;
+   const IntEbm * m_aDimensionCounts;
+   const IntEbm * m_aColumnIndexes;
+   const IntEbm * m_aStrides;
+   const IntEbm * m_aTermOffsets;
+   const double * m_aCellScores;
+   double * m_aSampleScores;
+   double * m_aTermScores;
+};
+
+static void ScoreTermsRange(
+   const ScoreTermsParams * const pParams,
+   const size_t iSampleStart,
+   const size_t iSampleEnd,
+   ErrorEbm * const pErrorOut
+) noexcept {
+   EBM_ASSERT(nullptr != pParams);
+   EBM_ASSERT(iSampleStart <= iSampleEnd);
+   EBM_ASSERT(nullptr != pErrorOut);
+
+   const size_t cSamples = pParams->m_cSamples;
+   const size_t cScores = pParams->m_cScores;
+   const size_t cTerms = pParams->m_cTerms;
+   const IntEbm * const aBinCounts = pParams->m_aBinCounts;
+
+   size_t iBlockStart = iSampleStart;
+   while(iBlockStart != iSampleEnd) {
+      const size_t iBlockEnd = iSampleEnd - iBlockStart < k_cSamplesPerBlock ? iSampleEnd : iBlockStart + k_cSamplesPerBlock;
+
+      const IntEbm * pColumnIndex = pParams->m_aColumnIndexes;
+      const IntEbm * pStride = pParams->m_aStrides;
+      for(size_t iTerm = 0; iTerm < cTerms; ++iTerm) {
+         const size_t cDimensions = static_cast<size_t>(pParams->m_aDimensionCounts[iTerm]);
+         const size_t iTermOffset = static_cast<size_t>(pParams->m_aTermOffsets[iTerm]);
+
+         for(size_t iSample = iBlockStart; iSample < iBlockEnd; ++iSample) {
+            size_t iCell = iTermOffset;
+            for(size_t iDimension = 0; iDimension < cDimensions; ++iDimension) {
+               const size_t iColumn = static_cast<size_t>(pColumnIndex[iDimension]);
+               const IntEbm iBin = pParams->m_aBinIndexes[iColumn * cSamples + iSample];
+               if(UNLIKELY(iBin < IntEbm { 0 } || aBinCounts[iColumn] <= iBin)) {
+                  *pErrorOut = Error_IllegalParamVal;
+                  return;
+               }
+               iCell += static_cast<size_t>(iBin) * static_cast<size_t>(pStride[iDimension]);
+            }
+
+            const double * const pCell = &pParams->m_aCellScores[iCell * cScores];
+            double * const pSampleScores = &pParams->m_aSampleScores[iSample * cScores];
+            if(nullptr == pParams->m_aTermScores) {
+               for(size_t iScore = 0; iScore < cScores; ++iScore) {
+                  pSampleScores[iScore] += pCell[iScore];
+               }
+            } else {
+               double * const pTermScores = &pParams->m_aTermScores[(iSample * cTerms + iTerm) * cScores];
+               for(size_t iScore = 0; iScore < cScores; ++iScore) {
+                  const double score = pCell[iScore];
+                  pSampleScores[iScore] += score;
+                  pTermScores[iScore] = score;
+               }
+            }
+         }
+
+         pColumnIndex += cDimensions;
+         pStride += cDimensions;
+      }
+
+      iBlockStart = iBlockEnd;
+   }
+}
+
+// don't bother using a lock here.  We don't care if an extra log message is written out due to thread parallism
+static int g_cLogEnterScoreTerms = 25;
+static int g_cLogExitScoreTerms = 25;
+
+EBM_API_BODY ErrorEbm EBM_CALLING_CONVENTION ScoreTerms(
+   IntEbm countSamples,
+   IntEbm countScores,
+   IntEbm countColumns,
+   const IntEbm * binCounts,
+   const IntEbm * binIndexes,
+   IntEbm countTerms,
+   const IntEbm * dimensionCounts,
+   const IntEbm * columnIndexes,
+   const IntEbm * strides,
+   const IntEbm * termOffsets,
+   IntEbm countCells,
+   const double * cellScores,
+   IntEbm countThreads,
+   double * sampleScoresInOut,
+   double * termScoresOut
+) {
+   // binIndexes is a C ordered matrix of shape (countColumns, countSamples) that holds the already discretized
+   // bin indexes of each distinct binned column, and binCounts holds the number of bins in each column.
+   // Unknown values need to have been mapped into the last bin before calling this function since negative
+   // bin indexes are rejected.
+   //
+   // Each term is described by dimensionCounts[iTerm] consecutive entries in columnIndexes and strides which give
+   // the binned column and the stride (in cells) of each dimension within the flattened tensor.  The flattened
+   // tensors of all terms are concatenated into cellScores, which has countCells * countScores items, and
+   // termOffsets gives the cell at which each term's tensor starts.
+   //
+   // sampleScoresInOut has countSamples * countScores items and is accumulated into, so the caller can
+   // initialize it with the intercept.  termScoresOut can be nullptr, otherwise it receives the per-term
+   // contributions in a (countSamples, countTerms, countScores) C ordered tensor.
+   //
+   // countThreads of zero or less uses the number of hardware threads.
+
+   LOG_COUNTED_N(
+      &g_cLogEnterScoreTerms,
+      Trace_Info,
+      Trace_Verbose,
+      "Entered ScoreTerms: "
+      "countSamples=%" IntEbmPrintf ", "
+      "countScores=%" IntEbmPrintf ", "
+      "countColumns=%" IntEbmPrintf ", "
+      "binCounts=%p, "
+      "binIndexes=%p, "
+      "countTerms=%" IntEbmPrintf ", "
+      "dimensionCounts=%p, "
+      "columnIndexes=%p, "
+      "strides=%p, "
+      "termOffsets=%p, "
+      "countCells=%" IntEbmPrintf ", "
+      "cellScores=%p, "
+      "countThreads=%" IntEbmPrintf ", "
+      "sampleScoresInOut=%p, "
+      "termScoresOut=%p"
+      ,
+      countSamples,
+      countScores,
+      countColumns,
+      static_cast<const void *>(binCounts),
+      static_cast<const void *>(binIndexes),
+      countTerms,
+      static_cast<const void *>(dimensionCounts),
+      static_cast<const void *>(columnIndexes),
+      static_cast<const void *>(strides),
+      static_cast<const void *>(termOffsets),
+      countCells,
+      static_cast<const void *>(cellScores),
+      countThreads,
+      static_cast<void *>(sampleScoresInOut),
+      static_cast<void *>(termScoresOut)
+   );
+
+   ErrorEbm error = Error_None;
+
+   ScoreTermsParams params;
+   size_t cThreads;
+
+   if(UNLIKELY(countSamples < IntEbm { 0 } || IsConvertError<size_t>(countSamples))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms countSamples must be a non-negative size");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+   if(UNLIKELY(countScores <= IntEbm { 0 } || IsConvertError<size_t>(countScores))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms countScores must be positive");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+   if(UNLIKELY(countColumns < IntEbm { 0 } || IsConvertError<size_t>(countColumns))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms countColumns must be a non-negative size");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+   if(UNLIKELY(countTerms < IntEbm { 0 } || IsConvertError<size_t>(countTerms))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms countTerms must be a non-negative size");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+   if(UNLIKELY(countCells < IntEbm { 0 } || IsConvertError<size_t>(countCells))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms countCells must be a non-negative size");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+
+   params.m_cSamples = static_cast<size_t>(countSamples);
+   params.m_cScores = static_cast<size_t>(countScores);
+   params.m_cTerms = static_cast<size_t>(countTerms);
+
+   if(size_t { 0 } == params.m_cSamples || size_t { 0 } == params.m_cTerms) {
+      goto exit_with_log;
+   }
+
+   if(UNLIKELY(nullptr == binCounts || nullptr == binIndexes || nullptr == dimensionCounts || nullptr == columnIndexes ||
+      nullptr == strides || nullptr == termOffsets || nullptr == cellScores || nullptr == sampleScoresInOut)) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms a required pointer is null");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+
+   if(UNLIKELY(IsMultiplyError(params.m_cSamples, static_cast<size_t>(countColumns), sizeof(*binIndexes)))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms binIndexes is too large to fit into memory");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+   if(UNLIKELY(IsMultiplyError(static_cast<size_t>(countCells), params.m_cScores, sizeof(*cellScores)))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms cellScores is too large to fit into memory");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+   if(UNLIKELY(IsMultiplyError(params.m_cSamples, params.m_cTerms, params.m_cScores, sizeof(*sampleScoresInOut)))) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms termScoresOut is too large to fit into memory");
+      error = Error_IllegalParamVal;
+      goto exit_with_log;
+   }
+
+   {
+      // validate the term descriptions once here so that the inner loops only need to check the bin indexes
+      for(IntEbm iColumn = 0; iColumn < countColumns; ++iColumn) {
+         if(UNLIKELY(binCounts[iColumn] <= IntEbm { 0 })) {
+            LOG_0(Trace_Error, "ERROR ScoreTerms binCounts must be positive");
+            error = Error_IllegalParamVal;
+            goto exit_with_log;
+         }
+      }
+
+      const IntEbm * pColumnIndex = columnIndexes;
+      const IntEbm * pStride = strides;
+      for(size_t iTerm = 0; iTerm < params.m_cTerms; ++iTerm) {
+         const IntEbm countDimensions = dimensionCounts[iTerm];
+         if(UNLIKELY(countDimensions <= IntEbm { 0 } || IsConvertError<size_t>(countDimensions))) {
+            LOG_0(Trace_Error, "ERROR ScoreTerms dimensionCounts must be positive");
+            error = Error_IllegalParamVal;
+            goto exit_with_log;
+         }
+         IntEbm iLastCell = termOffsets[iTerm];
+         if(UNLIKELY(iLastCell < IntEbm { 0 } || countCells <= iLastCell)) {
+            LOG_0(Trace_Error, "ERROR ScoreTerms termOffsets must index into cellScores");
+            error = Error_IllegalParamVal;
+            goto exit_with_log;
+         }
+         const IntEbm * const pColumnIndexEnd = pColumnIndex + static_cast<size_t>(countDimensions);
+         do {
+            if(UNLIKELY(*pColumnIndex < IntEbm { 0 } || countColumns <= *pColumnIndex)) {
+               LOG_0(Trace_Error, "ERROR ScoreTerms columnIndexes must index into binIndexes");
+               error = Error_IllegalParamVal;
+               goto exit_with_log;
+            }
+            const IntEbm stride = *pStride;
+            if(UNLIKELY(stride <= IntEbm { 0 } || countCells < stride)) {
+               LOG_0(Trace_Error, "ERROR ScoreTerms strides must be positive and within cellScores");
+               error = Error_IllegalParamVal;
+               goto exit_with_log;
+            }
+            const IntEbm iHighestBin = binCounts[*pColumnIndex] - IntEbm { 1 };
+            if(UNLIKELY(IntEbm { 0 } != iHighestBin && (countCells - iLastCell) / iHighestBin < stride)) {
+               LOG_0(Trace_Error, "ERROR ScoreTerms the tensor of a term extends beyond cellScores");
+               error = Error_IllegalParamVal;
+               goto exit_with_log;
+            }
+            iLastCell += iHighestBin * stride;
+            ++pStride;
+            ++pColumnIndex;
+         } while(pColumnIndexEnd != pColumnIndex);
+         if(UNLIKELY(countCells <= iLastCell)) {
+            LOG_0(Trace_Error, "ERROR ScoreTerms the tensor of a term extends beyond cellScores");
+            error = Error_IllegalParamVal;
+            goto exit_with_log;
+         }
+      }
+   }
+
+   params.m_aBinCounts = binCounts;
+   params.m_aBinIndexes = binIndexes;
+   params.m_aDimensionCounts = dimensionCounts;
+   params.m_aColumnIndexes = columnIndexes;
+   params.m_aStrides = strides;
+   params.m_aTermOffsets = termOffsets;
+   params.m_aCellScores = cellScores;
+   params.m_aSampleScores = sampleScoresInOut;
+   params.m_aTermScores = termScoresOut;
+
+   if(countThreads <= IntEbm { 0 }) {
+      cThreads = static_cast<size_t>(std::thread::hardware_concurrency());
+   } else {
+      cThreads = IsConvertError<size_t>(countThreads) ? std::numeric_limits<size_t>::max() : static_cast<size_t>(countThreads);
+   }
+   cThreads = std::min(cThreads, params.m_cSamples / k_cMinSamplesPerThread);
+   if(cThreads <= size_t { 1 }) {
+      ScoreTermsRange(&params, 0, params.m_cSamples, &error);
+   } else {
+      // the main thread processes the first range, so we start one less thread than the number of ranges
+      const size_t cSamplesPerThread = (params.m_cSamples + cThreads - size_t { 1 }) / cThreads;
+      std::vector<ErrorEbm> errors;
+      std::vector<std::thread> threads;
+      size_t iNextStart = cSamplesPerThread;
+      try {
+         errors.resize(cThreads, Error_None);
+         threads.reserve(cThreads - size_t { 1 });
+      } catch(...) {
+         LOG_0(Trace_Warning, "WARNING ScoreTerms out of memory allocating threads");
+         iNextStart = 0;
+      }
+
+      if(size_t { 0 } == iNextStart) {
+         // we could not allocate the thread bookkeeping, so do all the work on this thread
+         ScoreTermsRange(&params, 0, params.m_cSamples, &error);
+      } else {
+         try {
+            for(size_t iThread = 1; iThread < cThreads && iNextStart < params.m_cSamples; ++iThread) {
+               const size_t iEnd = params.m_cSamples - iNextStart < cSamplesPerThread ? params.m_cSamples : iNextStart + cSamplesPerThread;
+               threads.emplace_back(ScoreTermsRange, &params, iNextStart, iEnd, &errors[iThread]);
+               iNextStart = iEnd;
+            }
+         } catch(...) {
+            // if we could not start all the threads, the remaining samples get processed on this thread below
+            LOG_0(Trace_Warning, "WARNING ScoreTerms could not start all threads");
+         }
+
+         ScoreTermsRange(&params, 0, cSamplesPerThread, &errors[0]);
+         if(iNextStart < params.m_cSamples) {
+            ScoreTermsRange(&params, iNextStart, params.m_cSamples, &errors[0]);
+         }
+
+         for(std::thread & thread : threads) {
+            thread.join();
+         }
+         for(const ErrorEbm threadError : errors) {
+            if(Error_None != threadError) {
+               error = threadError;
+            }
+         }
+      }
+   }
+
+   if(Error_None != error) {
+      LOG_0(Trace_Error, "ERROR ScoreTerms binIndexes contained an index outside of the tensor");
+   }
+
+exit_with_log:;
+
+   LOG_COUNTED_N(
+      &g_cLogExitScoreTerms,
+      Trace_Info,
+      Trace_Verbose,
+      "Exited ScoreTerms: "
+      "return=%" ErrorEbmPrintf
+      ,
+      error
+   );
+
+   return error;
+}
+
+} // DEFINED_ZONE_NAME
@@ -138,6 +138,26 @@ struct BinSumsInteractionBridge {
 #endif // NDEBUG
 };
 
+struct BinSumsInteractionFusedBridge {
+   ptrdiff_t m_cClasses;
+
+   size_t m_cSamples;
+   const FloatFast * m_aGradientsAndHessians;
+   const FloatFast * m_aWeights;
+
+   // the anchor feature is the first dimension of every pair
+   size_t m_cAnchorBins;
+   size_t m_cAnchorItemsPerBitPack;
+   const StorageDataType * m_aAnchorPacked;
+
+   // the partner features are the second dimension, and each pair has its own tensor of fast bins
+   size_t m_cPartners;
+   const size_t * m_acPartnerBins;
+   const size_t * m_acPartnerItemsPerBitPack;
+   const StorageDataType * const * m_aaPartnerPacked;
+   BinBase * const * m_aaPartnerFastBins;
+};
+
 } // DEFINED_ZONE_NAME
 
 #endif // BRIDGE_CPP_HPP
\ No newline at end of file
@@ -0,0 +1,124 @@
+// Copyright (c) 2018 Microsoft Corporation
+// Licensed under the MIT license.
+// Author: Paul Koch <code@koch.ninja>
+
+#include "precompiled_header_test.hpp"
+
+#include "ebm_native.h"
+#include "ebm_native_test.hpp"
+
+static constexpr TestPriority k_filePriority = TestPriority::ScoreTerms;
+
+TEST_CASE("ScoreTerms, zero samples") {
+   ErrorEbm error;
+
+   UNUSED(testCaseHidden);
+   const IntEbm binCounts[] { 3 };
+   const IntEbm dimensionCounts[] { 1 };
+   const IntEbm columnIndexes[] { 0 };
+   const IntEbm strides[] { 1 };
+   const IntEbm termOffsets[] { 0 };
+   const double cellScores[] { 1, 2, 3 };
+
+   error = ScoreTerms(
+      0,
+      1,
+      1,
+      binCounts,
+      nullptr,
+      1,
+      dimensionCounts,
+      columnIndexes,
+      strides,
+      termOffsets,
+      3,
+      cellScores,
+      0,
+      nullptr,
+      nullptr
+   );
+   CHECK(Error_None == error);
+}
+
+TEST_CASE("ScoreTerms, main and pair") {
+   ErrorEbm error;
+
+   UNUSED(testCaseHidden);
+   static constexpr IntEbm cSamples = 4;
+   const IntEbm binCounts[] { 3, 2 };
+   const IntEbm binIndexes[] { 0, 1, 2, 2, 1, 0, 1, 0 };
+   const IntEbm dimensionCounts[] { 1, 2 };
+   const IntEbm columnIndexes[] { 0, 0, 1 };
+   const IntEbm strides[] { 1, 2, 1 };
+   const IntEbm termOffsets[] { 0, 3 };
+   const double cellScores[] { 1, 2, 3, 10, 20, 30, 40, 50, 60 };
+
+   double sampleScores[cSamples] { 0.5, 0.5, 0.5, 0.5 };
+   double termScores[cSamples * 2];
+
+   error = ScoreTerms(
+      cSamples,
+      1,
+      2,
+      binCounts,
+      binIndexes,
+      2,
+      dimensionCounts,
+      columnIndexes,
+      strides,
+      termOffsets,
+      9,
+      cellScores,
+      0,
+      sampleScores,
+      termScores
+   );
+   CHECK(Error_None == error);
+
+   CHECK(1 == termScores[0]);
+   CHECK(20 == termScores[1]);
+   CHECK(2 == termScores[2]);
+   CHECK(30 == termScores[3]);
+   CHECK(3 == termScores[4]);
+   CHECK(60 == termScores[5]);
+   CHECK(3 == termScores[6]);
+   CHECK(50 == termScores[7]);
+
+   CHECK(21.5 == sampleScores[0]);
+   CHECK(32.5 == sampleScores[1]);
+   CHECK(63.5 == sampleScores[2]);
+   CHECK(53.5 == sampleScores[3]);
+}
+
+TEST_CASE("ScoreTerms, bin index out of range") {
+   ErrorEbm error;
+
+   UNUSED(testCaseHidden);
+   const IntEbm binCounts[] { 3 };
+   const IntEbm binIndexes[] { 0, 3 };
+   const IntEbm dimensionCounts[] { 1 };
+   const IntEbm columnIndexes[] { 0 };
+   const IntEbm strides[] { 1 };
+   const IntEbm termOffsets[] { 0 };
+   const double cellScores[] { 1, 2, 3, 4 };
+   double sampleScores[2] { 0, 0 };
+
+   error = ScoreTerms(
+      2,
+      1,
+      1,
+      binCounts,
+      binIndexes,
+      1,
+      dimensionCounts,
+      columnIndexes,
+      strides,
+      termOffsets,
+      4,
+      cellScores,
+      0,
+      sampleScores,
+      nullptr
+   );
+   CHECK(Error_IllegalParamVal == error);
+}
@@ -1646,3 +1646,166 @@ TEST_CASE("pair and main gain identical, boosting, regression") {
 
    CHECK_APPROX(gainAvg1, gainAvg2);
 }
+
+TEST_CASE("BoostRounds matches cyclic Boost calls, regression") {
+   TestApi test1 = TestApi(k_learningTypeRegression);
+   test1.AddFeatures({ FeatureTest(3), FeatureTest(2) });
+   test1.AddTerms({ { 0 }, { 1 }, { 0, 1 } });
+   test1.AddTrainingSamples({
+      TestSample({ 0, 0 }, 10),
+      TestSample({ 1, 1 }, 20),
+      TestSample({ 2, 0 }, 30),
+      TestSample({ 2, 1 }, 15),
+      });
+   test1.AddValidationSamples({ TestSample({ 0, 1 }, 12), TestSample({ 2, 0 }, 28) });
+   test1.InitializeBoosting();
+
+   TestApi test2 = TestApi(k_learningTypeRegression);
+   test2.AddFeatures({ FeatureTest(3), FeatureTest(2) });
+   test2.AddTerms({ { 0 }, { 1 }, { 0, 1 } });
+   test2.AddTrainingSamples({
+      TestSample({ 0, 0 }, 10),
+      TestSample({ 1, 1 }, 20),
+      TestSample({ 2, 0 }, 30),
+      TestSample({ 2, 1 }, 15),
+      });
+   test2.AddValidationSamples({ TestSample({ 0, 1 }, 12), TestSample({ 2, 0 }, 28) });
+   test2.InitializeBoosting();
+
+   double minMetric1 = std::numeric_limits<double>::infinity();
+   for(int iEpoch = 0; iEpoch < 20; ++iEpoch) {
+      for(size_t iTerm = 0; iTerm < test1.GetCountTerms(); ++iTerm) {
+         const double validationMetric = test1.Boost(static_cast<IntEbm>(iTerm)).validationMetric;
+         minMetric1 = std::min(validationMetric, minMetric1);
+      }
+   }
+
+   IntEbm roundIndex2 = 0;
+   double minMetric2 = std::numeric_limits<double>::infinity();
+   double breakpointMetric2 = std::numeric_limits<double>::infinity();
+   IntEbm noChangeRunLength2 = 0;
+   BoolEbm isStopped = EBM_TRUE;
+   const ErrorEbm error = BoostRounds(
+      nullptr,
+      test2.GetBoosterHandle(),
+      20,
+      BoostFlags_Default,
+      k_learningRateDefault,
+      k_minSamplesLeafDefault,
+      k_leavesMaxFillDefault,
+      -1,
+      0.0,
+      EBM_FALSE,
+      0,
+      nullptr,
+      &roundIndex2,
+      &minMetric2,
+      &breakpointMetric2,
+      &noChangeRunLength2,
+      &isStopped
+   );
+   CHECK(Error_None == error);
+   CHECK(20 == roundIndex2);
+   CHECK(EBM_FALSE == isStopped);
+   CHECK(minMetric1 == minMetric2);
+
+   for(size_t iTerm = 0; iTerm < test1.GetCountTerms(); ++iTerm) {
+      double termScores1[6];
+      double termScores2[6];
+      test1.GetCurrentTermScoresRaw(iTerm, termScores1);
+      test2.GetCurrentTermScoresRaw(iTerm, termScores2);
+      const size_t cScores = 2 == iTerm ? size_t { 6 } : 1 == iTerm ? size_t { 2 } : size_t { 3 };
+      for(size_t iScore = 0; iScore < cScores; ++iScore) {
+         CHECK(termScores1[iScore] == termScores2[iScore]);
+      }
+   }
+}
+
+TEST_CASE("BoostRounds early stopping, regression") {
+   TestApi test = TestApi(k_learningTypeRegression);
+   test.AddFeatures({ FeatureTest(2) });
+   test.AddTerms({ { 0 } });
+   test.AddTrainingSamples({ TestSample({ 0 }, 10), TestSample({ 1 }, 20) });
+   test.AddValidationSamples({ TestSample({ 0 }, 10), TestSample({ 1 }, 20) });
+   test.InitializeBoosting();
+
+   IntEbm roundIndex = 0;
+   double minMetric = std::numeric_limits<double>::infinity();
+   double breakpointMetric = std::numeric_limits<double>::infinity();
+   IntEbm noChangeRunLength = 0;
+   BoolEbm isStopped = EBM_FALSE;
+
+   // a negative learning rate makes every round worse than the one before, so none of the rounds improve on
+   // the breakpoint captured in the first round and we stop after earlyStoppingRounds rounds
+   const ErrorEbm error = BoostRounds(
+      nullptr,
+      test.GetBoosterHandle(),
+      1000,
+      BoostFlags_Default,
+      -k_learningRateDefault,
+      k_minSamplesLeafDefault,
+      k_leavesMaxFillDefault,
+      5,
+      0.0,
+      EBM_FALSE,
+      0,
+      nullptr,
+      &roundIndex,
+      &minMetric,
+      &breakpointMetric,
+      &noChangeRunLength,
+      &isStopped
+   );
+   CHECK(Error_None == error);
+   CHECK(EBM_TRUE == isStopped);
+   CHECK(5 == roundIndex);
+   CHECK(5 == noChangeRunLength);
+}
+
+TEST_CASE("BoostRounds windowed early stopping, regression") {
+   TestApi test = TestApi(k_learningTypeRegression);
+   test.AddFeatures({ FeatureTest(2) });
+   test.AddTerms({ { 0 } });
+   test.AddTrainingSamples({ TestSample({ 0 }, 10), TestSample({ 1 }, 20) });
+   test.AddValidationSamples({ TestSample({ 0 }, 10), TestSample({ 1 }, 20) });
+   test.InitializeBoosting();
+
+   double windowMetrics[3];
+   for(double & windowMetric : windowMetrics) {
+      windowMetric = std::numeric_limits<double>::infinity();
+   }
+   IntEbm roundIndex = 0;
+   double minMetric = std::numeric_limits<double>::infinity();
+   double breakpointMetric = std::numeric_limits<double>::infinity();
+   IntEbm noChangeRunLength = 0;
+   BoolEbm isStopped = EBM_FALSE;
+
+   // boost in chunks of 2 rounds to exercise carrying the circular buffer between calls.  The metric
+   // never improves, so the first 3 rounds fill the window and then 4 more rounds are needed to stop
+   ErrorEbm error;
+   do {
+      error = BoostRounds(
+         nullptr,
+         test.GetBoosterHandle(),
+         2,
+         BoostFlags_Default,
+         -k_learningRateDefault,
+         k_minSamplesLeafDefault,
+         k_leavesMaxFillDefault,
+         4,
+         0.01,
+         EBM_TRUE,
+         3,
+         windowMetrics,
+         &roundIndex,
+         &minMetric,
+         &breakpointMetric,
+         &noChangeRunLength,
+         &isStopped
+      );
+      CHECK(Error_None == error);
+   } while(Error_None == error && EBM_FALSE == isStopped && roundIndex < 1000);
+   CHECK(EBM_TRUE == isStopped);
+   CHECK(7 == roundIndex);
+   CHECK(4 == noChangeRunLength);
+}
@@ -19,7 +19,8 @@ enum class TestPriority {
    CutUniform,
    CutWinsorized,
    CutQuantile,
-   Discretize
+   Discretize,
+   ScoreTerms
 };
 
 
@@ -435,3 +435,68 @@ TEST_CASE("compare boosting gain to interaction strength, which should be identi
 
    CHECK_APPROX(interactionStrength, gainAvg);
 }
+
+TEST_CASE("CalcInteractionStrengths matches CalcInteractionStrength, interaction, regression") {
+   TestApi test = TestApi(k_learningTypeRegression);
+   test.AddFeatures({ FeatureTest(2), FeatureTest(2), FeatureTest(3) });
+   test.AddInteractionSamples({
+      TestSample({ 0, 0, 0 }, 3, 232.24),
+      TestSample({ 0, 1, 2 }, 11, 12.124),
+      TestSample({ 1, 0, 1 }, 5, 85.1254),
+      TestSample({ 1, 1, 0 }, 7, 1.355),
+      });
+   test.InitializeInteraction();
+
+   const IntEbm featureIndexes[] { 0, 1, 0, 2, 1, 2 };
+   double strengths[3];
+   const ErrorEbm error = CalcInteractionStrengths(
+      test.GetInteractionHandle(),
+      3,
+      2,
+      featureIndexes,
+      InteractionFlags_Default,
+      0,
+      strengths
+   );
+   CHECK(Error_None == error);
+
+   CHECK(test.TestCalcInteractionStrength({ 0, 1 }) == strengths[0]);
+   CHECK(test.TestCalcInteractionStrength({ 0, 2 }) == strengths[1]);
+   CHECK(test.TestCalcInteractionStrength({ 1, 2 }) == strengths[2]);
+}
+
+TEST_CASE("CalcInteractionStrengths fused pairs with weights, interaction, multiclass") {
+   TestApi test = TestApi(3);
+   test.AddFeatures({ FeatureTest(3), FeatureTest(2), FeatureTest(4), FeatureTest(1) });
+   test.AddInteractionSamples({
+      TestSample({ 0, 0, 0, 0 }, 0, 1.5),
+      TestSample({ 1, 1, 2, 0 }, 1, 0.25),
+      TestSample({ 2, 0, 1, 0 }, 2, 3.0),
+      TestSample({ 1, 1, 3, 0 }, 0, 2.0),
+      TestSample({ 0, 1, 0, 0 }, 2, 1.0),
+      TestSample({ 2, 0, 3, 0 }, 1, 0.5),
+      });
+   test.InitializeInteraction();
+
+   // the first three pairs share feature 0 and are summed in one pass, and the pair with the single bin feature 
+   // breaks up the run of feature 2
+   const IntEbm featureIndexes[] { 0, 1, 0, 2, 0, 3, 2, 0, 2, 3, 2, 1 };
+   double strengths[6];
+   const ErrorEbm error = CalcInteractionStrengths(
+      test.GetInteractionHandle(),
+      6,
+      2,
+      featureIndexes,
+      InteractionFlags_Default,
+      0,
+      strengths
+   );
+   CHECK(Error_None == error);
+
+   CHECK(test.TestCalcInteractionStrength({ 0, 1 }) == strengths[0]);
+   CHECK(test.TestCalcInteractionStrength({ 0, 2 }) == strengths[1]);
+   CHECK(0 == strengths[2]);
+   CHECK(test.TestCalcInteractionStrength({ 2, 0 }) == strengths[3]);
+   CHECK(0 == strengths[4]);
+   CHECK(test.TestCalcInteractionStrength({ 2, 1 }) == strengths[5]);
+}
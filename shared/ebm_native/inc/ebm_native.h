@@ -249,6 +249,23 @@ EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION Discretize(
    const double * cutsLowerBoundInclusive,
    IntEbm * binIndexesOut
 );
+EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION ScoreTerms(
+   IntEbm countSamples,
+   IntEbm countScores,
+   IntEbm countColumns,
+   const IntEbm * binCounts,
+   const IntEbm * binIndexes,
+   IntEbm countTerms,
+   const IntEbm * dimensionCounts,
+   const IntEbm * columnIndexes,
+   const IntEbm * strides,
+   const IntEbm * termOffsets,
+   IntEbm countCells,
+   const double * cellScores,
+   IntEbm countThreads,
+   double * sampleScoresInOut,
+   double * termScoresOut
+);
 
 EBM_API_INCLUDE IntEbm EBM_CALLING_CONVENTION MeasureDataSetHeader(
    IntEbm countFeatures,
@@ -399,6 +416,29 @@ EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION ApplyTermUpdate(
    BoosterHandle boosterHandle,
    double * avgValidationMetricOut
 );
+// BoostRounds runs up to countRounds cyclic rounds of GenerateTermUpdate/ApplyTermUpdate over all terms.
+// The early stopping state is passed in and out so that rounds can be boosted in multiple calls.
+// earlyStoppingWindow of 0 uses the breakpoint early stopping rule, and otherwise windowMetricsInOut
+// needs earlyStoppingWindow items that are initialized to +infinity before the first call
+EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION BoostRounds(
+   void * rng,
+   BoosterHandle boosterHandle,
+   IntEbm countRounds,
+   BoostFlags flags,
+   double learningRate,
+   IntEbm minSamplesLeaf,
+   IntEbm leavesMax,
+   IntEbm earlyStoppingRounds,
+   double earlyStoppingTolerance,
+   BoolEbm isRelativeTolerance,
+   IntEbm earlyStoppingWindow,
+   double * windowMetricsInOut,
+   IntEbm * roundIndexInOut,
+   double * minMetricInOut,
+   double * breakpointMetricInOut,
+   IntEbm * noChangeRunLengthInOut,
+   BoolEbm * isStoppedOut
+);
 EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION GetBestTermScores(
    BoosterHandle boosterHandle, 
    IntEbm indexTerm,
@@ -429,6 +469,17 @@ EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION CalcInteractionStrength(
    IntEbm minSamplesLeaf,
    double * avgInteractionStrengthOut
 );
+// CalcInteractionStrengths calculates the strengths of countTerms terms in a single call. featureIndexes
+// holds countTerms * countDimensions feature indexes, with the features of each term stored consecutively
+EBM_API_INCLUDE ErrorEbm EBM_CALLING_CONVENTION CalcInteractionStrengths(
+   InteractionHandle interactionHandle,
+   IntEbm countTerms,
+   IntEbm countDimensions,
+   const IntEbm * featureIndexes,
+   InteractionFlags flags,
+   IntEbm minSamplesLeaf,
+   double * avgInteractionStrengthsOut
+);
 
 #ifdef __cplusplus
 } // extern "C"